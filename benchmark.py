@@ -0,0 +1,212 @@
+"""Benchmarks for the cube engine and solvers.
+
+Run `python benchmark.py` for the default suite. Results can be written as
+JSON with --output and checked against a saved run with --baseline; any
+metric that is worse than the baseline by more than --tolerance is reported
+as a regression and the exit status is 1.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import timeit
+
+from main import Cube, MoveGenerator, ParallelOptimalSolver, Solver
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SEED = 2024
+CORPUS_DEPTHS = (5, 10, 15, 20)
+# Deeper buckets take minutes per scramble with these strategies
+STRATEGY_MAX_DEPTH = {'optimal': 10, 'parallel_optimal': 10, 'bidirectional': 10, 'bfs': 5}
+# Metrics where a larger value is better; everything else is a cost
+HIGHER_IS_BETTER = ('nodes_per_second', 'speedup')
+
+
+def build_corpus(seed=DEFAULT_SEED, per_depth=20, depths=CORPUS_DEPTHS):
+    """Seeded scrambles bucketed by length: {depth: [scramble, ...]}."""
+    rng = random.Random(seed)
+    move_gen = MoveGenerator()
+    return {depth: [move_gen.get_random_scramble(depth, rng) for _ in range(per_depth)]
+            for depth in depths}
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def bench_micro(seed=DEFAULT_SEED, number=100000):
+    """Nanoseconds per call of the core Cube operations, best of five runs."""
+    cube = Cube()
+    cube.scramble(MoveGenerator().get_random_scramble(20, random.Random(seed)))
+    cases = {
+        'apply_move': lambda: cube.apply_move("R'"),
+        'copy': cube.copy,
+        'get_state_string': cube.get_state_string,
+        'is_solved': cube.is_solved,
+    }
+    return {f"{name}_ns": min(timeit.repeat(func, number=number, repeat=5)) / number * 1e9
+            for name, func in cases.items()}
+
+
+def bench_solver(corpus, strategy):
+    """Latency percentiles, solution length and nodes/sec of Solver.solve per depth bucket."""
+    Solver.load_tables(strategy)  # Table loading is a one-off, not part of a solve
+    results = {}
+    for depth, scrambles in corpus.items():
+        if depth > STRATEGY_MAX_DEPTH.get(strategy, depth):
+            continue
+        latencies, lengths, nodes, search_seconds = [], [], 0, 0.0
+        for scramble in scrambles:
+            cube = Cube()
+            cube.scramble(scramble)
+            solver = Solver(cube, strategy=strategy)
+            start = time.perf_counter()
+            solution = solver.solve()
+            latencies.append(time.perf_counter() - start)
+            lengths.append(len(solution) if solution is not None else float('nan'))
+            nodes += solver.stats.get('nodes', 0)
+            search_seconds += solver.stats.get('seconds', 0.0)
+        bucket = {
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'mean_moves': sum(lengths) / len(lengths),
+        }
+        if nodes:
+            bucket['nodes_per_second'] = nodes / search_seconds
+        results[f"depth_{depth}"] = bucket
+    return results
+
+
+def bench_parallel(corpus, worker_counts, depth=10):
+    """Wall time and speedup of ParallelOptimalSolver over one bucket per worker count."""
+    Solver.load_tables('parallel_optimal')
+    cubes = []
+    for scramble in corpus[depth]:
+        cube = Cube()
+        cube.scramble(scramble)
+        cubes.append(cube)
+    results = {}
+    for workers in worker_counts:
+        start = time.perf_counter()
+        for cube in cubes:
+            ParallelOptimalSolver(workers=workers).solve(cube)
+        results[f"workers_{workers}"] = {'seconds': time.perf_counter() - start}
+    base = results[f"workers_{worker_counts[0]}"]['seconds']
+    for entry in results.values():
+        entry['speedup'] = base / entry['seconds']
+    return results
+
+
+def flatten(results, prefix=''):
+    """Nested result dicts as {'a.b.c': number}."""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(results, baseline, tolerance):
+    """Regressions against a baseline run: a list of (metric, baseline, current, change)."""
+    current = flatten(results)
+    regressions = []
+    for metric, old in flatten(baseline).items():
+        new = current.get(metric)
+        if new is None or not old or metric.startswith('meta.') or math.isnan(new) or math.isnan(old):
+            continue
+        change = new / old - 1
+        worse = -change if metric.rsplit('.', 1)[-1] in HIGHER_IS_BETTER else change
+        if worse > tolerance:
+            regressions.append((metric, old, new, change))
+    return regressions
+
+
+def run(args):
+    """Run the selected benchmarks and return the results dict."""
+    corpus = build_corpus(args.seed, args.per_depth)
+    results = {'meta': {'seed': args.seed, 'per_depth': args.per_depth,
+                        'python': platform.python_version(), 'platform': platform.platform(),
+                        'cpu_count': os.cpu_count()}}
+    print("⏱️ Micro-benchmarks...")
+    results['micro'] = bench_micro(args.seed)
+    for name, value in results['micro'].items():
+        print(f"  {name}: {value:,.0f}")
+    results['solve'] = {}
+    for strategy in args.strategies:
+        print(f"🧠 Solver latency ({strategy})...")
+        results['solve'][strategy] = bench_solver(corpus, strategy)
+        for bucket, stats in results['solve'][strategy].items():
+            rate = f", {stats['nodes_per_second']:,.0f} nodes/s" if 'nodes_per_second' in stats else ""
+            print(f"  {bucket}: p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, "
+                  f"p99 {stats['p99_ms']:.1f} ms, {stats['mean_moves']:.1f} moves{rate}")
+    if args.parallel:
+        print("🚀 Parallel IDA* speedup...")
+        results['parallel'] = bench_parallel(corpus, args.parallel)
+        for workers, stats in results['parallel'].items():
+            print(f"  {workers}: {stats['seconds']:.2f}s, speedup {stats['speedup']:.2f}x")
+    results['peak_rss_mb'] = peak_rss_mb()
+    if results['peak_rss_mb'] is not None:
+        print(f"💾 Peak RSS: {results['peak_rss_mb']:.1f} MB")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Rubik's Cube engine and solvers.")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="corpus RNG seed")
+    parser.add_argument('--per-depth', type=int, default=20, help="scrambles per depth bucket")
+    parser.add_argument('--strategies', nargs='+', default=['two_phase'], choices=Solver.STRATEGIES,
+                        help="solver strategies to time")
+    parser.add_argument('--parallel', type=int, nargs='+', metavar='WORKERS',
+                        help="also time parallel_optimal with these worker counts (first is the reference)")
+    parser.add_argument('--output', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="compare against the results in this JSON file")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed relative slowdown before a metric counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📝 Results written to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for key in ('seed', 'per_depth'):
+            if baseline.get('meta', {}).get(key) != results['meta'][key]:
+                print(f"⚠️ Baseline was recorded with a different {key}; latencies are not comparable")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} REGRESSION(S) against {args.baseline}:")
+            for metric, old, new, change in regressions:
+                print(f"  {metric}: {old:,.3f} -> {new:,.3f} ({change:+.0%})")
+            return 1
+        print(f"✅ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
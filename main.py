@@ -1,191 +1,1002 @@
-import copy
+import contextlib
+import cProfile
+import heapq
+import itertools
+import mmap
+import multiprocessing
+import os
 import random
-from collections import deque
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+import signal
+import sqlite3
+import struct
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from multiprocessing import shared_memory
+from queue import Empty, Full, Queue
+from types import MappingProxyType
 import threading
 import time
 
+# tkinter and NumPy are imported on first use: the GUI and the
+# StatePrediction batch methods are the only things that need them
+tk = ttk = messagebox = scrolledtext = None
+np = None
+
+# Facelets are numbered face by face in U, D, L, R, F, B order and row by row
+# within a face, which is the order get_state_string has always used.
+FACE_ORDER = ('U', 'D', 'L', 'R', 'F', 'B')
+SOLVED_COLORS = {'U': 'W', 'D': 'Y', 'L': 'O', 'R': 'R', 'F': 'G', 'B': 'B'}
+SOLVED_FACELETS = ''.join(SOLVED_COLORS[face] * 9 for face in FACE_ORDER).encode('ascii')
+IDENTITY_FACELETS = bytes(range(54))
+
+# Facelet cycles of each clockwise quarter turn: two cycles on the turning
+# face itself followed by the three cycles of the adjacent side stickers.
+QUARTER_TURN_CYCLES = {
+    'U': [(0, 2, 8, 6), (1, 5, 7, 3), (18, 45, 27, 36), (19, 46, 28, 37), (20, 47, 29, 38)],
+    'D': [(9, 11, 17, 15), (10, 14, 16, 12), (24, 42, 33, 51), (25, 43, 34, 52), (26, 44, 35, 53)],
+    'L': [(18, 20, 26, 24), (19, 23, 25, 21), (0, 36, 9, 53), (3, 39, 12, 50), (6, 42, 15, 47)],
+    'R': [(27, 29, 35, 33), (28, 32, 34, 30), (2, 51, 11, 38), (5, 48, 14, 41), (8, 45, 17, 44)],
+    'F': [(36, 38, 44, 42), (37, 41, 43, 39), (6, 27, 11, 26), (7, 30, 10, 23), (8, 33, 9, 20)],
+    'B': [(45, 47, 53, 51), (46, 50, 52, 48), (0, 24, 17, 29), (1, 21, 16, 32), (2, 18, 15, 35)],
+}
+
+# The 18 face turns in MoveGenerator order: U, U', U2, D, D', D2, ...
+MOVE_NAMES = [face + suffix for face in FACE_ORDER for suffix in ('', "'", '2')]
+
+# CANONICAL_SUCCESSORS[m] lists the moves worth trying after move m, with
+# index -1 for an empty sequence. A face is never turned twice in a row and
+# commuting opposite faces only come in U D / L R / F B order, so every
+# position is reached by exactly one canonical sequence of each length.
+# That leaves about 13.35 branches per node instead of 18.
+CANONICAL_SUCCESSORS = [
+    tuple(m for m in range(18)
+          if m // 3 != last // 3 and not (m // 3 ^ 1 == last // 3 and m // 3 < last // 3))
+    for last in range(18)
+] + [tuple(range(18))]
+
+
+def _build_move_tables():
+    """Build a bytes.translate table for each of the 18 moves.
+
+    Entry p of a table is the facelet that the sticker on facelet p moves to.
+    """
+    tables = {}
+    for face in FACE_ORDER:
+        quarter = list(range(256))
+        for cycle in QUARTER_TURN_CYCLES[face]:
+            for i, facelet in enumerate(cycle):
+                quarter[facelet] = cycle[(i + 1) % 4]
+        half = [quarter[quarter[p]] for p in range(256)]
+        inverse = [quarter[half[p]] for p in range(256)]
+        tables[face] = bytes(quarter)
+        tables[face + "'"] = bytes(inverse)
+        tables[face + '2'] = bytes(half)
+    return tables
+
+
+MOVE_TABLES = _build_move_tables()
+
+
 class Cube:
     def __init__(self):
         """Initialize a solved Rubik's cube."""
-        # Each face is a 3x3 matrix. Faces: U(p), D(own), L(eft), R(ight), F(ront), B(ack)
-        self.faces = {
-            'U': [['W']*3 for _ in range(3)],  # White - Up
-            'D': [['Y']*3 for _ in range(3)],  # Yellow - Down
-            'L': [['O']*3 for _ in range(3)],  # Orange - Left
-            'R': [['R']*3 for _ in range(3)],  # Red - Right
-            'F': [['G']*3 for _ in range(3)],  # Green - Front
-            'B': [['B']*3 for _ in range(3)],  # Blue - Back
-        }
-        
+        # Sticker s starts on facelet s. _stickers holds the colour of every
+        # sticker and _positions the facelet each sticker currently sits on,
+        # so a move is one bytes.translate and a copy shares both buffers.
+        self._stickers = SOLVED_FACELETS
+        self._positions = IDENTITY_FACELETS
+
+    @classmethod
+    def from_faces(cls, faces):
+        """Create a cube from a face dict of 3x3 colour grids (e.g. manual input)."""
+        state = ''
+        for face in FACE_ORDER:
+            rows = faces[face]
+            if len(rows) != 3 or any(len(row) != 3 for row in rows):
+                raise ValueError(f"Face {face} must be a 3x3 grid")
+            state += ''.join(''.join(row) for row in rows)
+        return cls.from_state_string(state)
+
+    @classmethod
+    def from_state_string(cls, state):
+        """Create a cube from a 54-character string as returned by get_state_string."""
+        if len(state) != 54:
+            raise ValueError(f"Expected 54 facelets, got {len(state)}")
+        cube = cls()
+        cube._stickers = state.upper().encode('ascii')
+        return cube
+
+    @property
+    def faces(self):
+        """Read-only view of the faces: each face is a 3x3 grid of colours."""
+        state = self.get_state_string()
+        return MappingProxyType({
+            face: tuple(tuple(state[i*9 + row*3:i*9 + row*3 + 3]) for row in range(3))
+            for i, face in enumerate(FACE_ORDER)
+        })
+
     def copy(self):
-        """Create a deep copy of the cube."""
-        new_cube = Cube()
-        new_cube.faces = copy.deepcopy(self.faces)
+        """Create a copy of the cube."""
+        new_cube = Cube.__new__(Cube)
+        new_cube._stickers = self._stickers
+        new_cube._positions = self._positions
         return new_cube
-        
-    def rotate_face(self, face, clockwise=True):
-        """Rotate a face 90 degrees."""
-        if clockwise:
-            self.faces[face] = [list(row) for row in zip(*self.faces[face][::-1])]
-        else:
-            self.faces[face] = [list(row) for row in zip(*self.faces[face])][::-1]
 
     def apply_move(self, move):
         """Apply a move to the cube."""
-        move = move.strip().upper()
-        if not move:
-            return
-            
-        face = move[0]
-        if face not in ['U', 'D', 'L', 'R', 'F', 'B']:
-            raise ValueError(f"Invalid face: {face}")
-            
-        clockwise = True
-        times = 1
-
-        if len(move) > 1:
-            if move[1] == "'":
-                clockwise = False
-            elif move[1] == "2":
-                times = 2
-            else:
+        table = MOVE_TABLES.get(move)
+        if table is None:
+            move = move.strip().upper()
+            if not move:
+                return
+
+            face = move[0]
+            if face not in FACE_ORDER:
+                raise ValueError(f"Invalid face: {face}")
+
+            table = MOVE_TABLES.get(move)
+            if table is None:
                 raise ValueError(f"Invalid move notation: {move}")
 
-        for _ in range(times):
-            self._move(face, clockwise)
-
-    def _move(self, face, clockwise):
-        """Internal method to perform a single move."""
-        self.rotate_face(face, clockwise)
-        f = self.faces
-        
-        if face == 'U':
-            if clockwise:
-                temp = f['F'][0][:]
-                f['F'][0] = f['R'][0][:]
-                f['R'][0] = f['B'][0][:]
-                f['B'][0] = f['L'][0][:]
-                f['L'][0] = temp
-            else:
-                temp = f['F'][0][:]
-                f['F'][0] = f['L'][0][:]
-                f['L'][0] = f['B'][0][:]
-                f['B'][0] = f['R'][0][:]
-                f['R'][0] = temp
-
-        elif face == 'D':
-            if clockwise:
-                temp = f['F'][2][:]
-                f['F'][2] = f['L'][2][:]
-                f['L'][2] = f['B'][2][:]
-                f['B'][2] = f['R'][2][:]
-                f['R'][2] = temp
-            else:
-                temp = f['F'][2][:]
-                f['F'][2] = f['R'][2][:]
-                f['R'][2] = f['B'][2][:]
-                f['B'][2] = f['L'][2][:]
-                f['L'][2] = temp
-
-        elif face == 'L':
-            if clockwise:
-                temp = [f['F'][i][0] for i in range(3)]
-                for i in range(3):
-                    f['F'][i][0] = f['D'][i][0]
-                    f['D'][i][0] = f['B'][2-i][2]
-                    f['B'][2-i][2] = f['U'][i][0]
-                    f['U'][i][0] = temp[i]
-            else:
-                temp = [f['F'][i][0] for i in range(3)]
-                for i in range(3):
-                    f['F'][i][0] = f['U'][i][0]
-                    f['U'][i][0] = f['B'][2-i][2]
-                    f['B'][2-i][2] = f['D'][i][0]
-                    f['D'][i][0] = temp[i]
-
-        elif face == 'R':
-            if clockwise:
-                temp = [f['F'][i][2] for i in range(3)]
-                for i in range(3):
-                    f['F'][i][2] = f['U'][i][2]
-                    f['U'][i][2] = f['B'][2-i][0]
-                    f['B'][2-i][0] = f['D'][i][2]
-                    f['D'][i][2] = temp[i]
-            else:
-                temp = [f['F'][i][2] for i in range(3)]
-                for i in range(3):
-                    f['F'][i][2] = f['D'][i][2]
-                    f['D'][i][2] = f['B'][2-i][0]
-                    f['B'][2-i][0] = f['U'][i][2]
-                    f['U'][i][2] = temp[i]
-
-        elif face == 'F':
-            if clockwise:
-                temp = f['U'][2][:]
-                f['U'][2] = [f['L'][2-i][2] for i in range(3)]
-                for i in range(3):
-                    f['L'][i][2] = f['D'][0][i]
-                f['D'][0] = [f['R'][2-i][0] for i in range(3)]
-                for i in range(3):
-                    f['R'][i][0] = temp[i]
-            else:
-                temp = f['U'][2][:]
-                f['U'][2] = [f['R'][i][0] for i in range(3)]
-                for i in range(3):
-                    f['R'][i][0] = f['D'][0][2-i]
-                f['D'][0] = [f['L'][i][2] for i in range(3)]
-                for i in range(3):
-                    f['L'][i][2] = temp[2-i]
-
-        elif face == 'B':
-            if clockwise:
-                temp = f['U'][0][:]
-                f['U'][0] = [f['R'][i][2] for i in range(3)]
-                for i in range(3):
-                    f['R'][i][2] = f['D'][2][2-i]
-                f['D'][2] = [f['L'][i][0] for i in range(3)]
-                for i in range(3):
-                    f['L'][i][0] = temp[2-i]
-            else:
-                temp = f['U'][0][:]
-                f['U'][0] = [f['L'][2-i][0] for i in range(3)]
-                for i in range(3):
-                    f['L'][i][0] = f['D'][2][i]
-                f['D'][2] = [f['R'][2-i][2] for i in range(3)]
-                for i in range(3):
-                    f['R'][i][2] = temp[i]
+        self._positions = self._positions.translate(table)
 
     def scramble(self, moves_str):
         """Apply a sequence of moves to scramble the cube."""
-        moves = moves_str.split()
-        for move in moves:
-            self.apply_move(move)
+        self.apply_sequence(moves_str)
+
+    def apply_sequence(self, moves):
+        """Apply a move sequence (a string, a list of moves or a MoveSequence) in one step."""
+        self._positions = self._positions.translate(compile_moves(moves).table)
+
+    def is_solved_by(self, moves):
+        """Check that a move sequence solves the cube, without changing the cube."""
+        positions = self._positions.translate(compile_moves(moves).table)
+        return IDENTITY_FACELETS.translate(bytes.maketrans(positions, self._stickers)) == SOLVED_FACELETS
+
+    def _facelets(self):
+        """Colours of the 54 facelets as bytes, in get_state_string order."""
+        return IDENTITY_FACELETS.translate(bytes.maketrans(self._positions, self._stickers))
 
     def is_solved(self):
         """Check if the cube is solved."""
-        solved_faces = {
-            'U': [['W']*3 for _ in range(3)],
-            'D': [['Y']*3 for _ in range(3)],
-            'L': [['O']*3 for _ in range(3)],
-            'R': [['R']*3 for _ in range(3)],
-            'F': [['G']*3 for _ in range(3)],
-            'B': [['B']*3 for _ in range(3)],
-        }
-        return self.faces == solved_faces
+        return self._facelets() == SOLVED_FACELETS
 
     def get_state_string(self):
         """Get a string representation of the cube state for hashing."""
-        state = ""
-        for face in ['U', 'D', 'L', 'R', 'F', 'B']:
-            for row in self.faces[face]:
-                state += ''.join(row)
-        return state
+        return self._facelets().decode('ascii')
 
     def __str__(self):
         """String representation for debugging."""
-        return '\n'.join([f"{face}: {self.faces[face]}" for face in self.faces])
+        faces = self.faces
+        return '\n'.join([f"{face}: {[list(row) for row in faces[face]]}" for face in faces])
+
+
+
+SEQUENCE_CACHE_SIZE = 1024
+_IDENTITY_TABLE = bytes(range(256))
+
+
+class MoveSequence:
+    """A move sequence compiled to a single facelet permutation.
+
+    table is a bytes.translate table in the MOVE_TABLES format, so applying a
+    sequence of any length to a cube is one translate, and so is composing
+    two sequences. Sequences form a group: a * b is a followed by b, ~a
+    undoes a, a ** n repeats it n times, and a.conjugate(b) and
+    a.commutator(b) build the setup move A B A' and the commutator
+    A B A' B'. Two sequences are equal when they permute the cube the same
+    way, whatever their moves.
+    """
+
+    __slots__ = ('table', 'moves')
+
+    def __init__(self, table=_IDENTITY_TABLE, moves=()):
+        self.table = table
+        self.moves = tuple(moves)
+
+    def __mul__(self, other):
+        return MoveSequence(self.table.translate(other.table), self.moves + other.moves)
+
+    def __invert__(self):
+        return self.inverse()
+
+    def __pow__(self, n):
+        base = self if n >= 0 else self.inverse()
+        result = MoveSequence()
+        n = abs(n)
+        while n:
+            if n & 1:
+                result = result * base
+            base = base * base
+            n >>= 1
+        return result
+
+    def __eq__(self, other):
+        return isinstance(other, MoveSequence) and self.table == other.table
+
+    def __hash__(self):
+        return hash(self.table)
+
+    def __len__(self):
+        return len(self.moves)
+
+    def __str__(self):
+        return ' '.join(self.moves)
+
+    def __repr__(self):
+        return f"MoveSequence({str(self)!r})"
+
+    def inverse(self):
+        """The sequence that undoes this one."""
+        moves = [MOVE_NAMES[INVERSE_MOVES[MOVE_NAMES.index(move)]] for move in reversed(self.moves)]
+        return MoveSequence(bytes.maketrans(self.table, _IDENTITY_TABLE), moves)
+
+    def conjugate(self, setup):
+        """setup, then this sequence, then setup undone: A B A'."""
+        setup = compile_moves(setup)
+        return setup * self * setup.inverse()
+
+    def commutator(self, other):
+        """This sequence, other, then both undone: A B A' B'."""
+        other = compile_moves(other)
+        return self * other * self.inverse() * other.inverse()
+
+    def is_identity(self):
+        """Whether the sequence leaves every facelet where it was."""
+        return self.table == _IDENTITY_TABLE
+
+    def order(self):
+        """How many repetitions bring the cube back to where it started (at most 1260)."""
+        table, n = self.table, 1
+        while table != _IDENTITY_TABLE:
+            table = table.translate(self.table)
+            n += 1
+        return n
+
+
+_SEQUENCE_CACHE = OrderedDict()
+_SEQUENCE_CACHE_LOCK = threading.Lock()
+
+
+def compile_moves(moves):
+    """Compile a move string or list of moves into a MoveSequence.
+
+    Compiled sequences are kept in an LRU cache of SEQUENCE_CACHE_SIZE
+    entries, so applying the same algorithm again skips parsing altogether.
+    """
+    if isinstance(moves, MoveSequence):
+        return moves
+    key = moves if isinstance(moves, str) else tuple(moves)
+    with _SEQUENCE_CACHE_LOCK:
+        sequence = _SEQUENCE_CACHE.get(key)
+        if sequence is not None:
+            _SEQUENCE_CACHE.move_to_end(key)
+            return sequence
+    names = []
+    table = _IDENTITY_TABLE
+    for move in (moves.split() if isinstance(moves, str) else moves):
+        move_table = MOVE_TABLES.get(move)
+        if move_table is None:
+            move = move.strip().upper()
+            if not move:
+                continue
+            if move[0] not in FACE_ORDER:
+                raise ValueError(f"Invalid face: {move[0]}")
+            move_table = MOVE_TABLES.get(move)
+            if move_table is None:
+                raise ValueError(f"Invalid move notation: {move}")
+        table = table.translate(move_table)
+        names.append(move)
+    sequence = MoveSequence(table, names)
+    with _SEQUENCE_CACHE_LOCK:
+        _SEQUENCE_CACHE[key] = sequence
+        if len(_SEQUENCE_CACHE) > SEQUENCE_CACHE_SIZE:
+            _SEQUENCE_CACHE.popitem(last=False)
+    return sequence
+
+class MoveHistory:
+    """Undo/redo history of a cube with a snapshot after every move.
+
+    Cube copies share their immutable buffers, so a snapshot costs one small
+    object and undo, redo and seek are O(1) jumps to a stored position: nothing
+    is ever re-simulated from the start. Recording a move after an undo
+    drops the undone moves, as in an editor.
+    """
+
+    def __init__(self, cube=None):
+        self.reset(cube)
+
+    def reset(self, cube=None):
+        """Start a new history at cube (solved by default)."""
+        self._states = [cube.copy() if cube is not None else Cube()]
+        self._moves = []
+        self.position = 0
+
+    @property
+    def cube(self):
+        """A copy of the cube at the current position."""
+        return self._states[self.position].copy()
+
+    @property
+    def moves(self):
+        """All recorded moves, including any that can be redone."""
+        return list(self._moves)
+
+    def __len__(self):
+        return len(self._moves)
+
+    def can_undo(self):
+        return self.position > 0
+
+    def can_redo(self):
+        return self.position < len(self._moves)
+
+    def apply(self, move):
+        """Apply a move at the current position and record it; returns the new cube."""
+        move = move.strip().upper()
+        cube = self._states[self.position].copy()
+        cube.apply_move(move)  # Raises before anything is recorded
+        if not move:
+            return cube
+        del self._states[self.position + 1:]
+        del self._moves[self.position:]
+        self._states.append(cube)
+        self._moves.append(move)
+        self.position += 1
+        return cube.copy()
+
+    def extend(self, moves):
+        """Record a sequence of moves from the current position; returns the final cube.
+
+        Moves that match the redo history are stepped over rather than
+        re-recorded, so replaying a solution keeps it redoable.
+        """
+        for move in moves:
+            if self.can_redo() and self._moves[self.position] == move.strip().upper():
+                self.position += 1
+            else:
+                self.apply(move)
+        return self.cube
+
+    def seek(self, step):
+        """Jump to the position after step moves (0 is the start); returns that cube."""
+        if not 0 <= step <= len(self._moves):
+            raise IndexError(f"Step {step} is outside the history (0-{len(self._moves)})")
+        self.position = step
+        return self.cube
+
+    def undo(self):
+        """Step back one move; returns the cube, or None at the start."""
+        return self.seek(self.position - 1) if self.can_undo() else None
+
+    def redo(self):
+        """Step forward one move; returns the cube, or None at the end."""
+        return self.seek(self.position + 1) if self.can_redo() else None
+
+# Cubie level: corners URF, UFL, ULB, UBR, DFR, DLF, DBL, DRB and edges UR, UF,
+# UL, UB, DR, DF, DL, DB, FR, FL, BL, BR. Each piece lists its facelets starting
+# with the U/D sticker (F/B for the middle-layer edges), going clockwise.
+CORNER_FACELETS = [
+    (8, 27, 38), (6, 36, 20), (0, 18, 47), (2, 45, 29),
+    (11, 44, 33), (9, 26, 42), (15, 53, 24), (17, 35, 51),
+]
+CORNER_FACES = ['URF', 'UFL', 'ULB', 'UBR', 'DFR', 'DLF', 'DBL', 'DRB']
+EDGE_FACELETS = [
+    (5, 28), (7, 37), (3, 19), (1, 46), (14, 34), (10, 43),
+    (12, 25), (16, 52), (41, 30), (39, 23), (50, 21), (48, 32),
+]
+EDGE_FACES = ['UR', 'UF', 'UL', 'UB', 'DR', 'DF', 'DL', 'DB', 'FR', 'FL', 'BL', 'BR']
+
+N_TWIST = 2187         # 3^7 corner orientations
+N_FLIP = 2048          # 2^11 edge orientations
+N_CORNERS = 40320      # 8! corner permutations
+N_EDGE_SUBSET = 11880  # positions and order of 4 of the 12 edges (495 * 24)
+N_UD_EDGES = 40320     # 8! permutations of the U and D layer edges
+
+SLICE_EDGES = (8, 9, 10, 11)
+U_EDGES = (0, 1, 2, 3)
+D_EDGES = (4, 5, 6, 7)
+
+
+def _binomial(n, k):
+    """Binomial coefficient, zero when k > n."""
+    if k > n:
+        return 0
+    result = 1
+    for i in range(k):
+        result = result * (n - i) // (i + 1)
+    return result
+
+
+def _perm_rank(perm):
+    """Lehmer rank of a permutation of 0..n-1; the identity ranks 0."""
+    n = len(perm)
+    rank = 0
+    for i in range(n):
+        smaller = 0
+        for j in range(i + 1, n):
+            if perm[j] < perm[i]:
+                smaller += 1
+        rank = rank * (n - i) + smaller
+    return rank
+
+
+def _perm_unrank(rank, n):
+    """Inverse of _perm_rank."""
+    digits = []
+    for radix in range(1, n + 1):
+        digits.append(rank % radix)
+        rank //= radix
+    digits.reverse()
+    remaining = list(range(n))
+    return [remaining.pop(d) for d in digits]
+
+
+class CubieCube:
+    """Cube as corner/edge permutations and orientations.
+
+    cp[i] is the corner sitting in corner position i and co[i] its twist, so
+    the solved cube is the identity. ep and eo do the same for the edges.
+    """
+
+    def __init__(self, cp=None, co=None, ep=None, eo=None):
+        self.cp = list(cp) if cp is not None else list(range(8))
+        self.co = list(co) if co is not None else [0] * 8
+        self.ep = list(ep) if ep is not None else list(range(12))
+        self.eo = list(eo) if eo is not None else [0] * 12
+
+    def copy(self):
+        """Create a copy of the cubie cube."""
+        return CubieCube(self.cp, self.co, self.ep, self.eo)
+
+    def __eq__(self, other):
+        return (isinstance(other, CubieCube) and self.cp == other.cp and self.co == other.co
+                and self.ep == other.ep and self.eo == other.eo)
+
+    @classmethod
+    def from_cube(cls, cube):
+        """Convert a facelet Cube, using its centre colours to identify faces."""
+        return cls.from_state_string(cube.get_state_string())
+
+    @classmethod
+    def from_faces(cls, faces):
+        """Convert a face dict of 3x3 colour grids."""
+        return cls.from_cube(Cube.from_faces(faces))
+
+    @classmethod
+    def from_state_string(cls, state):
+        """Convert a 54-character facelet string and check that it is solvable."""
+        if len(state) != 54:
+            raise ValueError(f"Expected 54 facelets, got {len(state)}")
+        centres = {state[i*9 + 4]: face for i, face in enumerate(FACE_ORDER)}
+        if len(centres) != 6:
+            raise ValueError("Centre colours must all be different")
+        try:
+            faces = [centres[color] for color in state]
+        except KeyError as e:
+            raise ValueError(f"Colour {e.args[0]!r} does not match any centre") from None
+
+        cubie = cls()
+        for i, facelets in enumerate(CORNER_FACELETS):
+            colors = [faces[f] for f in facelets]
+            for ori in range(3):
+                if colors[ori] in 'UD':
+                    break
+            else:
+                raise ValueError(f"Corner at {CORNER_FACES[i]} has no U/D sticker")
+            name = colors[ori] + colors[(ori + 1) % 3] + colors[(ori + 2) % 3]
+            if name not in CORNER_FACES:
+                raise ValueError(f"Invalid corner {name} at {CORNER_FACES[i]}")
+            cubie.cp[i] = CORNER_FACES.index(name)
+            cubie.co[i] = ori
+        for i, facelets in enumerate(EDGE_FACELETS):
+            name = faces[facelets[0]] + faces[facelets[1]]
+            if name in EDGE_FACES:
+                cubie.ep[i], cubie.eo[i] = EDGE_FACES.index(name), 0
+            elif name[::-1] in EDGE_FACES:
+                cubie.ep[i], cubie.eo[i] = EDGE_FACES.index(name[::-1]), 1
+            else:
+                raise ValueError(f"Invalid edge {name} at {EDGE_FACES[i]}")
+        cubie.verify()
+        return cubie
+
+    def to_state_string(self, colors=None):
+        """Facelet string of this cube; colors maps face letters to colours."""
+        colors = colors or SOLVED_COLORS
+        state = [colors[face] for face in FACE_ORDER for _ in range(9)]
+        for i in range(8):
+            piece, ori = self.cp[i], self.co[i]
+            for k in range(3):
+                state[CORNER_FACELETS[i][(k + ori) % 3]] = colors[CORNER_FACES[piece][k]]
+        for i in range(12):
+            piece, ori = self.ep[i], self.eo[i]
+            for k in range(2):
+                state[EDGE_FACELETS[i][(k + ori) % 2]] = colors[EDGE_FACES[piece][k]]
+        return ''.join(state)
+
+    def to_cube(self, colors=None):
+        """Convert to a facelet Cube."""
+        return Cube.from_state_string(self.to_state_string(colors))
+
+    def to_faces(self, colors=None):
+        """Convert to a face dict of 3x3 colour lists."""
+        state = self.to_state_string(colors)
+        return {face: [list(state[i*9 + row*3:i*9 + row*3 + 3]) for row in range(3)]
+                for i, face in enumerate(FACE_ORDER)}
+
+    def verify(self):
+        """Raise ValueError unless this is a reachable cube state."""
+        if sorted(self.cp) != list(range(8)):
+            raise ValueError("Every corner must appear exactly once")
+        if sorted(self.ep) != list(range(12)):
+            raise ValueError("Every edge must appear exactly once")
+        if sum(self.co) % 3:
+            raise ValueError("Corner twist is not solvable (one corner is twisted)")
+        if sum(self.eo) % 2:
+            raise ValueError("Edge flip is not solvable (one edge is flipped)")
+        if _perm_parity(self.cp) != _perm_parity(self.ep):
+            raise ValueError("Permutation parity is not solvable (two pieces are swapped)")
+
+    def multiply(self, other):
+        """Apply other after self, in place."""
+        cp, co, ep, eo = self.cp, self.co, self.ep, self.eo
+        self.cp = [cp[p] for p in other.cp]
+        self.co = [(co[p] + o) % 3 for p, o in zip(other.cp, other.co)]
+        self.ep = [ep[p] for p in other.ep]
+        self.eo = [(eo[p] + o) % 2 for p, o in zip(other.ep, other.eo)]
+
+    def apply_move(self, move):
+        """Apply a move given as a name or an index into MOVE_NAMES."""
+        if isinstance(move, str):
+            move = MOVE_NAMES.index(move.strip().upper())
+        self.multiply(MOVE_CUBES[move])
+
+    # Coordinates. Each get_* returns an integer and set_* builds a cube that
+    # has that coordinate; the solved cube's values are in SOLVED_COORDS.
+
+    def get_twist(self):
+        twist = 0
+        for ori in self.co[:7]:
+            twist = twist * 3 + ori
+        return twist
+
+    def set_twist(self, twist):
+        total = 0
+        for i in range(6, -1, -1):
+            self.co[i] = twist % 3
+            total += self.co[i]
+            twist //= 3
+        self.co[7] = -total % 3
+
+    def get_flip(self):
+        flip = 0
+        for ori in self.eo[:11]:
+            flip = flip * 2 + ori
+        return flip
+
+    def set_flip(self, flip):
+        total = 0
+        for i in range(10, -1, -1):
+            self.eo[i] = flip % 2
+            total += self.eo[i]
+            flip //= 2
+        self.eo[11] = total % 2
+
+    def get_corners(self):
+        return _perm_rank(self.cp)
+
+    def set_corners(self, index):
+        self.cp = _perm_unrank(index, 8)
+
+    def get_ud_edges(self):
+        """Permutation of the 8 U/D edges; only meaningful when the slice edges are in the slice."""
+        return _perm_rank(self.ep[:8])
+
+    def set_ud_edges(self, index):
+        self.ep = _perm_unrank(index, 8) + list(SLICE_EDGES)
+
+    def _get_edge_subset(self, pieces):
+        """Positions (as a combination) and order of the given edges."""
+        comb = k = 0
+        order = []
+        for pos in range(12):
+            piece = self.ep[pos]
+            if piece in pieces:
+                k += 1
+                comb += _binomial(pos, k)
+                order.append(piece - pieces[0])
+        order_rank = _perm_rank(order)
+        return comb * 24 + order_rank
+
+    def _set_edge_subset(self, index, pieces):
+        comb, order_rank = divmod(index, 24)
+        order = _perm_unrank(order_rank, 4)
+        others = [e for e in range(12) if e not in pieces]
+        positions = []
+        for k in range(4, 0, -1):
+            pos = k - 1
+            while _binomial(pos + 1, k) <= comb:
+                pos += 1
+            comb -= _binomial(pos, k)
+            positions.append(pos)
+        positions.reverse()
+        ep = [None] * 12
+        for pos, o in zip(positions, order):
+            ep[pos] = pieces[o]
+        for pos in range(12):
+            if ep[pos] is None:
+                ep[pos] = others.pop(0)
+        self.ep = ep
+
+    def get_slice_sorted(self):
+        """Positions and order of the FR, FL, BL and BR edges."""
+        return self._get_edge_subset(SLICE_EDGES)
+
+    def set_slice_sorted(self, index):
+        self._set_edge_subset(index, SLICE_EDGES)
+
+    def get_u_edges(self):
+        """Positions and order of the UR, UF, UL and UB edges."""
+        return self._get_edge_subset(U_EDGES)
+
+    def set_u_edges(self, index):
+        self._set_edge_subset(index, U_EDGES)
+
+    def get_d_edges(self):
+        """Positions and order of the DR, DF, DL and DB edges."""
+        return self._get_edge_subset(D_EDGES)
+
+    def set_d_edges(self, index):
+        self._set_edge_subset(index, D_EDGES)
+
+    def get_facelet_permutation(self):
+        """Facelet each sticker is on, indexed by the sticker's solved facelet, as 54 bytes.
+
+        This is Cube's sticker-position buffer for the same state; centres
+        never move.
+        """
+        perm = bytearray(IDENTITY_FACELETS)
+        for i in range(8):
+            piece, ori = self.cp[i], self.co[i]
+            for k in range(3):
+                perm[CORNER_FACELETS[piece][k]] = CORNER_FACELETS[i][(k + ori) % 3]
+        for i in range(12):
+            piece, ori = self.ep[i], self.eo[i]
+            for k in range(2):
+                perm[EDGE_FACELETS[piece][k]] = EDGE_FACELETS[i][(k + ori) % 2]
+        return bytes(perm)
+
+    def get_sticker_key(self):
+        """Facelet holding each piece's reference sticker, corners then edges.
+
+        The reference sticker is the piece's first facelet in CORNER_FACELETS
+        or EDGE_FACELETS, so the solved key is SOLVED_STICKER_KEY. The 20
+        bytes fix the whole state, and bytes.translate with a MOVE_TABLES
+        entry applies that move to the key.
+        """
+        key = bytearray(20)
+        for i in range(8):
+            key[self.cp[i]] = CORNER_FACELETS[i][self.co[i]]
+        for i in range(12):
+            key[8 + self.ep[i]] = EDGE_FACELETS[i][self.eo[i]]
+        return bytes(key)
+
+    def get_coords(self):
+        """Full-state coordinates, in COORD_NAMES order."""
+        return (self.get_twist(), self.get_flip(), self.get_corners(),
+                self.get_slice_sorted(), self.get_u_edges(), self.get_d_edges())
+
+    @classmethod
+    def from_coords(cls, coords):
+        """Inverse of get_coords."""
+        twist, flip, corners, slice_sorted, u_edges, d_edges = coords
+        cubie = cls()
+        cubie.set_twist(twist)
+        cubie.set_flip(flip)
+        cubie.set_corners(corners)
+        ep = [None] * 12
+        for index, pieces in ((slice_sorted, SLICE_EDGES), (u_edges, U_EDGES), (d_edges, D_EDGES)):
+            part = cls()
+            part._set_edge_subset(index, pieces)
+            for pos, piece in enumerate(part.ep):
+                if piece in pieces:
+                    ep[pos] = piece
+        cubie.ep = ep
+        return cubie
+
+
+def _perm_parity(perm):
+    """Parity (0 even, 1 odd) of a permutation."""
+    parity = 0
+    for i in range(len(perm)):
+        for j in range(i + 1, len(perm)):
+            if perm[j] < perm[i]:
+                parity ^= 1
+    return parity
+
+
+def _move_cube(name):
+    """Cubie cube of a single move, read off the facelet move tables."""
+    cube = Cube()
+    cube.apply_move(name)
+    return CubieCube.from_cube(cube)
+
+
+MOVE_CUBES = [_move_cube(name) for name in MOVE_NAMES]
+SOLVED_STICKER_KEY = CubieCube().get_sticker_key()
+# Index of the inverse of each move in MOVE_NAMES (U <-> U', U2 <-> U2)
+INVERSE_MOVES = [m - m % 3 + (1, 0, 2)[m % 3] for m in range(18)]
+
+
+def _build_symmetries():
+    """The 48 symmetries of the cube as facelet permutations, identity first.
+
+    Each facelet gets a point on the cube surface (doubled so it stays
+    integral; x right, y up, z front) and every signed permutation of the
+    axes, i.e. every rotation and reflection, maps it to another facelet.
+    """
+    points = []
+    for face in FACE_ORDER:
+        for row in range(3):
+            for col in range(3):
+                x, y = 2 * col - 2, 2 * row - 2
+                points.append({'U': (x, 3, y), 'D': (x, -3, -y),
+                               'L': (-3, -y, x), 'R': (3, -y, -x),
+                               'F': (x, -y, 3), 'B': (-x, -y, -3)}[face])
+    index = {point: i for i, point in enumerate(points)}
+    symmetries = []
+    for axes in itertools.permutations(range(3)):
+        for signs in itertools.product((1, -1), repeat=3):
+            symmetries.append(bytes(
+                index[tuple(sign * point[axis] for sign, axis in zip(signs, axes))]
+                for point in points))
+    return symmetries
+
+
+SYMMETRIES = _build_symmetries()
+_TRANSLATE_PAD = bytes(range(54, 256))
+_SYMMETRY_TABLES = [sym + _TRANSLATE_PAD for sym in SYMMETRIES]
+_SYMMETRY_INVERSE_TABLES = [bytes.maketrans(sym, IDENTITY_FACELETS) for sym in SYMMETRIES]
+SYMMETRY_INVERSES = [SYMMETRIES.index(inverse[:54]) for inverse in _SYMMETRY_INVERSE_TABLES]
+# MOVE_CONJUGATES[s][m]: the move S M S^-1 for S = SYMMETRIES[s]. Reflections
+# turn the opposite way, so e.g. the left-right mirror sends R to L'.
+_MOVE_BY_TABLE = {MOVE_TABLES[name]: m for m, name in enumerate(MOVE_NAMES)}
+MOVE_CONJUGATES = [
+    [_MOVE_BY_TABLE[inverse.translate(MOVE_TABLES[move]).translate(table)] for move in MOVE_NAMES]
+    for table, inverse in zip(_SYMMETRY_TABLES, _SYMMETRY_INVERSE_TABLES)
+]
+# Per symmetry: where to gather the reference stickers of the conjugated state
+_SYMMETRY_KEY_GATHERS = [SOLVED_STICKER_KEY.translate(inverse)
+                         for inverse in _SYMMETRY_INVERSE_TABLES]
+
+
+def canonical_sticker_key(positions):
+    """Smallest sticker key among the 48 symmetric copies of a state.
+
+    positions is a 54-byte facelet permutation (see
+    CubieCube.get_facelet_permutation). Returns (key, s) where key is the
+    20-byte sticker key of S P S^-1 for S = SYMMETRIES[s]. Symmetric states
+    share a key, so it can index visited sets, tables and caches that are
+    up to 48 times smaller; solutions found for the canonical state map back
+    with conjugate_moves(solution, SYMMETRY_INVERSES[s]).
+    """
+    table = positions + _TRANSLATE_PAD
+    return min((gather.translate(table).translate(sym_table), s)
+               for s, (gather, sym_table) in enumerate(zip(_SYMMETRY_KEY_GATHERS, _SYMMETRY_TABLES)))
+
+
+def canonical_key(cube):
+    """canonical_sticker_key of a Cube, with the key packed into an int."""
+    if cube._stickers == SOLVED_FACELETS:
+        positions = cube._positions  # a scrambled default cube tracks them already
+    else:
+        positions = CubieCube.from_cube(cube).get_facelet_permutation()
+    key, symmetry = canonical_sticker_key(positions)
+    return int.from_bytes(key, 'little'), symmetry
+
+
+def conjugate_moves(moves, symmetry):
+    """Map move names m to S m S^-1 for S = SYMMETRIES[symmetry]."""
+    conjugates = MOVE_CONJUGATES[symmetry]
+    return [MOVE_NAMES[conjugates[MOVE_NAMES.index(move)]] for move in moves]
+
+# Size, getter and setter of every coordinate that has a move table.
+COORDINATES = {
+    'twist': (N_TWIST, CubieCube.get_twist, CubieCube.set_twist),
+    'flip': (N_FLIP, CubieCube.get_flip, CubieCube.set_flip),
+    'corners': (N_CORNERS, CubieCube.get_corners, CubieCube.set_corners),
+    'slice_sorted': (N_EDGE_SUBSET, CubieCube.get_slice_sorted, CubieCube.set_slice_sorted),
+    'u_edges': (N_EDGE_SUBSET, CubieCube.get_u_edges, CubieCube.set_u_edges),
+    'd_edges': (N_EDGE_SUBSET, CubieCube.get_d_edges, CubieCube.set_d_edges),
+    # Only the PHASE2_MOVES columns of this table are meaningful
+    'ud_edges': (N_UD_EDGES, CubieCube.get_ud_edges, CubieCube.set_ud_edges),
+}
+COORD_NAMES = ('twist', 'flip', 'corners', 'slice_sorted', 'u_edges', 'd_edges')
+COORD_SIZES = tuple(COORDINATES[name][0] for name in COORD_NAMES)
+SOLVED_COORDS = CubieCube().get_coords()
+
+TABLE_DIR = os.environ.get('RUBIKS_TABLE_DIR') or os.path.join(
+    os.path.expanduser('~'), '.cache', 'rubiks-solver')
+_TABLES = {}
+# Every table file starts with this header: magic, TABLE_VERSION, typecode,
+# entry count, a CRC-32 of the data and the coordinate scheme: the sizes of
+# the outer and inner coordinate of an entry index (outer * inner), the
+# bits per entry and how many moves the table was built with (zeros for
+# tables without one). Bump TABLE_VERSION whenever a builder or this header
+# changes what it writes, and every cached file is rebuilt.
+TABLE_HEADER = struct.Struct('<4sHcxQIIIBB2x')
+TABLE_MAGIC = b'RBXT'
+TABLE_VERSION = 2
+# Processes a distance table build may use; the --build-tables command
+# defaults to one per core
+TABLE_WORKERS = int(os.environ.get('RUBIKS_TABLE_WORKERS') or 1)
+# Smaller distance tables are always built in this process
+PARALLEL_TABLE_MIN = 1 << 22
+# Entries of one BFS level handed to a pool worker at a time
+BFS_CHUNK = 1 << 18
+# Seconds between checkpoints of a distance table being built
+CHECKPOINT_INTERVAL = 30.0
+
+
+def _table_scheme(typecode, coords, bits=None):
+    """Header scheme fields for coords = (outer size, inner size, moves), or zeros."""
+    if coords is None:
+        return (0, 0, 0, 0)
+    outer, inner, moves = coords
+    return (outer, inner, bits or array(typecode).itemsize * 8, moves)
+
+
+def _map_table(path, typecode, size, scheme=None):
+    """Memory-map a cached table read-only; None if it is missing, stale or corrupt."""
+    try:
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(data) < TABLE_HEADER.size:
+        return None
+    magic, version, code, count, checksum, *stored = TABLE_HEADER.unpack_from(data)
+    body = memoryview(data)[TABLE_HEADER.size:]
+    if ((magic, version, code, count) != (TABLE_MAGIC, TABLE_VERSION, typecode.encode('ascii'), size)
+            or len(body) != size * array(typecode).itemsize or zlib.crc32(body) != checksum
+            or tuple(stored) != (scheme or (0, 0, 0, 0))):
+        return None
+    return body.cast(typecode)
+
+
+def _write_table(path, typecode, size, data, scheme=None):
+    """Write data (size entries of typecode) to path with a header, atomically."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, typecode.encode('ascii'), size, zlib.crc32(data),
+                                  *(scheme or (0, 0, 0, 0))))
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _cached_table(path, typecode, size, builder, scheme=None):
+    """Map the table at path, building and writing it first if needed."""
+    table = _map_table(path, typecode, size, scheme)
+    if table is None:
+        data = builder()
+        try:
+            _write_table(path, typecode, size, data, scheme)
+            table = _map_table(path, typecode, size, scheme)
+        except OSError:
+            pass  # Read-only home: keep the table in memory only
+        if table is None:
+            table = memoryview(data).cast(typecode) if isinstance(data, (bytes, bytearray)) else data
+    return table
+
+
+def load_table(name, typecode, size, builder, coords=None):
+    """Return a precomputed table, loading it from TABLE_DIR or building it once.
+
+    Tables are mapped the first time something asks for them. Cached
+    tables are memory-mapped read-only, so every process using them shares
+    a single copy in the page cache; a file with the wrong version, size,
+    checksum or coordinate scheme is rebuilt. coords, if given, is the
+    scheme as (outer size, inner size, number of moves).
+    """
+    table = _TABLES.get(name)
+    if table is None:
+        table = _TABLES[name] = _cached_table(os.path.join(TABLE_DIR, f"{name}.tbl"), typecode, size, builder,
+                                              _table_scheme(typecode, coords))
+    return table
+
+
+def _build_coord_move_table(name):
+    """Move table for a coordinate: entry coord * 18 + move is the new coordinate."""
+    size, getter, setter = COORDINATES[name]
+    quarter_turns = [MOVE_CUBES[face * 3] for face in range(6)]
+    table = array('H', bytes(2 * size * 18))
+    cubie = CubieCube()
+    for coord in range(size):
+        setter(cubie, coord)
+        for face, move_cube in enumerate(quarter_turns):
+            moved = cubie.copy()
+            # One, two and three quarter turns give the cw, half and ccw moves
+            for offset in (0, 2, 1):
+                moved.multiply(move_cube)
+                table[coord * 18 + face * 3 + offset] = getter(moved)
+    return table
+
+
+def coord_move_table(name):
+    """Move table for one of the coordinates in COORDINATES."""
+    size = COORDINATES[name][0]
+    return load_table(f"move_{name}", 'H', size * 18,
+                      lambda: _build_coord_move_table(name), (size, 18, 18))
+
+
+def coords_key(coords):
+    """Pack full-state coordinates into a single integer."""
+    key = 0
+    for coord, size in zip(coords, COORD_SIZES):
+        key = key * size + coord
+    return key
+
+
+class TranspositionTable:
+    """Fixed-size hash table from full states to a search depth.
+
+    Slots live in two arrays preallocated to fit memory_limit_mb: 64-bit
+    keys ('Q') and depths ('B', stored plus one so 0 marks an empty slot).
+    A state has more than 64 bits of coordinates, so key() folds
+    coords_key through a multiplicative hash; two states collide with odds
+    of about 2**-64. Each key has one slot: 'depth_preferred' keeps
+    whichever entry has the larger depth, 'always_replace' keeps the newest.
+    """
+
+    POLICIES = ('depth_preferred', 'always_replace')
+    SLOT_BYTES = 9
+
+    def __init__(self, memory_limit_mb=64, policy='depth_preferred'):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        self.policy = policy
+        self.size = max(1, int(memory_limit_mb * 2**20) // self.SLOT_BYTES)
+        self.keys = array('Q', bytes(8 * self.size))
+        self.depths = array('B', bytes(self.size))
+        self.stores = self.replacements = self.rejected = 0
+
+    @staticmethod
+    def key(coords, last_face=6):
+        """64-bit key of a full-state coordinate tuple.
+
+        A search that only tries CANONICAL_SUCCESSORS of the last move sees
+        a different subtree below the same state for each last face, so it
+        passes that face (6 for none) to keep the bounds apart.
+        """
+        h = (coords_key(coords) * 7 + last_face) * 0x9E3779B97F4A7C15
+        return (h ^ (h >> 64)) & 0xFFFFFFFFFFFFFFFF
+
+    def probe(self, key):
+        """Depth stored for key, or None."""
+        slot = key % self.size
+        if self.depths[slot] and self.keys[slot] == key:
+            return self.depths[slot] - 1
+        return None
+
+    def store(self, key, depth):
+        """Record depth for key, subject to the replacement policy."""
+        slot = key % self.size
+        stored = self.depths[slot]
+        if stored and self.keys[slot] != key:
+            if self.policy == 'depth_preferred' and stored - 1 > depth:
+                self.rejected += 1
+                return
+            self.replacements += 1
+        elif stored and stored - 1 >= depth:
+            return
+        self.keys[slot] = key
+        self.depths[slot] = depth + 1
+        self.stores += 1
+
+    def __len__(self):
+        return self.size - self.depths.count(0)
 
 
 class MoveGenerator:
@@ -205,18 +1016,23 @@ class MoveGenerator:
         """Return all possible moves."""
         return self.all_moves
     
-    def get_random_scramble(self, length=15):
-        """Generate a random scramble sequence."""
+    def get_successors(self, last_move=None):
+        """Return the moves worth trying after last_move (see CANONICAL_SUCCESSORS)."""
+        last = -1 if last_move is None else self.all_moves.index(last_move)
+        return [self.all_moves[m] for m in CANONICAL_SUCCESSORS[last]]
+    
+    def get_random_scramble(self, length=15, rng=random):
+        """Generate a random scramble sequence; pass a seeded random.Random as rng to reproduce it."""
         scramble = []
         last_face = None
         
         for _ in range(length):
             # Avoid consecutive moves on the same face
             available_moves = [m for m in self.basic_moves if m != last_face]
-            face = random.choice(available_moves)
+            face = rng.choice(available_moves)
             
             # Prefer simpler moves for better scrambles
-            rotation_type = random.choice(['', "'", "'", "2"])  # More inverse moves
+            rotation_type = rng.choice(['', "'", "'", "2"])  # More inverse moves
             move = face + rotation_type
             
             scramble.append(move)
@@ -225,54 +1041,1969 @@ class MoveGenerator:
         return ' '.join(scramble)
 
 
-class StatePrediction:
-    """Predict cube states after applying moves."""
+class StatePrediction:
+    """Predict cube states after applying moves."""
+    
+    def __init__(self, cube):
+        self.cube = cube.copy()
+    
+    def simulate_move(self, move):
+        """Simulate a move and return the resulting state."""
+        temp_cube = self.cube.copy()
+        temp_cube.apply_move(move)
+        return temp_cube
+    
+    def simulate_sequence(self, moves):
+        """Simulate a sequence of moves."""
+        temp_cube = self.cube.copy()
+        temp_cube.apply_sequence(moves)
+        return temp_cube
+    
+    def get_all_next_states(self):
+        """Get all possible next states from current position."""
+        move_gen = MoveGenerator()
+        next_states = {}
+        
+        for move in move_gen.get_all_moves():
+            next_state = self.simulate_move(move)
+            next_states[move] = next_state
+        
+        return next_states
+    
+    # Batch methods: N cubes as an (N, 54) uint8 array of facelet colour
+    # characters in get_state_string order. Row r of a move's gather index
+    # is the facelet whose sticker lands on facelet r, so one fancy index
+    # applies a move (or a whole sequence) to every row at once.
+    _gathers = None
+    
+    @classmethod
+    def _gather_indices(cls):
+        global np
+        if np is None:
+            try:
+                import numpy as np
+            except ImportError:
+                raise ImportError("StatePrediction batch methods require NumPy") from None
+        if cls._gathers is None:
+            gathers = np.empty((18, 54), dtype=np.intp)
+            for m, name in enumerate(MOVE_NAMES):
+                gathers[m, list(MOVE_TABLES[name][:54])] = np.arange(54)
+            cls._gathers = gathers
+        return cls._gathers
+    
+    @classmethod
+    def batch_from_cubes(cls, cubes):
+        """Pack cubes (or state strings) into an (N, 54) uint8 array."""
+        cls._gather_indices()
+        data = b''.join(cube if isinstance(cube, bytes) else
+                        (cube if isinstance(cube, str) else cube.get_state_string()).encode('ascii')
+                        for cube in cubes)
+        return np.frombuffer(data, dtype=np.uint8).reshape(-1, 54).copy()
+    
+    @staticmethod
+    def batch_to_cubes(states):
+        """Unpack an (N, 54) array into a list of Cube objects."""
+        return [Cube.from_state_string(row.tobytes().decode('ascii')) for row in states]
+    
+    @classmethod
+    def batch_apply(cls, states, moves):
+        """Apply one move or a move sequence to every row of states."""
+        cls._gather_indices()
+        index = np.empty(54, dtype=np.intp)
+        index[list(compile_moves(moves).table[:54])] = np.arange(54)
+        return states[:, index]
+    
+    @classmethod
+    def batch_expand(cls, states):
+        """All 18 successors of every row, as an (N * 18, 54) array.
+
+        Row i * 18 + m holds row i after MOVE_NAMES[m].
+        """
+        gathers = cls._gather_indices()
+        return states[:, gathers].reshape(-1, 54)
+    
+    @classmethod
+    def batch_is_solved(cls, states):
+        """Boolean array: which rows show a solved cube, as Cube.is_solved sees it."""
+        cls._gather_indices()
+        return (states == np.frombuffer(SOLVED_FACELETS, dtype=np.uint8)).all(axis=1)
+
+
+N_SLICE = 495          # positions of the 4 slice edges, ignoring their order
+N_SLICE_PERM = 24      # order of the slice edges once they are in the slice
+SOLVED_SLICE = SOLVED_COORDS[3] // N_SLICE_PERM
+
+# Moves that keep a cube inside G1 = <U, D, L2, R2, F2, B2>
+PHASE2_MOVES = [MOVE_NAMES.index(name) for name in
+                ('U', "U'", 'U2', 'D', "D'", 'D2', 'L2', 'R2', 'F2', 'B2')]
+PHASE2_SUCCESSORS = [tuple(m for m in successors if m in PHASE2_MOVES)
+                     for successors in CANONICAL_SUCCESSORS]
+
+
+_BFS_WORKER = {}
+
+
+def _init_bfs_worker(shm_name, table_a, size_b, table_b, moves):
+    """Pool initializer: attach the shared distance table and unpack the move tables."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _BFS_WORKER.update(shm=shm, table=shm.buf, table_a=array(*table_a), size_b=size_b,
+                       table_b=array(*table_b), moves=moves)
+
+
+def _bfs_chunk(task):
+    """Pool worker: next-level entries found from one range of a BFS level, as 'I' array bytes.
+
+    Forward, the range's states on the level report their unvisited
+    neighbours (possibly twice); backward, its unvisited states that have a
+    neighbour on the level report themselves.
+    """
+    lo, hi, depth, forward = task
+    worker = _BFS_WORKER
+    table, table_a, size_b, table_b, moves = (
+        worker['table'], worker['table_a'], worker['size_b'], worker['table_b'], worker['moves'])
+    found = array('I')
+    target = bytes([depth]) if forward else b'\xff'
+    chunk = bytes(table[lo:hi])
+    index = chunk.find(target)
+    while index != -1:
+        a, b = divmod(lo + index, size_b)
+        a *= 18
+        b *= 18
+        for m in moves:
+            child = table_a[a + m] * size_b + table_b[b + m]
+            if forward:
+                if table[child] == 255:
+                    found.append(child)
+            elif table[child] == depth:
+                found.append(lo + index)
+                break
+        index = chunk.find(target, index + 1)
+    return found.tobytes()
+
+
+def _parallel_bfs_level(pool, shm, table, depth, forward):
+    """Find level depth + 1 of table on the pool; returns how many states it holds."""
+    size = len(table)
+    shm.buf[:size] = table
+    tasks = [(lo, min(lo + BFS_CHUNK, size), depth, forward) for lo in range(0, size, BFS_CHUNK)]
+    added = 0
+    for found in pool.imap_unordered(_bfs_chunk, tasks):
+        for index in array('I', found):
+            if table[index] == 255:
+                table[index] = depth + 1
+                added += 1
+    return added
+
+
+def _build_pruning_table(table_a, size_b, table_b, moves, start, checkpoint=None, workers=None):
+    """Breadth-first distances over the product of two coordinates.
+
+    Entry a * size_b + b of the returned bytearray is the number of moves
+    needed to reach the start pair from (a, b); both coordinate move tables
+    are indexed coord * 18 + m. The search is level-synchronous: each level
+    is found with bytearray.find, and once fewer states are left unvisited
+    than the level holds, the unvisited states look for a neighbour on the
+    level instead. Tables of PARALLEL_TABLE_MIN entries or more split each
+    level into BFS_CHUNK ranges across a pool of workers processes
+    (TABLE_WORKERS by default) that read the table from shared memory.
+    With a checkpoint name, the finished levels are saved to
+    TABLE_DIR/<checkpoint>.ckpt every CHECKPOINT_INTERVAL seconds and an
+    interrupted build carries on from there.
+    """
+    moves = list(moves)
+    size = len(table_a) // 18 * size_b
+    scheme = (len(table_a) // 18, size_b, 8, len(moves))
+    path = checkpoint and os.path.join(TABLE_DIR, f"{checkpoint}.ckpt")
+    saved = path and _map_table(path, 'B', size, scheme)
+    depth = 0
+    if saved:
+        table = bytearray(saved)
+        del saved
+        while bytes([depth + 1]) in table:
+            depth += 1
+    else:
+        table = bytearray(b'\xff') * size
+        table[start] = 0
+    visited = size - table.count(b'\xff')
+    workers = TABLE_WORKERS if workers is None else workers
+    if size < PARALLEL_TABLE_MIN or multiprocessing.current_process().daemon:
+        workers = 1
+    pool = shm = None
+    if workers > 1:
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        move_tables = [(memoryview(t).format, memoryview(t).tobytes()) for t in (table_a, table_b)]
+        pool = multiprocessing.Pool(workers, _init_bfs_worker,
+                                    (shm.name, move_tables[0], size_b, move_tables[1], moves))
+    saved_at = time.monotonic()
+    try:
+        while visited < size:
+            level = bytes([depth])
+            frontier = table.count(level)
+            if not frontier:
+                break
+            forward = size - visited > frontier
+            if pool is not None:
+                visited += _parallel_bfs_level(pool, shm, table, depth, forward)
+                depth += 1
+            else:
+                target = level if forward else b'\xff'
+                index = table.find(target)
+                while index != -1:
+                    a, b = divmod(index, size_b)
+                    a *= 18
+                    b *= 18
+                    for m in moves:
+                        child = table_a[a + m] * size_b + table_b[b + m]
+                        if forward:
+                            if table[child] == 255:
+                                table[child] = depth + 1
+                                visited += 1
+                        elif table[child] == depth:
+                            table[index] = depth + 1
+                            visited += 1
+                            break
+                    index = table.find(target, index + 1)
+                depth += 1
+            if path and time.monotonic() - saved_at >= CHECKPOINT_INTERVAL:
+                with contextlib.suppress(OSError):
+                    _write_table(path, 'B', size, table, scheme)
+                saved_at = time.monotonic()
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+            shm.close()
+            shm.unlink()
+    if path:
+        with contextlib.suppress(OSError):
+            os.remove(path)
+    return table
+
+
+def _pack_nibbles(table):
+    """Pack a bytearray of values below 16 two to a byte, low nibble first."""
+    if len(table) % 2:
+        table = table + b'\x00'
+    low = int.from_bytes(table[0::2], 'little')
+    high = int.from_bytes(table[1::2], 'little')
+    # Every value fits in four bits, so shifting the whole integer never
+    # carries into the neighbouring byte.
+    return (low | (high << 4)).to_bytes(len(table) // 2, 'little')
+
+
+def load_pruning_table(name, size, builder, coords=None):
+    """Return a nibble-packed distance table, memory-mapped from TABLE_DIR.
+
+    builder returns one byte per entry; the table is packed and written on
+    first use, and every process afterwards maps the same file read-only.
+    Read an entry i as (table[i >> 1] >> ((i & 1) << 2)) & 15. coords is
+    the scheme as for load_table.
+    """
+    table = _TABLES.get(name)
+    if table is None:
+        table = _TABLES[name] = _cached_table(os.path.join(TABLE_DIR, f"{name}.pdb"), 'B', (size + 1) // 2,
+                                              lambda: _pack_nibbles(builder()), _table_scheme('B', coords, 4))
+    return table
+
+
+def load_distance_table(name, table_a, size_b, table_b, moves, start, packed=False):
+    """Return the _build_pruning_table distances for a product of two coordinates, cached as name.
+
+    A packed table is nibble-packed as by load_pruning_table, otherwise it
+    has a byte per entry. An interrupted build resumes from its checkpoint.
+    """
+    moves = list(moves)
+    coords = (len(table_a) // 18, size_b, len(moves))
+    size = coords[0] * size_b
+    builder = lambda: _build_pruning_table(table_a, size_b, table_b, moves, start, checkpoint=name)
+    if packed:
+        return load_pruning_table(name, size, builder, coords)
+    return load_table(name, 'B', size, builder, coords)
+
+
+def _derived_move_table(table, size, scale, offset, reduce):
+    """Move table for a coarser coordinate read off an existing move table."""
+    result = array('H', bytes(2 * size * 18))
+    for coord in range(size):
+        base = (coord * scale + offset) * 18
+        for m in range(18):
+            result[coord * 18 + m] = reduce(table[base + m])
+    return result
+
+
+def slice_move_table():
+    """Move table of which four positions hold the E-slice edges (N_SLICE values)."""
+    return load_table('move_slice', 'H', N_SLICE * 18, lambda: _derived_move_table(
+        coord_move_table('slice_sorted'), N_SLICE, N_SLICE_PERM, 0, lambda s: s // N_SLICE_PERM),
+        (N_SLICE, 18, 18))
+
+
+class _TableSet:
+    """Base of a solver's bundle of tables: one shared instance, built by get() on first use."""
+
+    _instance = None
+
+    @classmethod
+    def get(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+
+class TwoPhaseTables(_TableSet):
+    """Move and pruning tables used by TwoPhaseSolver, loaded on first use."""
+
+    def __init__(self):
+        slice_sorted = coord_move_table('slice_sorted')
+        self.twist = coord_move_table('twist')
+        self.flip = coord_move_table('flip')
+        self.slice = slice_move_table()
+        self.corners = coord_move_table('corners')
+        self.ud_edges = coord_move_table('ud_edges')
+        self.slice_perm = load_table('move_slice_perm', 'H', N_SLICE_PERM * 18, lambda: _derived_move_table(
+            slice_sorted, N_SLICE_PERM, 1, SOLVED_SLICE * N_SLICE_PERM, lambda s: s % N_SLICE_PERM),
+            (N_SLICE_PERM, 18, 18))
+
+        all_moves = range(18)
+        self.twist_slice = load_distance_table('prune_twist_slice', self.twist, N_SLICE, self.slice,
+                                               all_moves, SOLVED_SLICE)
+        self.flip_slice = load_distance_table('prune_flip_slice', self.flip, N_SLICE, self.slice,
+                                              all_moves, SOLVED_SLICE)
+        self.corners_slice = load_distance_table('prune_corners_slice_perm', self.corners, N_SLICE_PERM,
+                                                 self.slice_perm, PHASE2_MOVES, 0)
+        self.ud_edges_slice = load_distance_table('prune_ud_edges_slice_perm', self.ud_edges, N_SLICE_PERM,
+                                                  self.slice_perm, PHASE2_MOVES, 0)
+
+
+class _SearchDone(Exception):
+    """Raised inside a search to unwind once it has a good enough answer."""
+
+
+class SearchStats:
+    """Counters describing one search, filled in by the engine that ran it.
+
+    expanded[d] and generated[d] count the nodes expanded and the children
+    they generated d moves from the root, summed over all iterations of an
+    iterative deepening search. lookups counts pruning-table probes and
+    cutoffs the children those probes rejected; duplicates counts states
+    skipped because they were already seen. phases maps a phase name to
+    the seconds spent in it.
+    """
+
+    def __init__(self, max_depth=30):
+        self.expanded = [0] * (max_depth + 1)
+        self.generated = [0] * (max_depth + 1)
+        self.lookups = 0
+        self.cutoffs = 0
+        self.duplicates = 0
+        self.phases = {}
+
+    def merge(self, other, offset=0):
+        """Add the counters of other, a search rooted offset moves below this one."""
+        for depth, (expanded, generated) in enumerate(zip(other.expanded, other.generated), offset):
+            self.expanded[depth] += expanded
+            self.generated[depth] += generated
+        self.lookups += other.lookups
+        self.cutoffs += other.cutoffs
+        self.duplicates += other.duplicates
+        for phase, seconds in other.phases.items():
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def count_cutoffs(self, cutoffs, generated):
+        """Record cutoffs[k] children rejected by the (k+1)th of len(cutoffs) chained probes.
+
+        Children that pass every probe cost one lookup per table.
+        """
+        passed = generated - sum(cutoffs)
+        self.cutoffs += sum(cutoffs)
+        self.lookups += sum((k + 1) * n for k, n in enumerate(cutoffs)) + passed * len(cutoffs)
+
+    def as_dict(self):
+        """The counters as plain data, without the unused deepest levels."""
+        depth = len(self.expanded)
+        while depth and not self.expanded[depth - 1] and not self.generated[depth - 1]:
+            depth -= 1
+        return {'expanded': self.expanded[:depth], 'generated': self.generated[:depth],
+                'lookups': self.lookups, 'cutoffs': self.cutoffs, 'duplicates': self.duplicates,
+                'phases': dict(self.phases)}
+
+
+class _SearchEngine:
+    """Bookkeeping shared by the search engines.
+
+    Subclasses count nodes and elapsed seconds. Those that call _tick from
+    their search also keep the current depth in _depth and a progress
+    callback (or None), and define _check_deadline.
+    """
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    def _tick(self):
+        """Periodic check from inside the search: report progress, honour the deadline."""
+        if self.progress is not None:
+            self.progress(self._depth, self.nodes)
+        self._check_deadline()
+
+
+class TwoPhaseSolver(_SearchEngine):
+    """Kociemba's two-phase algorithm.
+
+    Phase 1 searches for a move sequence into the subgroup G1 (no twist, no
+    flip, slice edges in the slice); phase 2 solves the rest using only the
+    moves in PHASE2_MOVES. Longer phase 1 sequences keep being tried until
+    a solution of at most target_length moves is found or timeout seconds
+    have passed, in which case the shortest solution so far is returned.
+    iter_solutions streams every improvement instead. If progress is set,
+    it is called as progress(phase1_depth, nodes) every few thousand nodes.
+    search_stats holds the SearchStats of the last search, counting both
+    phases with depths measured from the scrambled cube; its phases split
+    the time into 'phase1' and 'phase2'.
+    """
+
+    MAX_LENGTH = 30  # phase 1 never needs more than 12 moves, phase 2 18
+    # Deep phase 2 searches are slow in Python; another phase 1 leaf is cheaper
+    MAX_PHASE2_LENGTH = 11
+
+    def __init__(self, target_length=22, timeout=1.0, progress=None):
+        self.target_length = target_length
+        self.timeout = timeout
+        self.progress = progress
+        self.tables = TwoPhaseTables.get()
+        self.nodes = 0
+        self.elapsed = 0.0
+        self.search_stats = SearchStats(self.MAX_LENGTH)
+
+    def solve(self, cube):
+        """Return a solution for cube as a list of move names."""
+        best = None
+        for best in self.iter_solutions(cube, time.monotonic() + self.timeout):
+            if len(best) <= self.target_length:
+                break
+        return best
+
+    def iter_solutions(self, cube, deadline, give_up=False):
+        """Yield ever shorter solutions until the search runs dry or deadline passes.
+
+        deadline is a time.monotonic() value; the first solution is yielded
+        even if it arrives later, unless give_up is set: then the search
+        stops at the deadline whether or not it found anything.
+        """
+        self._cubie = CubieCube.from_cube(cube)
+        self._best = None
+        self._path = []
+        self.nodes = 0
+        self.search_stats = SearchStats(self.MAX_LENGTH)
+        self._cutoffs = [0, 0]
+        self._phase2_seconds = 0.0
+        self._deadline = deadline
+        self._give_up = give_up
+        start = time.monotonic()
+
+        t = self.tables
+        twist = self._cubie.get_twist()
+        flip = self._cubie.get_flip()
+        slice_ = self._cubie.get_slice_sorted() // N_SLICE_PERM
+        depth = max(t.twist_slice[twist * N_SLICE + slice_], t.flip_slice[flip * N_SLICE + slice_])
+        try:
+            while depth < (len(self._best) if self._best else self.MAX_LENGTH):
+                self._depth = depth
+                if self.progress is not None:
+                    self.progress(depth, self.nodes)
+                for _ in self._phase1(twist, flip, slice_, depth, -1):
+                    yield [MOVE_NAMES[m] for m in self._best]
+                depth += 1
+        except _SearchDone:
+            pass
+        finally:
+            # Both phases chain two pruning tables, so their cutoffs add up
+            self.elapsed = time.monotonic() - start
+            stats = self.search_stats
+            stats.count_cutoffs(self._cutoffs, sum(stats.generated))
+            stats.phases = {'phase1': self.elapsed - self._phase2_seconds, 'phase2': self._phase2_seconds}
+
+    def _phase1(self, twist, flip, slice_, togo, last_move):
+        """Depth-limited phase 1 search; yields whenever a G1 leaf improves the best solution."""
+        if togo == 0:
+            # A sequence ending in a G1 move reached G1 one move earlier
+            if (not self._path or self._path[-1] not in PHASE2_MOVES) and self._phase2_start(last_move):
+                yield
+            return
+
+        t = self.tables
+        self.nodes += 1
+        if self.nodes & 0x3FF == 0:
+            self._tick()
+        successors = CANONICAL_SUCCESSORS[last_move]
+        stats = self.search_stats
+        depth = len(self._path)
+        stats.expanded[depth] += 1
+        stats.generated[depth] += len(successors)
+        cut_twist = cut_flip = 0
+        for m in successors:
+            new_twist = t.twist[twist * 18 + m]
+            new_slice = t.slice[slice_ * 18 + m]
+            if t.twist_slice[new_twist * N_SLICE + new_slice] >= togo:
+                cut_twist += 1
+                continue
+            new_flip = t.flip[flip * 18 + m]
+            if t.flip_slice[new_flip * N_SLICE + new_slice] >= togo:
+                cut_flip += 1
+                continue
+            self._path.append(m)
+            yield from self._phase1(new_twist, new_flip, new_slice, togo - 1, m)
+            self._path.pop()
+        self._cutoffs[0] += cut_twist
+        self._cutoffs[1] += cut_flip
+
+    def _phase2_start(self, last_move):
+        """Solve the G1 cube reached by the current phase 1 path; True if that beat the best."""
+        self._check_deadline()
+        limit = (len(self._best) if self._best else self.MAX_LENGTH + 1) - 1 - len(self._path)
+        limit = min(limit, self.MAX_PHASE2_LENGTH)
+        if limit < 0:
+            return False
+        cubie = self._cubie.copy()
+        for m in self._path:
+            cubie.multiply(MOVE_CUBES[m])
+        corners = cubie.get_corners()
+        ud_edges = cubie.get_ud_edges()
+        slice_perm = cubie.get_slice_sorted() % N_SLICE_PERM
+
+        t = self.tables
+        depth = max(t.corners_slice[corners * N_SLICE_PERM + slice_perm],
+                    t.ud_edges_slice[ud_edges * N_SLICE_PERM + slice_perm])
+        phase1_length = len(self._path)
+        start = time.monotonic()
+        try:
+            while depth <= limit:
+                if self._phase2(corners, ud_edges, slice_perm, depth, last_move):
+                    self._best = list(self._path)
+                    del self._path[phase1_length:]
+                    return True
+                depth += 1
+            return False
+        finally:
+            self._phase2_seconds += time.monotonic() - start
+
+    def _check_deadline(self):
+        """Stop the search once the deadline has passed and there is a solution (or give_up)."""
+        if (self._best is not None or self._give_up) and time.monotonic() > self._deadline:
+            raise _SearchDone()
+
+    def _phase2(self, corners, ud_edges, slice_perm, togo, last_move):
+        """Depth-limited phase 2 search; leaves the solution on self._path."""
+        if togo == 0:
+            return corners == 0 and ud_edges == 0 and slice_perm == 0
+
+        t = self.tables
+        self.nodes += 1
+        if self.nodes & 0xFFF == 0:
+            self._tick()
+        successors = PHASE2_SUCCESSORS[last_move]
+        stats = self.search_stats
+        depth = len(self._path)
+        stats.expanded[depth] += 1
+        stats.generated[depth] += len(successors)
+        cut_corners = cut_edges = 0
+        for m in successors:
+            new_corners = t.corners[corners * 18 + m]
+            new_slice_perm = t.slice_perm[slice_perm * 18 + m]
+            if t.corners_slice[new_corners * N_SLICE_PERM + new_slice_perm] >= togo:
+                cut_corners += 1
+                continue
+            new_ud_edges = t.ud_edges[ud_edges * 18 + m]
+            if t.ud_edges_slice[new_ud_edges * N_SLICE_PERM + new_slice_perm] >= togo:
+                cut_edges += 1
+                continue
+            self._path.append(m)
+            if self._phase2(new_corners, new_ud_edges, new_slice_perm, togo - 1, m):
+                return True
+            self._path.pop()
+        self._cutoffs[0] += cut_corners
+        self._cutoffs[1] += cut_edges
+        return False
+
+
+class OptimalTables(_TableSet):
+    """Move tables and pattern databases used by OptimalSolver."""
+
+    def __init__(self):
+        self.twist, self.flip, self.corners, self.slice_sorted, self.u_edges, self.d_edges = (
+            coord_move_table(name) for name in COORD_NAMES)
+        all_moves = range(18)
+        # Corner PDB: corner permutation x twist, 88 million entries
+        self.corner_pdb = load_distance_table('pdb_corners', self.corners, N_TWIST, self.twist, all_moves, 0,
+                                              packed=True)
+        # One edge PDB per disjoint edge quartet: its positions x the edge flip
+        self.edge_pdbs = [
+            load_distance_table(f"pdb_{name}_flip", table, N_FLIP, self.flip, all_moves, solved * N_FLIP,
+                                packed=True)
+            for name, table, solved in (('slice_sorted', self.slice_sorted, SOLVED_COORDS[3]),
+                                        ('u_edges', self.u_edges, SOLVED_COORDS[4]),
+                                        ('d_edges', self.d_edges, SOLVED_COORDS[5]))
+        ]
+
+
+class OptimalSolver(_SearchEngine):
+    """IDA* search for a shortest solution in the half-turn metric.
+
+    The heuristic is the maximum of the corner PDB and the three edge PDBs
+    in OptimalTables. Together they cover every piece, so a node with
+    heuristic 0 is the solved cube. nodes counts expanded nodes of the last
+    solve; nodes_per_second is derived from it. With a TranspositionTable,
+    a node whose state already failed with at least as many moves to go is
+    not searched again. If progress is set, it is called as
+    progress(depth, nodes) at each new depth and every 16384 nodes; a set
+    stop_event (a threading or multiprocessing Event) abandons the search at
+    the same checkpoints. search_stats holds the SearchStats of the last
+    solve, with one lookup per PDB probe.
+    """
+
+    def __init__(self, max_length=20, timeout=None, transposition_table=None, progress=None,
+                 stop_event=None):
+        self.max_length = max_length
+        self.timeout = timeout
+        self.transposition_table = transposition_table
+        self.progress = progress
+        self.stop_event = stop_event
+        self.tables = OptimalTables.get()
+        self.nodes = 0
+        self.elapsed = 0.0
+        self.timed_out = False
+        self.search_stats = SearchStats(max_length)
+
+    def heuristic(self, coords):
+        """Lower bound on the distance of a full-state coordinate tuple to solved."""
+        t = self.tables
+        twist, flip, corners, slice_sorted, u_edges, d_edges = coords
+        values = [corners * N_TWIST + twist] + [
+            edges * N_FLIP + flip for edges in (slice_sorted, u_edges, d_edges)]
+        return max((pdb[i >> 1] >> ((i & 1) << 2)) & 15
+                   for pdb, i in zip([t.corner_pdb] + t.edge_pdbs, values))
+
+    def solve(self, cube):
+        """Return a shortest solution as a list of move names, or None.
+
+        None means no solution within max_length moves, or that the timeout
+        hit first, in which case timed_out is set.
+        """
+        coords = CubieCube.from_cube(cube).get_coords()
+        self.nodes = 0
+        self.timed_out = False
+        self.search_stats = SearchStats(self.max_length)
+        self._cutoffs = [0, 0, 0, 0]
+        self._path = []
+        start = time.monotonic()
+        self._deadline = start + self.timeout if self.timeout else None
+        depth = self.heuristic(coords)
+        solution = None
+        try:
+            while depth <= self.max_length:
+                self._depth = depth
+                if self.progress is not None:
+                    self.progress(depth, self.nodes)
+                if self._search(*coords, depth, -1):
+                    solution = [MOVE_NAMES[m] for m in self._path]
+                    break
+                depth += 1
+        except _SearchDone:
+            self.timed_out = True
+        self.elapsed = time.monotonic() - start
+        self.search_stats.count_cutoffs(self._cutoffs, sum(self.search_stats.generated))
+        self.search_stats.phases['ida'] = self.elapsed
+        return solution
+
+    def _check_deadline(self):
+        """Stop the search once the deadline has passed or stop_event is set."""
+        if self._deadline and time.monotonic() > self._deadline:
+            raise _SearchDone()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise _SearchDone()
+
+    def search_subtree(self, coords, togo, last_move, deadline=None):
+        """Moves (indices) solving coords in exactly togo moves after last_move, or None.
+
+        One IDA* iteration below a single node; the caller must already know
+        that heuristic(coords) <= togo. Raises _SearchDone on deadline or
+        stop_event. nodes and search_stats count this call only; the
+        expanded and generated depths are relative to coords.
+        """
+        self.nodes = 0
+        self.search_stats = SearchStats(togo)
+        self._cutoffs = [0, 0, 0, 0]
+        self._path = []
+        self._depth = togo
+        self._deadline = deadline
+        try:
+            return list(self._path) if self._search(*coords, togo, last_move) else None
+        finally:
+            self.search_stats.count_cutoffs(self._cutoffs, sum(self.search_stats.generated))
+
+    def _search(self, twist, flip, corners, slice_sorted, u_edges, d_edges, togo, last_move):
+        """Depth-limited search; leaves the solution on self._path."""
+        if togo == 0:
+            return True
+
+        tt = self.transposition_table
+        if tt is not None:
+            key = tt.key((twist, flip, corners, slice_sorted, u_edges, d_edges),
+                         last_move // 3 if last_move >= 0 else 6)
+            known = tt.probe(key)
+            if known is not None and known >= togo:
+                self.search_stats.duplicates += 1
+                return False
+
+        t = self.tables
+        corner_pdb = t.corner_pdb
+        slice_pdb, u_pdb, d_pdb = t.edge_pdbs
+        self.nodes += 1
+        if self.nodes & 0x3FFF == 0:
+            self._tick()
+        successors = CANONICAL_SUCCESSORS[last_move]
+        stats = self.search_stats
+        depth = len(self._path)
+        stats.expanded[depth] += 1
+        stats.generated[depth] += len(successors)
+        cut_corner = cut_slice = cut_u = cut_d = 0
+        for m in successors:
+            new_twist = t.twist[twist * 18 + m]
+            new_corners = t.corners[corners * 18 + m]
+            i = new_corners * N_TWIST + new_twist
+            if (corner_pdb[i >> 1] >> ((i & 1) << 2)) & 15 >= togo:
+                cut_corner += 1
+                continue
+            new_flip = t.flip[flip * 18 + m]
+            new_slice = t.slice_sorted[slice_sorted * 18 + m]
+            i = new_slice * N_FLIP + new_flip
+            if (slice_pdb[i >> 1] >> ((i & 1) << 2)) & 15 >= togo:
+                cut_slice += 1
+                continue
+            new_u = t.u_edges[u_edges * 18 + m]
+            i = new_u * N_FLIP + new_flip
+            if (u_pdb[i >> 1] >> ((i & 1) << 2)) & 15 >= togo:
+                cut_u += 1
+                continue
+            new_d = t.d_edges[d_edges * 18 + m]
+            i = new_d * N_FLIP + new_flip
+            if (d_pdb[i >> 1] >> ((i & 1) << 2)) & 15 >= togo:
+                cut_d += 1
+                continue
+            self._path.append(m)
+            if self._search(new_twist, new_flip, new_corners, new_slice, new_u, new_d, togo - 1, m):
+                return True
+            self._path.pop()
+        cutoffs = self._cutoffs
+        cutoffs[0] += cut_corner
+        cutoffs[1] += cut_slice
+        cutoffs[2] += cut_u
+        cutoffs[3] += cut_d
+        if tt is not None:
+            tt.store(key, togo)
+        return False
+
+
+class ParallelOptimalSolver(_SearchEngine):
+    """OptimalSolver's IDA* spread over a pool of worker processes.
+
+    Short solutions (up to split_depth + 2 moves) are found in-process.
+    Beyond that, every iteration splits the tree into the canonical move
+    prefixes of split_depth moves that the heuristic does not rule out.
+    Idle workers pull the next prefix from the pool's shared task queue,
+    so uneven subtrees balance out. The first worker to find a solution
+    sets a shared event, and the others abandon their subtrees at their
+    next checkpoint. Daemonic processes (e.g. solve_many workers) cannot
+    start a pool, so there the search runs in-process. search_stats adds up
+    the in-process search and every worker's subtrees.
+    """
+
+    def __init__(self, workers=None, split_depth=2, max_length=20, timeout=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.split_depth = split_depth
+        self.max_length = max_length
+        self.timeout = timeout
+        self.nodes = 0
+        self.elapsed = 0.0
+        self.timed_out = False
+        self.search_stats = SearchStats(max_length)
+
+    def solve(self, cube):
+        """Return a shortest solution as a list of move names, or None (see OptimalSolver.solve)."""
+        start = time.monotonic()
+        deadline = start + self.timeout if self.timeout else None
+        serial = self.workers <= 1 or multiprocessing.current_process().daemon
+        local = OptimalSolver(self.max_length if serial else min(self.max_length, self.split_depth + 2),
+                              self.timeout)
+        solution = local.solve(cube)
+        self.nodes = local.nodes
+        self.timed_out = local.timed_out
+        self.search_stats = SearchStats(self.max_length)
+        self.search_stats.merge(local.search_stats)
+        if solution is None and not serial and not self.timed_out and self.max_length > self.split_depth + 2:
+            parallel_start = time.monotonic()
+            solution = self._solve_parallel(CubieCube.from_cube(cube).get_coords(), local, deadline)
+            self.search_stats.phases['parallel'] = time.monotonic() - parallel_start
+        self.elapsed = time.monotonic() - start
+        return solution
+
+    def _solve_parallel(self, coords, local, deadline):
+        """IDA* iterations from split_depth + 3 moves up, one pool task per prefix."""
+        tables = [coord_move_table(name) for name in COORD_NAMES]
+        prefixes = [((), coords)]
+        for _ in range(self.split_depth):
+            prefixes = [(moves + (m,), tuple([table[c * 18 + m] for table, c in zip(tables, state)]))
+                        for moves, state in prefixes
+                        for m in CANONICAL_SUCCESSORS[moves[-1] if moves else -1]]
+        bounds = [(local.heuristic(state), moves, state) for moves, state in prefixes]
+
+        stop = multiprocessing.Event()
+        with multiprocessing.Pool(self.workers, _init_prefix_search, (stop,)) as pool:
+            for depth in range(self.split_depth + 3, self.max_length + 1):
+                togo = depth - self.split_depth
+                # Most promising subtrees first: a low bound is likelier to hold a solution
+                tasks = [(state, moves, togo, deadline) for bound, moves, state in sorted(bounds) if bound <= togo]
+                solution = None
+                for moves, path, stats, timed_out in pool.imap_unordered(_search_prefix, tasks):
+                    self.nodes += sum(stats.expanded)
+                    self.search_stats.merge(stats, len(moves))
+                    self.timed_out = self.timed_out or timed_out
+                    if path is not None and solution is None:
+                        solution = [MOVE_NAMES[m] for m in moves + tuple(path)]
+                if solution is not None or self.timed_out:
+                    return solution
+        return None
+
+
+_prefix_solver = None
+
+
+def _init_prefix_search(stop):
+    """Pool initializer for ParallelOptimalSolver workers."""
+    global _prefix_solver
+    _prefix_solver = OptimalSolver(stop_event=stop)
+
+
+def _search_prefix(task):
+    """Pool worker: search below one prefix; returns (prefix, path or None, SearchStats, timed_out)."""
+    coords, moves, togo, deadline = task
+    solver = _prefix_solver
+    if solver.stop_event.is_set():
+        return moves, None, SearchStats(0), False
+    if deadline and time.monotonic() > deadline:
+        solver.stop_event.set()  # Out of time: the queued prefixes can all give up
+        return moves, None, SearchStats(0), True
+    try:
+        path = solver.search_subtree(coords, togo, moves[-1], deadline)
+    except _SearchDone:
+        if solver.stop_event.is_set():
+            return moves, None, solver.search_stats, False
+        solver.stop_event.set()
+        return moves, None, solver.search_stats, True
+    if path is not None:
+        solver.stop_event.set()
+    return moves, path, solver.search_stats, False
+
+
+class BidirectionalSolver:
+    """Meet-in-the-middle BFS from the scrambled cube and from the solved cube.
+
+    Each side expands whole levels, always the side with the smaller
+    frontier, and the first state both sides have seen gives a shortest
+    solution. Visited states are stored as integer sticker keys mapped to
+    the move that reached them, so paths are rebuilt by undoing moves.
+    The search gives up (returning None) past max_depth total moves or
+    once the stored states would exceed memory_limit_mb. In search_stats,
+    depths count from the root of whichever side expanded the node.
+    """
+
+    BYTES_PER_STATE = 112  # dict slot, 160-bit int key and frontier slot, measured
+
+    def __init__(self, max_depth=14, memory_limit_mb=512):
+        self.max_depth = max_depth
+        self.memory_limit_mb = memory_limit_mb
+        self.states = 0
+        self.out_of_memory = False
+        self.search_stats = SearchStats(max_depth)
+
+    def solve(self, cube):
+        """Return a shortest solution as a list of move names, or None."""
+        start = int.from_bytes(CubieCube.from_cube(cube).get_sticker_key(), 'little')
+        goal = int.from_bytes(SOLVED_STICKER_KEY, 'little')
+        self.out_of_memory = False
+        self.states = 1
+        self.search_stats = stats = SearchStats(self.max_depth)
+        if start == goal:
+            return []
+
+        move_tables = [MOVE_TABLES[name] for name in MOVE_NAMES]
+        max_states = self.memory_limit_mb * 2**20 // self.BYTES_PER_STATE
+        seen = [{start: -1}, {goal: -1}]
+        frontiers = [[start], [goal]]
+        levels = [0, 0]
+        depth = 0
+        begin = time.monotonic()
+        try:
+            while depth < self.max_depth:
+                side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+                own, other = seen[side], seen[1 - side]
+                level = levels[side]
+                next_frontier = []
+                for key in frontiers[side]:
+                    state = key.to_bytes(20, 'little')
+                    successors = CANONICAL_SUCCESSORS[own[key]]
+                    stats.expanded[level] += 1
+                    stats.generated[level] += len(successors)
+                    for m in successors:
+                        child = int.from_bytes(state.translate(move_tables[m]), 'little')
+                        if child in own:
+                            stats.duplicates += 1
+                            continue
+                        own[child] = m
+                        if child in other:
+                            forward = self._path(seen[0], child, move_tables)
+                            backward = self._path(seen[1], child, move_tables)
+                            return [MOVE_NAMES[m] for m in forward] + [
+                                MOVE_NAMES[INVERSE_MOVES[m]] for m in reversed(backward)]
+                        next_frontier.append(child)
+                    if len(own) + len(other) > max_states:
+                        self.out_of_memory = True
+                        return None
+                frontiers[side] = next_frontier
+                levels[side] += 1
+                depth += 1
+            return None
+        finally:
+            self.states = len(seen[0]) + len(seen[1])
+            stats.phases['bidirectional'] = time.monotonic() - begin
+
+    @staticmethod
+    def _path(seen, key, move_tables):
+        """Moves leading from the root of one search side to key."""
+        path = []
+        move = seen[key]
+        while move >= 0:
+            path.append(move)
+            state = key.to_bytes(20, 'little').translate(move_tables[INVERSE_MOVES[move]])
+            key = int.from_bytes(state, 'little')
+            move = seen[key]
+        path.reverse()
+        return path
+
+
+# CFOP: the cross on D, then the four first-two-layer slots (a D corner and
+# the middle edge above it), then orient (OLL) and permute (PLL) the last
+# layer. Pieces are tracked as states position * orientations + orientation,
+# with orientation the index in CORNER_FACELETS / EDGE_FACELETS of the
+# facelet holding the piece's first sticker.
+CROSS_EDGES = (4, 5, 6, 7)                         # DR, DF, DL, DB
+F2L_SLOTS = ((4, 8), (5, 9), (6, 10), (7, 11))     # (corner, edge): DFR+FR, DLF+FL, DBL+BL, DRB+BR
+_FACELET_CORNER = {f: p * 3 + o for p, facelets in enumerate(CORNER_FACELETS) for o, f in enumerate(facelets)}
+_FACELET_EDGE = {f: p * 2 + o for p, facelets in enumerate(EDGE_FACELETS) for o, f in enumerate(facelets)}
+# Piece state after each move: _CORNER_MOVES[m][state], _EDGE_MOVES[m][state]
+_CORNER_MOVES = [bytes(_FACELET_CORNER[MOVE_TABLES[name][CORNER_FACELETS[s // 3][s % 3]]] for s in range(24))
+                 for name in MOVE_NAMES]
+_EDGE_MOVES = [bytes(_FACELET_EDGE[MOVE_TABLES[name][EDGE_FACELETS[s // 2][s % 2]]] for s in range(24))
+               for name in MOVE_NAMES]
+# The colours a piece shows from each of its positions' facelets -> (piece, orientation)
+_CORNER_BY_COLORS = {}
+for _piece, _facelets in enumerate(CORNER_FACELETS):
+    _colors = [SOLVED_FACELETS[f] for f in _facelets]
+    for _ori in range(3):
+        _CORNER_BY_COLORS[bytes(_colors[(i - _ori) % 3] for i in range(3))] = (_piece, _ori)
+_EDGE_BY_COLORS = {}
+for _piece, _facelets in enumerate(EDGE_FACELETS):
+    _colors = [SOLVED_FACELETS[f] for f in _facelets]
+    for _ori in range(2):
+        _EDGE_BY_COLORS[bytes(_colors[(i - _ori) % 2] for i in range(2))] = (_piece, _ori)
+_LL_FACELETS = (0, 1, 2, 3, 5, 6, 7, 8) + tuple(range(18, 21)) + tuple(range(27, 30)) + \
+    tuple(range(36, 39)) + tuple(range(45, 48))
+# Facelets of the pieces OLL and PLL must leave alone: the D and middle layers
+_F2L_FACELETS = [f for c in range(4, 8) for f in CORNER_FACELETS[c]] + \
+    [f for e in range(4, 12) for f in EDGE_FACELETS[e]]
+
+# Last-layer algorithms in face turns only, as (name, moves). Any case
+# without its own algorithm here is solved by chaining two of them.
+OLL_ALGORITHMS = [
+    ('OLL 1', "R U2 R2 F R F' U2 R' F R F'"),
+    ('OLL 9', "R U R' U' R' F R2 U R' U' F'"),
+    ('OLL 10', "R U R' U R' F R F' R U2 R'"),
+    ('OLL 13', "F U R U' R2 F' R U R U' R'"),
+    ('OLL 14', "R' F R U R' F' R F U' F'"),
+    ('OLL 17', "R U R' U R' F R F' U2 R' F R F'"),
+    ('OLL 21 (H)', "R U2 R' U' R U R' U' R U' R'"),
+    ('OLL 22 (Pi)', "R U2 R2 U' R2 U' R2 U2 R"),
+    ('OLL 23 (Headlights)', "R2 D R' U2 R D' R' U2 R'"),
+    ('OLL 24 (Chameleon)', "L F R' F' L' F R F'"),
+    ('OLL 25 (Bowtie)', "F' L F R' F' L' F R"),
+    ('OLL 26 (Antisune)', "R U2 R' U' R U' R'"),
+    ('OLL 27 (Sune)', "R U R' U R U2 R'"),
+    ('OLL 31', "R' U' F U R U' R' F' R"),
+    ('OLL 32', "L U F' U' L' U L F L'"),
+    ('OLL 33', "R U R' U' R' F R F'"),
+    ('OLL 34', "R U R2 U' R' F R U R U' F'"),
+    ('OLL 35', "R U2 R2 F R F' R U2 R'"),
+    ('OLL 36', "L' U' L U' L' U L U L F' L' F"),
+    ('OLL 37', "F R' F' R U R U' R'"),
+    ('OLL 38', "R U R' U R U' R' U' R' F R F'"),
+    ('OLL 39', "L F' L' U' L U F U' L'"),
+    ('OLL 40', "R' F R U R' U' F' U R"),
+    ('OLL 41', "R U R' U R U2 R' F R U R' U' F'"),
+    ('OLL 42', "R' U' R U' R' U2 R F R U R' U' F'"),
+    ('OLL 43', "R' U' F' U F R"),
+    ('OLL 44', "F U R U' R' F'"),
+    ('OLL 45', "F R U R' U' F'"),
+    ('OLL 46', "R' U' R' F R F' U R"),
+    ('OLL 47', "F' L' U' L U L' U' L U F"),
+    ('OLL 48', "F R U R' U' R U R' U' F'"),
+    ('OLL 51', "F U R U' R' U R U' R' F'"),
+    ('OLL 52', "R U R' U R U' B U' B' R'"),
+    ('OLL 55', "R U2 R2 U' R U' R' U2 F R F'"),
+]
+PLL_ALGORITHMS = [
+    ('PLL Aa', "R' F R' B2 R F' R' B2 R2"),
+    ('PLL Ab', "R2 B2 R F R' B2 R F' R"),
+    ('PLL E', "R' U L' D2 L U' R L' U R' D2 R U' L"),
+    ('PLL F', "R' U' F' R U R' U' R' F R2 U' R' U' R U R' U R"),
+    ('PLL Ga', "R2 U R' U R' U' R U' R2 D U' R' U R D' U"),
+    ('PLL Gb', "R' U' R U D' R2 U R' U R U' R U' R2 D"),
+    ('PLL Gc', "R2 U' R U' R U R' U R2 D' U R U' R' D U'"),
+    ('PLL Gd', "R U R' U' D R2 U' R U' R' U R' U R2 D'"),
+    ('PLL H', "R2 U2 R U2 R2 U2 R2 U2 R U2 R2"),
+    ('PLL Ja', "L' U' L F L' U' L U L F' L2 U L"),
+    ('PLL Jb', "R U R' F' R U R' U' R' F R2 U' R'"),
+    ('PLL Na', "R U R' U R U R' F' R U R' U' R' F R2 U' R' U2 R U' R'"),
+    ('PLL Nb', "R' U R U' R' F' U' F R U R' F R' F' R U' R"),
+    ('PLL Ra', "R U' R' U' R U R D R' U' R D' R' U2 R'"),
+    ('PLL Rb', "R2 F R U R U' R' F' R U2 R' U2 R"),
+    ('PLL T', "R U R' U' R' F R2 U' R' U' R U R' F'"),
+    ('PLL Ua', "R U' R U R U R U' R' U' R2"),
+    ('PLL Ub', "R2 U R U R' U' R' U' R' U R'"),
+    ('PLL V', "R' U R' U' B' R' B2 U' B' U B' R B R"),
+    ('PLL Y', "F R U' R' U' R U R' F' R U R' U' R' F R F'"),
+    ('PLL Z', "R' U' R U' R U R U' R' U R U R2 U' R'"),
+]
+
+
+def _cross_index(states):
+    """Index of the cross edges' states in the cross distance table."""
+    return ((states[0] * 24 + states[1]) * 24 + states[2]) * 24 + states[3]
+
+
+def _build_cross_table():
+    """Moves to solve the cross from each of its 190,080 states (255 if unreachable), by BFS."""
+    table = bytearray(b'\xff' * 24**4)
+    start = _cross_index([e * 2 for e in CROSS_EDGES])
+    table[start] = 0
+    frontier = [start]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for index in frontier:
+            rest, s3 = divmod(index, 24)
+            rest, s2 = divmod(rest, 24)
+            s0, s1 = divmod(rest, 24)
+            for moves in _EDGE_MOVES:
+                new = ((moves[s0] * 24 + moves[s1]) * 24 + moves[s2]) * 24 + moves[s3]
+                if table[new] == 255:
+                    table[new] = depth
+                    next_frontier.append(new)
+        frontier = next_frontier
+    return table
+
+
+def _last_layer_table(algorithms, key, keep_orientation, final_auf):
+    """{last-layer key: (algorithm names, moves, MoveSequence)} covering every case.
+
+    Each algorithm is tried after each U turn, and the table is a
+    cheapest-first search backwards from the solved key, so cases without
+    an algorithm of their own get the cheapest chain of them. With
+    keep_orientation the algorithms must not twist or flip last-layer
+    pieces, and with final_auf a closing U turn also counts as a step.
+    """
+    steps = []
+    for name, moves in algorithms:
+        sequence = compile_moves(moves)
+        if any(sequence.table[f] != f for f in _F2L_FACELETS):
+            raise ValueError(f"{name} does not keep the first two layers: {moves}")
+        if keep_orientation and any(sequence.table[f] >= 9 for f in range(9)):
+            raise ValueError(f"{name} does not keep the last layer oriented: {moves}")
+        for auf in ('', 'U', 'U2', "U'"):
+            steps.append(((name,), compile_moves(f"{auf} {moves}")))
+    if final_auf:
+        steps += [((), compile_moves(auf)) for auf in ('U', 'U2', "U'")]
+    solved = Cube()
+    table = {key(solved._facelets()): ((), (), MoveSequence())}
+    heap = [(0, 0, solved)]
+    counter = 1
+    while heap:
+        cost, _, cube = heapq.heappop(heap)
+        names, moves, sequence = table[key(cube._facelets())]
+        if len(moves) < cost:
+            continue
+        for step_names, step in steps:
+            before = cube.copy()
+            before.apply_sequence(step.inverse())
+            before_key = key(before._facelets())
+            known = table.get(before_key)
+            if known is None or len(known[1]) > cost + len(step):
+                table[before_key] = (step_names + names, step.moves + moves, step * sequence)
+                heapq.heappush(heap, (cost + len(step), counter, before))
+                counter += 1
+    return table
+
+
+def _oll_key(facelets):
+    """Which last-layer facelets show the U colour, as an int."""
+    u = facelets[4]
+    key = 0
+    for f in _LL_FACELETS:
+        key = key << 1 | (facelets[f] == u)
+    return key
+
+
+def _pll_key(facelets):
+    """Colours of the top row of the four side faces."""
+    return facelets[18:21] + facelets[27:30] + facelets[36:39] + facelets[45:48]
+
+
+class CFOPTables(_TableSet):
+    """Cross distances, F2L pair algorithms and the OLL/PLL case tables, built on first use."""
+
+    def __init__(self):
+        self.cross = load_table('cfop_cross', 'B', 24**4, _build_cross_table, (24**4, 1, 18))
+        self.f2l = [self._build_f2l_table(slot) for slot in range(4)]
+        self.oll = _last_layer_table(OLL_ALGORITHMS, _oll_key, False, False)
+        self.pll = _last_layer_table(PLL_ALGORITHMS, _pll_key, True, True)
+
+    @staticmethod
+    def slot_macros(slot):
+        """Moves that keep the cross and the other three slots: U turns and
+        side-face conjugates X U X', each touching the U layer and one slot."""
+        keep = [f for e in CROSS_EDGES for f in EDGE_FACELETS[e]]
+        for other, (corner, edge) in enumerate(F2L_SLOTS):
+            if other != slot:
+                keep += CORNER_FACELETS[corner] + EDGE_FACELETS[edge]
+        macros = [[m] for m in range(3)]
+        for face in range(2, 6):
+            for turn in (0, 1):
+                for u_turn in range(3):
+                    moves = [face * 3 + turn, u_turn, INVERSE_MOVES[face * 3 + turn]]
+                    table = compile_moves([MOVE_NAMES[m] for m in moves]).table
+                    if all(table[f] == f for f in keep):
+                        macros.append(moves)
+        return macros
+
+    def _build_f2l_table(self, slot):
+        """Shortest macro sequence (as move indices) solving the slot's pair from each pair state."""
+        corner, edge = F2L_SLOTS[slot]
+        macros = self.slot_macros(slot)
+        solved = corner * 3 * 24 + edge * 2
+        table = {solved: ()}
+        heap = [(0, solved)]
+        while heap:
+            cost, state = heapq.heappop(heap)
+            moves = table[state]
+            if len(moves) < cost:
+                continue
+            c, e = divmod(state, 24)
+            for macro in macros:
+                # Undo the macro to find the states it solves from
+                for m in reversed(macro):
+                    c, e = _CORNER_MOVES[INVERSE_MOVES[m]][c], _EDGE_MOVES[INVERSE_MOVES[m]][e]
+                before = c * 24 + e
+                known = table.get(before)
+                if known is None or len(known) > cost + len(macro):
+                    table[before] = tuple(macro) + moves
+                    heapq.heappush(heap, (cost + len(macro), before))
+                c, e = divmod(state, 24)
+        return table
+
+
+class CFOPSolver:
+    """Method-based solver: cross, F2L, OLL and PLL, each a table lookup.
+
+    The cross is solved optimally from a 190,080-state distance table. Each
+    F2L pair is looked up by its corner and edge states in a per-slot table
+    of moves that keep the cross and the other slots; the cheapest
+    unsolved slot goes first, and a pair stuck in another slot is lifted out
+    first. OLL and PLL cases, including the U turn before (and, for PLL,
+    after) the algorithm, are recognised by hashing the last-layer facelets,
+    one dict lookup each. Solutions run to about 60 moves in well under a
+    millisecond once the tables are loaded. After solve, stages holds
+    (stage, moves) pairs such as ('F2L FR', [...]) or ('OLL 27 (Sune)', [...]).
+    """
+
+    def __init__(self):
+        self.tables = CFOPTables.get()
+        self.stages = []
+
+    @staticmethod
+    def _piece_states(facelets):
+        """Current state of every corner and edge piece, read off the facelet colours."""
+        corners = [0] * 8
+        for p, (a, b, c) in enumerate(CORNER_FACELETS):
+            found = _CORNER_BY_COLORS.get(bytes((facelets[a], facelets[b], facelets[c])))
+            if found is None:
+                raise ValueError("Not a valid cube: unknown corner colours")
+            corners[found[0]] = p * 3 + found[1]
+        edges = [0] * 12
+        for p, (a, b) in enumerate(EDGE_FACELETS):
+            found = _EDGE_BY_COLORS.get(bytes((facelets[a], facelets[b])))
+            if found is None:
+                raise ValueError("Not a valid cube: unknown edge colours")
+            edges[found[0]] = p * 2 + found[1]
+        return corners, edges
+
+    def _apply(self, cube, stage, moves):
+        """Apply a stage's moves (names) to cube and record them."""
+        if moves:
+            cube.apply_sequence(moves)
+            self.stages.append((stage, list(moves)))
+
+    def _solve_cross(self, cube):
+        cross = self.tables.cross
+        states = [self._piece_states(cube._facelets())[1][e] for e in CROSS_EDGES]
+        moves = []
+        distance = cross[_cross_index(states)]
+        if distance == 255:
+            raise ValueError("Not a valid cube: the cross cannot be solved")
+        while distance:
+            for m, table in enumerate(_EDGE_MOVES):
+                moved = [table[s] for s in states]
+                if cross[_cross_index(moved)] == distance - 1:
+                    states, distance = moved, distance - 1
+                    moves.append(MOVE_NAMES[m])
+                    break
+        self._apply(cube, 'cross', moves)
+
+    def _solve_f2l(self, cube):
+        solved = set()
+        for _ in range(12):
+            if len(solved) == 4:
+                return
+            corners, edges = self._piece_states(cube._facelets())
+            best = None
+            for slot, (corner, edge) in enumerate(F2L_SLOTS):
+                if slot in solved:
+                    continue
+                moves = self.tables.f2l[slot].get(corners[corner] * 24 + edges[edge])
+                if moves is not None and (best is None or len(moves) < len(best[1])):
+                    best = slot, moves
+            if best is not None:
+                slot, moves = best
+                self._apply(cube, f"F2L {EDGE_FACES[F2L_SLOTS[slot][1]]}",
+                            SolutionOptimizer.simplify([MOVE_NAMES[m] for m in moves]))
+                solved.add(slot)
+                continue
+            # Every unsolved pair has a piece in another unsolved slot: lift one out
+            slot = next(s for s in range(4) if s not in solved)
+            corner, edge = F2L_SLOTS[slot]
+            holder = next(other for other, (c, e) in enumerate(F2L_SLOTS)
+                          if other not in solved and other != slot and
+                          (corners[corner] // 3 == c or edges[edge] // 2 == e))
+            lift = next(macro for macro in CFOPTables.slot_macros(holder) if len(macro) > 1)
+            self._apply(cube, f"F2L {EDGE_FACES[F2L_SLOTS[holder][1]]} out",
+                        [MOVE_NAMES[m] for m in lift])
+        raise ValueError("Not a valid cube: F2L did not finish")
+
+    def _solve_last_layer(self, cube, stage, table, key):
+        case = table.get(key(cube._facelets()))
+        if case is None:
+            raise ValueError(f"Not a valid cube: unrecognised {stage} case")
+        names, moves, _ = case
+        self._apply(cube, ' + '.join(names) or f"{stage} AUF", moves)
+
+    def solve(self, cube):
+        """Solve the cube; returns the move list and sets stages."""
+        self.stages = []
+        work = CubieCube.from_cube(cube).to_cube()  # standard colours, whatever the centres are
+        self._solve_cross(work)
+        self._solve_f2l(work)
+        self._solve_last_layer(work, 'OLL', self.tables.oll, _oll_key)
+        self._solve_last_layer(work, 'PLL', self.tables.pll, _pll_key)
+        if not work.is_solved():
+            raise ValueError("Not a valid cube: the last layer cannot be solved")
+        return [move for _, moves in self.stages for move in moves]
+
+
+# Thistlethwaite: each phase moves the cube into a smaller subgroup using
+# only the moves of the current one,
+#   G0 = <U, D, L, R, F, B>  ->  G1 = <U, D, L, R, F2, B2>  ->
+#   G2 = <U, D, L2, R2, F2, B2>  ->  G3 = <U2, D2, L2, R2, F2, B2>  ->  solved,
+# and a distance table for each phase makes it a walk downhill.
+G1_MOVES = [MOVE_NAMES.index(name) for name in
+            ('U', "U'", 'U2', 'D', "D'", 'D2', 'L', "L'", 'L2', 'R', "R'", 'R2', 'F2', 'B2')]
+G3_MOVES = [face * 3 + 2 for face in range(6)]
+N_CORNER_COSETS = 420    # corner permutations up to the 96 that half turns reach
+N_M_EDGES = 70           # positions of the 4 M-slice edges among the 8 U/D edge positions
+N_SLICE_ORDERS = 24**3   # order of the edges within the M, S and E slices
+# Edge positions of each slice; in G3 every edge stays in its own slice
+G3_SLICES = ((1, 3, 5, 7), (0, 2, 4, 6), (8, 9, 10, 11))
+_M_EDGE_MASKS = [sum(1 << p for p in positions) for positions in itertools.combinations(range(8), 4)]
+_M_EDGE_INDEX = {mask: i for i, mask in enumerate(_M_EDGE_MASKS)}
+
+
+def _half_turn_corners(corners_move):
+    """The 96 corner permutations that half turns reach, solved first."""
+    found = [0]
+    for corners in found:
+        for m in G3_MOVES:
+            child = corners_move[corners * 18 + m]
+            if child not in found:
+                found.append(child)
+    return found
+
+
+def _build_corner_cosets(corners_move):
+    """Coset of every corner permutation for the half-turn corners H.
+
+    Coset c holds the states H p for one permutation p, i.e. p applied to
+    any position of H, so a move maps whole cosets to cosets and coset 0 is
+    H itself. Cosets are numbered in the order a search over the G2 moves
+    finds them.
+    """
+    cosets = array('H', [0xFFFF]) * N_CORNERS
+    members = [_half_turn_corners(corners_move)]
+    for corners in members[0]:
+        cosets[corners] = 0
+    for coset in members:
+        for m in PHASE2_MOVES:
+            if cosets[corners_move[coset[0] * 18 + m]] == 0xFFFF:
+                moved = [corners_move[corners * 18 + m] for corners in coset]
+                for corners in moved:
+                    cosets[corners] = len(members)
+                members.append(moved)
+    return cosets
+
+
+def _m_edges_coord(ep):
+    """Which of the 8 U/D edge positions hold the M-slice edges UF, UB, DF and DB."""
+    return _M_EDGE_INDEX[sum(1 << p for p in range(8) if ep[p] in G3_SLICES[0])]
+
+
+def _slice_orders_coord(ep):
+    """Order of the edges within each of their slices, for a cube in G3."""
+    coord = 0
+    for positions in G3_SLICES:
+        coord = coord * 24 + _perm_rank([positions.index(ep[p]) for p in positions])
+    return coord
+
+
+def _build_slice_orders_move():
+    """Move table of _slice_orders_coord; only the G3_MOVES columns are filled."""
+    slice_moves = []
+    for positions in G3_SLICES:
+        table = [0] * 24 * 18
+        for rank in range(24):
+            order = _perm_unrank(rank, 4)
+            for m in G3_MOVES:
+                moved = [0] * 4
+                for i, p in enumerate(positions):
+                    moved[positions.index(_EDGE_MOVES[m][p * 2] // 2)] = order[i]
+                table[rank * 18 + m] = _perm_rank(moved)
+        slice_moves.append(table)
+    m_moves, s_moves, e_moves = slice_moves
+    table = array('H', bytes(2 * N_SLICE_ORDERS * 18))
+    for coord in range(N_SLICE_ORDERS):
+        rest, e = divmod(coord, 24)
+        m_rank, s = divmod(rest, 24)
+        for m in G3_MOVES:
+            table[coord * 18 + m] = ((m_moves[m_rank * 18 + m] * 24 + s_moves[s * 18 + m]) * 24
+                                     + e_moves[e * 18 + m])
+    return table
+
+
+class ThistlethwaiteTables(_TableSet):
+    """Move and distance tables of the four Thistlethwaite phases, built on first use."""
+
+    def __init__(self):
+        # Phase 1: edge flip, 2,048 states
+        self.flip = coord_move_table('flip')
+        self.phase1 = load_distance_table('thistlethwaite_phase1', self.flip, 1, bytes(18), range(18), 0)
+        # Phase 2: corner twist x which edges are in the E slice, 1,082,565 states
+        self.twist = coord_move_table('twist')
+        self.slice = slice_move_table()
+        self.phase2 = load_distance_table('thistlethwaite_phase2', self.twist, N_SLICE, self.slice,
+                                          G1_MOVES, SOLVED_SLICE)
+        # Phase 3: corner coset x where the M-slice edges are, 29,400 states
+        self.corners = coord_move_table('corners')
+        self.corner_cosets = load_table('thistlethwaite_corner_cosets', 'H', N_CORNERS,
+                                        lambda: _build_corner_cosets(self.corners),
+                                        (N_CORNERS, 1, len(PHASE2_MOVES)))
+        representatives = [0] * N_CORNER_COSETS
+        for corners in range(N_CORNERS - 1, -1, -1):
+            representatives[self.corner_cosets[corners]] = corners
+        self.coset_move = array('H', bytes(2 * N_CORNER_COSETS * 18))
+        self.m_edges_move = array('H', bytes(2 * N_M_EDGES * 18))
+        for m in PHASE2_MOVES:
+            for coset, corners in enumerate(representatives):
+                self.coset_move[coset * 18 + m] = self.corner_cosets[self.corners[corners * 18 + m]]
+            for index, mask in enumerate(_M_EDGE_MASKS):
+                moved = sum(1 << (_EDGE_MOVES[m][p * 2] // 2) for p in range(8) if mask >> p & 1)
+                self.m_edges_move[index * 18 + m] = _M_EDGE_INDEX[moved]
+        self.phase3 = _build_pruning_table(self.coset_move, N_M_EDGES, self.m_edges_move, PHASE2_MOVES,
+                                           _m_edges_coord(list(range(12))))
+        # Phase 4: half-turn corners x edge order within the slices, 663,552 states
+        self.half_turn_corners = _half_turn_corners(self.corners)
+        self.half_turn_index = {corners: i for i, corners in enumerate(self.half_turn_corners)}
+        self.half_turn_move = array('B', bytes(96 * 18))
+        for i, corners in enumerate(self.half_turn_corners):
+            for m in G3_MOVES:
+                self.half_turn_move[i * 18 + m] = self.half_turn_index[self.corners[corners * 18 + m]]
+        self.slice_orders_move = load_table('move_slice_orders', 'H', N_SLICE_ORDERS * 18,
+                                            _build_slice_orders_move, (N_SLICE_ORDERS, 18, len(G3_MOVES)))
+        self.phase4 = load_distance_table('thistlethwaite_phase4', self.half_turn_move, N_SLICE_ORDERS,
+                                          self.slice_orders_move, G3_MOVES, 0)
+
+
+class ThistlethwaiteSolver:
+    """Four-phase Thistlethwaite solver.
+
+    Every phase table holds exact distances within the phase's moves, so
+    each phase walks straight downhill with no search and the latency
+    hardly depends on the scramble. Phases take at most 7, 10, 13 and 15
+    moves; solutions average about 31 moves. After solve, phase_seconds
+    has the time of each phase and stages the moves of each.
+    """
+
+    PHASES = ('G1 (edges oriented)', 'G2 (corners oriented, E slice placed)',
+              'G3 (half turns suffice)', 'solved')
+
+    def __init__(self):
+        self.tables = ThistlethwaiteTables.get()
+        self.phase_seconds = {}
+        self.stages = []
+
+    @staticmethod
+    def _descend(table, table_a, size_b, table_b, moves, a, b):
+        """Moves that take (a, b) to distance 0 in the phase's distance table."""
+        path = []
+        distance = table[a * size_b + b]
+        if distance == 255:
+            raise ValueError("Not a valid cube: a Thistlethwaite phase cannot be solved")
+        while distance:
+            for m in moves:
+                next_a, next_b = table_a[a * 18 + m], table_b[b * 18 + m]
+                if table[next_a * size_b + next_b] == distance - 1:
+                    a, b, distance = next_a, next_b, distance - 1
+                    path.append(m)
+                    break
+        return path
+
+    def solve(self, cube):
+        """Solve the cube; returns the move list and sets phase_seconds and stages."""
+        tables = self.tables
+        self.phase_seconds = {}
+        self.stages = []
+        cubie = CubieCube.from_cube(cube)
+        solution = []
+        for phase, name in enumerate(self.PHASES, 1):
+            start = time.perf_counter()
+            if phase == 1:
+                path = self._descend(tables.phase1, tables.flip, 1, bytes(18), range(18),
+                                     cubie.get_flip(), 0)
+            elif phase == 2:
+                path = self._descend(tables.phase2, tables.twist, N_SLICE, tables.slice, G1_MOVES,
+                                     cubie.get_twist(), cubie.get_slice_sorted() // N_SLICE_PERM)
+            elif phase == 3:
+                path = self._descend(tables.phase3, tables.coset_move, N_M_EDGES, tables.m_edges_move,
+                                     PHASE2_MOVES, tables.corner_cosets[cubie.get_corners()],
+                                     _m_edges_coord(cubie.ep))
+            else:
+                path = self._descend(tables.phase4, tables.half_turn_move, N_SLICE_ORDERS,
+                                     tables.slice_orders_move, G3_MOVES,
+                                     tables.half_turn_index[cubie.get_corners()], _slice_orders_coord(cubie.ep))
+            for m in path:
+                cubie.multiply(MOVE_CUBES[m])
+            self.phase_seconds[f"phase{phase}"] = time.perf_counter() - start
+            moves = [MOVE_NAMES[m] for m in path]
+            self.stages.append((name, moves))
+            solution += moves
+        return solution
+
+
+class SolutionCache:
+    """Solutions keyed by strategy, post-optimization and canonical state, kept across runs.
+
+    An in-memory LRU of up to max_entries solutions sits in front of a
+    sqlite database at path (None keeps the cache in memory only).
+    Symmetric positions share one entry: solutions are stored for the
+    canonical state and conjugated back on lookup. Solutions found with
+    post_optimize=False are kept apart from optimized ones. hits,
+    disk_hits, misses and evictions count what happened so far.
+    """
+
+    def __init__(self, path=os.path.join(TABLE_DIR, 'solutions.sqlite'), max_entries=10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._db = None
+        self._lock = threading.Lock()
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def _connect(self):
+        if self._db is None and self.path:
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._db = sqlite3.connect(self.path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+                self._db.execute("CREATE TABLE IF NOT EXISTS solutions "
+                                 "(strategy TEXT, state BLOB, moves TEXT, PRIMARY KEY (strategy, state))")
+            except sqlite3.Error:
+                self.path = None  # Unwritable: keep the cache in memory only
+                self._db = None
+        return self._db
+
+    def _remember(self, key, moves):
+        self._memory[key] = moves
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def _variant(strategy, post_optimize):
+        """The strategy column of an entry: unoptimized solutions get their own."""
+        return strategy if post_optimize else f"{strategy}:raw"
+
+    def get(self, cube, strategy, post_optimize=True):
+        """Cached solution for cube as a list of move names, or None."""
+        state, symmetry = canonical_key(cube)
+        strategy = self._variant(strategy, post_optimize)
+        key = (strategy, state)
+        with self._lock:
+            moves = self._memory.get(key)
+            if moves is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+            else:
+                db = self._connect()
+                row = db and db.execute("SELECT moves FROM solutions WHERE strategy = ? AND state = ?",
+                                        (strategy, state.to_bytes(20, 'little'))).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                moves = row[0].split()
+                self._remember(key, moves)
+                self.disk_hits += 1
+        return conjugate_moves(moves, SYMMETRY_INVERSES[symmetry])
+
+    def put(self, cube, strategy, solution, post_optimize=True):
+        """Store a solution for cube, found with strategy."""
+        state, symmetry = canonical_key(cube)
+        strategy = self._variant(strategy, post_optimize)
+        moves = conjugate_moves(solution, symmetry)
+        with self._lock:
+            self._remember((strategy, state), moves)
+            db = self._connect()
+            if db is not None:
+                try:
+                    with db:
+                        db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)",
+                                   (strategy, state.to_bytes(20, 'little'), ' '.join(moves)))
+                except sqlite3.Error:
+                    pass  # e.g. locked by another process: the memory tier still has it
+
+    def stats(self):
+        """Counters plus the number of solutions held in memory."""
+        return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                'evictions': self.evictions, 'entries': len(self._memory)}
+
+
+class SolutionOptimizer:
+    """Shorten move sequences without changing what they do to the cube.
+
+    simplify() merges and cancels turns of the same face, looking through
+    turns of the opposite face since the two commute (R L R' becomes L), and
+    puts opposite-face pairs in canonical order. optimize() then slides a
+    window of WINDOW moves along the sequence and swaps in a shortest
+    equivalent whenever one is shorter; before that, any stretch of moves
+    that returns the cube to a state it was already in, however long, is
+    cut out. Shortest equivalents come from
+    meeting in the middle: every permutation reachable in LEFT_DEPTH moves
+    (about 47,000 of them, built on first use) is looked up against every
+    sequence of up to WINDOW - LEFT_DEPTH moves.
+    """
     
-    def __init__(self, cube):
-        self.cube = cube.copy()
+    WINDOW = 6
+    LEFT_DEPTH = 4
+    _tables = None
     
-    def simulate_move(self, move):
-        """Simulate a move and return the resulting state."""
-        temp_cube = self.cube.copy()
-        temp_cube.apply_move(move)
-        return temp_cube
+    @classmethod
+    def _sequence_tables(cls):
+        """{positions: shortest move indices} up to LEFT_DEPTH moves, and the
+        right-hand sequences as (inverse translate table, move indices) by length."""
+        if cls._tables is None:
+            left = {IDENTITY_FACELETS: ()}
+            frontier = [(IDENTITY_FACELETS, ())]
+            right = list(left.items())
+            for depth in range(1, cls.LEFT_DEPTH + 1):
+                next_frontier = []
+                for positions, moves in frontier:
+                    for m in CANONICAL_SUCCESSORS[moves[-1] if moves else -1]:
+                        new_positions = positions.translate(MOVE_TABLES[MOVE_NAMES[m]])
+                        if new_positions not in left:
+                            left[new_positions] = moves + (m,)
+                            next_frontier.append((new_positions, moves + (m,)))
+                frontier = next_frontier
+                if depth == cls.WINDOW - cls.LEFT_DEPTH:
+                    right = list(left.items())
+            right = [(bytes.maketrans(positions + _TRANSLATE_PAD, _IDENTITY_TABLE), moves)
+                     for positions, moves in right]
+            cls._tables = left, right
+        return cls._tables
     
-    def simulate_sequence(self, moves):
-        """Simulate a sequence of moves."""
-        temp_cube = self.cube.copy()
-        if isinstance(moves, str):
-            moves = moves.split()
+    @staticmethod
+    def simplify(moves):
+        """Cancel and merge same-face turns, also across opposite-face turns."""
+        stack = []  # (face, quarter turns clockwise)
         
-        for move in moves:
-            temp_cube.apply_move(move)
+        def push(face, turns):
+            if stack:
+                top_face, top_turns = stack[-1]
+                if top_face == face:
+                    stack.pop()
+                    if (turns + top_turns) % 4:
+                        push(face, (turns + top_turns) % 4)
+                    return
+                if top_face == face ^ 1 and face < top_face:
+                    # Opposite faces commute: slip under to reach a turn of this face
+                    stack.pop()
+                    push(face, turns)
+                    push(top_face, top_turns)
+                    return
+            stack.append((face, turns))
         
-        return temp_cube
+        for move in moves:
+            m = MOVE_NAMES.index(move)
+            push(m // 3, (1, 3, 2)[m % 3])
+        return [MOVE_NAMES[face * 3 + (None, 0, 2, 1)[turns]] for face, turns in stack]
     
-    def get_all_next_states(self):
-        """Get all possible next states from current position."""
-        move_gen = MoveGenerator()
-        next_states = {}
-        
-        for move in move_gen.get_all_moves():
-            next_state = self.simulate_move(move)
-            next_states[move] = next_state
-        
-        return next_states
+    @classmethod
+    def shortest_equivalent(cls, moves):
+        """A shortest sequence doing the same as moves, if it is shorter and at most WINDOW moves long."""
+        left, right = cls._sequence_tables()
+        target = compile_moves(moves).table[:54]
+        best = None
+        for inverse, tail in right:
+            if best is not None and len(tail) >= len(best):
+                break
+            head = left.get(target.translate(inverse))
+            if head is not None and (best is None or len(head) + len(tail) < len(best)):
+                best = head + tail
+        if best is None or len(best) >= len(moves):
+            return None
+        return [MOVE_NAMES[m] for m in best]
+    
+    @staticmethod
+    def drop_cycles(moves):
+        """Cut out every stretch of moves that adds up to no change at all."""
+        seen = {IDENTITY_FACELETS: 0}  # positions -> number of moves kept when first reached
+        kept = []
+        positions = IDENTITY_FACELETS
+        for move in moves:
+            positions = positions.translate(MOVE_TABLES[move])
+            if positions in seen:
+                del kept[seen[positions]:]
+                seen = {p: n for p, n in seen.items() if n <= len(kept)}
+            else:
+                kept.append(move)
+                seen[positions] = len(kept)
+        return kept
+    
+    @classmethod
+    def optimize(cls, moves, window=True):
+        """simplify and drop_cycles, then (with window) re-optimize every window of WINDOW moves until none gets shorter."""
+        moves = cls.simplify(cls.drop_cycles(moves))
+        if not window:
+            return moves
+        i = 0
+        while i < len(moves) - 1:
+            shorter = cls.shortest_equivalent(moves[i:i + cls.WINDOW])
+            if shorter is None:
+                i += 1
+                continue
+            moves = cls.simplify(moves[:i] + shorter + moves[i + cls.WINDOW:])
+            # The shorter segment can combine with the moves just before it
+            i = max(0, i - cls.WINDOW + 1)
+        return moves
 
 
 class Solver:
-    """Advanced Rubik's Cube solver using BFS with optimizations."""
+    """Rubik's Cube solver front end; the strategy picks the search engine.
+
+    solve asks cache first and, unless post_optimize is False, passes the
+    answer through SolutionOptimizer; stats describes the last solve. The
+    optimal strategies fall back to two_phase when they give up (past
+    optimal_timeout, or memory_limit_mb for 'bidirectional').
+    """
     
-    def __init__(self, cube):
+    STRATEGIES = ('two_phase', 'optimal', 'parallel_optimal', 'bidirectional', 'thistlethwaite', 'cfop', 'bfs')
+    OPTIMAL_STRATEGIES = ('optimal', 'parallel_optimal', 'bidirectional')
+    # Their post-optimization skips the window search, which would cost many
+    # times their own latency for a move or two
+    QUICK_STRATEGIES = ('thistlethwaite', 'cfop')
+    # iter_solutions hands over to IDA* at this length; shorter solutions are
+    # proven optimal (or beaten) within seconds
+    PROOF_LENGTH = 14
+    
+    def __init__(self, cube, strategy='two_phase', target_length=22, timeout=1.0,
+                 memory_limit_mb=None, cache=None, profiler=None, post_optimize=True,
+                 optimal_timeout=None):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
         self.cube = cube.copy()
+        self.strategy = strategy
+        self.target_length = target_length
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.cache = cache
+        self.profiler = profiler
+        self.post_optimize = post_optimize
+        self.optimal_timeout = optimal_timeout
         self.move_generator = MoveGenerator()
         self.max_depth = 12  # Reduced for better performance
+        self.stats = {}
         
     def solve(self):
-        """Solve the cube using BFS with pruning."""
+        """Solve the cube with the selected strategy, consulting the cache first."""
+        self.stats = {}
         if self.cube.is_solved():
             return []
         
+        if self.cache is not None:
+            start = time.monotonic()
+            solution = self.cache.get(self.cube, self.strategy, self.post_optimize)
+            lookup = time.monotonic() - start
+            if solution is not None:
+                self.stats = {'cached': True}
+                self._add_cache_stats(lookup)
+                return solution
+        
+        if self.profiler is not None:
+            self.load_tables(self.strategy, self.post_optimize)  # so the profile leaves out first-use builds
+        with self._profiling():
+            solution = self._search()
+        if solution and self.post_optimize:
+            start = time.monotonic()
+            optimized = SolutionOptimizer.optimize(solution, window=self.strategy not in self.QUICK_STRATEGIES)
+            self.stats.setdefault('phases', {})['optimize'] = time.monotonic() - start
+            self.stats['moves_saved'] = len(solution) - len(optimized)
+            solution = optimized
+        if self.cache is not None:
+            self._add_cache_stats(lookup)
+            # The BFS fallback can return a partial sequence
+            if (solution and self.cube.is_solved_by(solution)
+                    and self.cacheable(self.strategy, solution, self.stats, self.target_length)):
+                self.cache.put(self.cube, self.strategy, solution, self.post_optimize)
+        return solution
+    
+    def iter_solutions(self, deadline=None, progress=None):
+        """Yield ever shorter solutions until one is proven optimal or deadline passes.
+
+        deadline is a time.monotonic() value; by default it is timeout
+        seconds away for 'two_phase' and there is none for 'optimal'. The
+        first solution is ThistlethwaiteSolver's, within a millisecond
+        (post-optimized without the window search); the two-phase search
+        then yields every improvement on it until the deadline. Once
+        two-phase runs dry or gets down to PROOF_LENGTH moves, IDA* looks
+        for anything shorter. Once the generator is exhausted,
+        stats['optimal'] says whether the last solution is proven shortest.
+        'bidirectional', 'thistlethwaite', 'cfop' and 'bfs' yield their
+        single answer. progress, if given, receives dicts with the running
+        search ('two_phase' or 'optimal'), its depth, nodes and nodes/sec.
+        stats adds up the counters of both searches.
+        """
+        self.stats = {'optimal': False}
+        if self.cube.is_solved():
+            self.stats['optimal'] = True
+            yield []
+            return
+        if self.strategy not in ('two_phase', 'optimal'):
+            solution = self.solve()
+            if solution:
+                yield solution
+            return
+        if self.cache is not None:
+            start = time.monotonic()
+            solution = self.cache.get(self.cube, self.strategy, self.post_optimize)
+            lookup = time.monotonic() - start
+            if solution is not None:
+                self.stats = {'optimal': self.strategy == 'optimal', 'cached': True}
+                self._add_cache_stats(lookup)
+                yield solution
+                return
+        
+        if self.profiler is not None:
+            # Both strategies run two-phase and then IDA*; load their tables outside the profile
+            self.load_tables('two_phase', self.post_optimize)
+            self.load_tables('optimal', False)
+        if deadline is None and self.strategy == 'two_phase':
+            deadline = time.monotonic() + self.timeout
+        # A first answer right away; two-phase takes up to a few hundred ms for its first
+        quick = ThistlethwaiteSolver()
+        best = quick.solve(self.cube)
+        optimize_seconds = moves_saved = 0
+        if self.post_optimize:
+            start = time.monotonic()
+            optimized = SolutionOptimizer.optimize(best, window=False)
+            optimize_seconds = time.monotonic() - start
+            best, moves_saved = optimized, len(best) - len(optimized)
+        yield best
+        two_phase = TwoPhaseSolver(timeout=self.timeout, progress=self._progress_hook(progress, 'two_phase'))
+        solutions = two_phase.iter_solutions(self.cube, deadline or time.monotonic() + self.timeout,
+                                             give_up=True)
+        for found in self._profiled(solutions):
+            saved = 0
+            if self.post_optimize:
+                start = time.monotonic()
+                optimized = SolutionOptimizer.optimize(found)
+                optimize_seconds += time.monotonic() - start
+                found, saved = optimized, len(found) - len(optimized)
+            if len(found) < len(best):
+                best = found
+                moves_saved = saved
+                yield best
+            if len(best) <= self.PROOF_LENGTH:
+                solutions.close()
+                break
+        self.stats.update(self._engine_stats(two_phase))
+        self.stats['phases']['thistlethwaite'] = sum(quick.phase_seconds.values())
+        if self.post_optimize:
+            self.stats['phases']['optimize'] = optimize_seconds
+            self.stats['moves_saved'] = moves_saved
+        
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is None or remaining > 0:
+            solver = OptimalSolver(max_length=len(best) - 1, timeout=remaining,
+                                   progress=self._progress_hook(progress, 'optimal'))
+            with self._profiling():
+                shorter = solver.solve(self.cube)
+            search_stats = SearchStats()
+            search_stats.merge(two_phase.search_stats)
+            search_stats.merge(solver.search_stats)
+            nodes = two_phase.nodes + solver.nodes
+            seconds = two_phase.elapsed + solver.elapsed
+            counters = search_stats.as_dict()
+            counters['phases'] = {**self.stats['phases'], **counters['phases']}  # keep optimize and thistlethwaite
+            self.stats.update(nodes=nodes, seconds=seconds, nodes_per_second=nodes / seconds if seconds else 0.0,
+                              **counters)
+            if shorter is not None:
+                best = shorter
+                self.stats['optimal'] = True
+                yield best
+            elif not solver.timed_out:
+                self.stats['optimal'] = True
+        if self.cache is not None:
+            self._add_cache_stats(lookup)
+            # A deadline can stop either search short of what solve() would return
+            if self.stats['optimal'] or (self.strategy == 'two_phase' and len(best) <= self.target_length):
+                self.cache.put(self.cube, self.strategy, best, self.post_optimize)
+    
+    @classmethod
+    def cacheable(cls, strategy, solution, stats, target_length=22):
+        """Whether a solve's result may answer later solves with the same strategy.
+
+        An optimal strategy's answer must not come from its two-phase
+        fallback, and a two-phase answer longer than target_length means
+        the timeout cut the search short.
+        """
+        if strategy in cls.OPTIMAL_STRATEGIES:
+            return not stats.get('fallback')
+        if strategy == 'two_phase':
+            return len(solution) <= target_length
+        return True
+
+    def _profiling(self):
+        """The profiler as a context manager, or one that does nothing."""
+        return self.profiler if self.profiler is not None else contextlib.nullcontext()
+    
+    def _profiled(self, iterator):
+        """Re-yield iterator's items, profiling only while it computes them."""
+        while True:
+            with self._profiling():
+                item = next(iterator, None)
+            if item is None:
+                return
+            yield item
+    
+    @staticmethod
+    def _engine_stats(solver):
+        """Counters of a search engine with nodes, elapsed and search_stats, as a stats dict."""
+        return {'nodes': solver.nodes, 'seconds': solver.elapsed,
+                'nodes_per_second': solver.nodes_per_second, **solver.search_stats.as_dict()}
+    
+    def _add_cache_stats(self, lookup):
+        """Record the cache lookup time and the cache's overall hit rate."""
+        counters = self.cache.stats()
+        hits = counters['hits'] + counters['disk_hits']
+        self.stats.setdefault('phases', {})['cache'] = lookup
+        self.stats['cache_hit_rate'] = hits / (hits + counters['misses']) if hits + counters['misses'] else 0.0
+    
+    @staticmethod
+    def _progress_hook(progress, search):
+        """Adapt an engine's progress(depth, nodes) calls to iter_solutions' progress dicts."""
+        if progress is None:
+            return None
+        start = time.monotonic()
+        
+        def report(depth, nodes):
+            elapsed = time.monotonic() - start
+            progress({'search': search, 'depth': depth, 'nodes': nodes,
+                      'nodes_per_second': nodes / elapsed if elapsed else 0.0})
+        return report
+    
+    def _two_phase_fallback(self):
+        """Solve with two_phase after an optimal strategy gave up, adding its phases to stats."""
+        fallback = TwoPhaseSolver(self.target_length, self.timeout)
+        solution = fallback.solve(self.cube)
+        self.stats['phases'].update(fallback.search_stats.phases)
+        return solution
+    
+    def _search(self):
+        """Run the search engine for the selected strategy."""
+        if self.strategy == 'two_phase':
+            solver = TwoPhaseSolver(self.target_length, self.timeout)
+            solution = solver.solve(self.cube)
+            self.stats = self._engine_stats(solver)
+            return solution
+        
+        if self.strategy in ('optimal', 'parallel_optimal'):
+            if self.strategy == 'optimal':
+                tt = TranspositionTable(self.memory_limit_mb) if self.memory_limit_mb else None
+                solver = OptimalSolver(timeout=self.optimal_timeout, transposition_table=tt)
+            else:
+                solver = ParallelOptimalSolver(timeout=self.optimal_timeout)
+            solution = solver.solve(self.cube)
+            self.stats = self._engine_stats(solver)
+            self.stats['fallback'] = solver.timed_out
+            return self._two_phase_fallback() if solver.timed_out else solution
+        
+        if self.strategy == 'bidirectional':
+            start = time.monotonic()
+            solver = BidirectionalSolver(memory_limit_mb=self.memory_limit_mb or 512)
+            solution = solver.solve(self.cube)
+            self.stats = {'states': solver.states, 'seconds': time.monotonic() - start,
+                          'fallback': solution is None, **solver.search_stats.as_dict()}
+            return self._two_phase_fallback() if solution is None else solution
+        
+        if self.strategy == 'thistlethwaite':
+            solver = ThistlethwaiteSolver()
+            solution = solver.solve(self.cube)
+            self.stats = {'seconds': sum(solver.phase_seconds.values()),
+                          'phases': dict(solver.phase_seconds), 'stages': solver.stages}
+            return solution
+        
+        if self.strategy == 'cfop':
+            start = time.monotonic()
+            solution = self.layer_by_layer_solve()
+            seconds = time.monotonic() - start
+            self.stats.update(seconds=seconds, phases={'cfop': seconds})
+            return solution
+        
         # Try simple BFS first with limited depth
         simple_solution = self._simple_bfs()
         if simple_solution:
@@ -283,80 +3014,479 @@ class Solver:
     
     def _simple_bfs(self):
         """Simple BFS with limited depth for performance."""
-        queue = deque([(self.cube.copy(), [])])
-        visited = {self.cube.get_state_string()}
+        start_time = time.monotonic()
+        start = CubieCube.from_cube(self.cube).get_coords()
+        tables = [coord_move_table(name) for name in COORD_NAMES]
+        queue = deque([(start, [])])
+        visited = TranspositionTable(self.memory_limit_mb or 16)
+        visited.store(visited.key(start), self.max_depth)
+        search_stats = SearchStats(self.max_depth)
         max_iterations = 10000  # Limit iterations to prevent freezing
         iterations = 0
         
-        while queue and iterations < max_iterations:
-            current_cube, moves = queue.popleft()
-            iterations += 1
-            
-            if len(moves) >= self.max_depth:
-                continue
-            
-            # Try only basic moves for efficiency
-            basic_moves = ['U', 'D', 'L', 'R', 'F', 'B', "U'", "D'", "L'", "R'", "F'", "B'"]
-            
-            for move in basic_moves:
-                new_cube = current_cube.copy()
-                new_cube.apply_move(move)
-                new_moves = moves + [move]
+        try:
+            while queue and iterations < max_iterations:
+                coords, moves = queue.popleft()
+                iterations += 1
                 
-                if new_cube.is_solved():
-                    return new_moves
+                if len(moves) >= self.max_depth:
+                    continue
                 
-                state_string = new_cube.get_state_string()
-                if state_string not in visited and len(new_moves) < self.max_depth:
-                    visited.add(state_string)
-                    queue.append((new_cube, new_moves))
-        
-        return None
+                successors = CANONICAL_SUCCESSORS[moves[-1] if moves else -1]
+                search_stats.expanded[len(moves)] += 1
+                search_stats.generated[len(moves)] += len(successors)
+                for m in successors:
+                    new_coords = tuple([table[c * 18 + m] for table, c in zip(tables, coords)])
+                    new_moves = moves + [m]
+                    
+                    if new_coords == SOLVED_COORDS:
+                        return [MOVE_NAMES[move] for move in new_moves]
+                    
+                    # A state seen with at least as many moves to spare is a repeat
+                    key = visited.key(new_coords)
+                    togo = self.max_depth - len(new_moves)
+                    known = visited.probe(key)
+                    if (known is None or known < togo) and togo > 0:
+                        visited.store(key, togo)
+                        queue.append((new_coords, new_moves))
+                    elif known is not None:
+                        search_stats.duplicates += 1
+            
+            return None
+        finally:
+            seconds = time.monotonic() - start_time
+            search_stats.phases['bfs'] = seconds
+            self.stats = {'nodes': iterations, 'seconds': seconds,
+                          'nodes_per_second': iterations / seconds if seconds else 0.0,
+                          **search_stats.as_dict()}
     
     def layer_by_layer_solve(self):
-        """Simplified layer-by-layer solving approach."""
-        solution = []
-        temp_cube = self.cube.copy()
-        
-        # This is a simplified version - in practice, you'd implement
-        # proper layer-by-layer algorithms like CFOP
-        
-        # For demonstration, we'll use a basic approach
-        # In a real implementation, you'd have separate methods for:
-        # 1. Cross on bottom
-        # 2. First two layers (F2L)
-        # 3. Orient last layer (OLL)
-        # 4. Permute last layer (PLL)
-        
-        # Placeholder algorithm - try common algorithms
-        common_algorithms = [
-            "R U R' U R U2 R'",  # Right-hand algorithm
-            "L' U' L U' L' U2 L",  # Left-hand algorithm
-            "F R U' R' U' R U R' F'",  # Common OLL
-            "R U R' F' R U R' U' R' F R2 U' R'",  # Common PLL
-        ]
-        
-        for algorithm in common_algorithms:
-            if temp_cube.is_solved():
-                break
-            
-            moves = algorithm.split()
-            for move in moves:
-                temp_cube.apply_move(move)
-                solution.append(move)
-                
-                if temp_cube.is_solved():
-                    return solution
-        
-        # If still not solved, return current progress
+        """Layer-by-layer solution by CFOP; stats['stages'] gets its annotated stages."""
+        solver = CFOPSolver()
+        solution = solver.solve(self.cube)
+        self.stats['stages'] = solver.stages
         return solution
 
+    @staticmethod
+    def load_tables(strategy, post_optimize=True):
+        """Load, building first if needed, the tables a strategy searches with.
+
+        With post_optimize, SolutionOptimizer's sequence tables are built
+        too (unless the strategy skips its window search), so the first
+        solve does not pay for them.
+        """
+        if post_optimize and strategy not in Solver.QUICK_STRATEGIES:
+            SolutionOptimizer._sequence_tables()
+        if strategy in ('two_phase', 'bidirectional'):
+            TwoPhaseTables.get()
+            if strategy == 'two_phase':
+                ThistlethwaiteTables.get()  # iter_solutions' first answer
+        elif strategy in ('optimal', 'parallel_optimal'):
+            OptimalTables.get()
+        elif strategy == 'thistlethwaite':
+            ThistlethwaiteTables.get()
+        else:
+            CFOPTables.get()
+            if strategy == 'bfs':
+                for name in COORD_NAMES:
+                    coord_move_table(name)
+
+
+def _solve_task(task):
+    """Pool worker: solve one (index, state string, strategy, target, timeout) task."""
+    index, state, strategy, target_length, timeout = task
+    solver = Solver(Cube.from_state_string(state), strategy, target_length, timeout)
+    return index, solver.solve()
+
+
+def solve_many(states, workers=None, strategy='two_phase', ordered=True,
+               target_length=22, timeout=1.0, chunksize=1):
+    """Solve many cubes on a process pool, yielding (index, solution) pairs.
+
+    states holds Cube objects or state strings. Pairs come back in
+    submission order when ordered is true, otherwise as soon as each solve
+    finishes. The tables are built once here before the pool starts; the
+    workers memory-map the same cached files, so they share one copy.
+    """
+    if strategy not in Solver.STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    Solver.load_tables(strategy)
+    tasks = ((index, state if isinstance(state, str) else state.get_state_string(),
+              strategy, target_length, timeout)
+             for index, state in enumerate(states))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(_solve_task, tasks)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        results = pool.imap if ordered else pool.imap_unordered
+        yield from results(_solve_task, tasks, chunksize)
+
+
+def _exit_on_signal(signum, frame):
+    raise SystemExit(1)
+
+
+def _solve_worker(state, strategy, messages):
+    """Process body for GUI solves: stream progress and solutions into a queue."""
+    # Stopping sends SIGTERM; exiting through Python lets a parallel search
+    # shut down its own pool instead of orphaning it
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+    try:
+        solver = Solver(Cube.from_state_string(state), strategy, cache=SolutionCache())
+        for solution in solver.iter_solutions(progress=lambda info: messages.put(('progress', info))):
+            messages.put(('solution', solution))
+        messages.put(('done', solver.stats))
+    except Exception as e:
+        messages.put(('error', str(e)))
+
+
+def _warm_worker(strategies):
+    """Pool initializer for SolveService: map the tables before the first request."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is for the server process
+    for strategy in strategies:
+        Solver.load_tables(strategy)
+
+
+def _solve_batch(tasks):
+    """Pool worker: solve (state, strategy, timeout) tasks; one (solution, stats, error) each."""
+    results = []
+    for state, strategy, timeout in tasks:
+        try:
+            solver = Solver(Cube.from_state_string(state), strategy, timeout=timeout, optimal_timeout=timeout)
+            results.append((solver.solve(), solver.stats, None))
+        except Exception as e:
+            results.append((None, {}, str(e)))
+    return results
+
+
+class _SolveRequest:
+    """A queued solve and the slot its answer is delivered to."""
+
+    def __init__(self, cube, strategy, timeout):
+        self.cube = cube
+        self.task = (cube.get_state_string(), strategy, timeout)
+        self.done = threading.Event()
+        self.result = None
+
+
+class SolveService:
+    """Solves cubes for concurrent callers on a pool of warm worker processes.
+
+    The workers load the tables of strategies before the first request, so
+    requests never pay for table loading. solve queues a request on a queue
+    of at most max_queue requests and raises queue.Full once it is full,
+    which gives callers backpressure instead of unbounded latency. A
+    dispatcher thread hands each idle worker a batch of waiting requests,
+    one IPC round trip for up to batch_size solves; batches only grow when
+    requests back up, so an idle service adds no latency. Known solutions
+    come from cache without queueing. metrics returns counters and latency
+    percentiles.
+    """
+
+    LATENCY_WINDOW = 1000  # Latency percentiles cover this many recent solves
+
+    def __init__(self, workers=None, strategies=('two_phase',), batch_size=8, max_queue=256, cache=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.cache = cache
+        for strategy in strategies:
+            Solver.load_tables(strategy)  # Build missing tables once, before the workers map them
+        self._pool = multiprocessing.Pool(self.workers, _warm_worker, (strategies,))
+        self._queue = Queue(max_queue)
+        self._idle = threading.Semaphore(self.workers)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self._in_flight = {}
+        self._started = time.monotonic()
+        self.requests = self.solved = self.cache_hits = self.errors = self.rejected = 0
+        self.batches = self.batched = 0
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def solve(self, cube, strategy='two_phase', timeout=1.0):
+        """Return (solution, stats) for cube; blocks until a worker has solved it.
+
+        Raises ValueError for an unknown strategy, a timeout that is not
+        positive or an impossible cube, queue.Full when the queue is full
+        and RuntimeError when the worker failed. An optimal strategy that
+        runs out of timeout answers with two_phase's solution and
+        stats['fallback'] set.
+        """
+        if strategy not in Solver.STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        if not timeout > 0:
+            raise ValueError("timeout must be a positive number of seconds")  # 0 would mean no limit
+        CubieCube.from_cube(cube)  # Reject impossible cubes before they take a worker
+        start = time.monotonic()
+        with self._lock:
+            self.requests += 1
+        if self.cache is not None:
+            solution = self.cache.get(cube, strategy)
+            if solution is not None:
+                self._count(start, cache_hit=True)
+                return solution, {'cached': True}
+
+        request = _SolveRequest(cube, strategy, timeout)
+        try:
+            self._queue.put_nowait(request)
+        except Full:
+            with self._lock:
+                self.rejected += 1
+            raise
+        request.done.wait()
+        solution, stats, error = request.result
+        if error is not None:
+            self._count(start, error=True)
+            raise RuntimeError(error)
+        if (self.cache is not None and solution and cube.is_solved_by(solution)
+                and Solver.cacheable(strategy, solution, stats)):
+            self.cache.put(cube, strategy, solution)
+        self._count(start)
+        return solution, stats
+
+    def _count(self, start, cache_hit=False, error=False):
+        with self._lock:
+            if error:
+                self.errors += 1
+                return
+            self.solved += 1
+            self.cache_hits += cache_hit
+            self._latencies.append(time.monotonic() - start)
+
+    def _dispatch(self):
+        """Dispatcher thread: give each idle worker the next batch of queued requests."""
+        while True:
+            self._idle.acquire()
+            batch = [self._queue.get()]
+            if batch[0] is None:
+                return
+            # Split a backlog evenly over the workers, up to batch_size per round trip
+            size = min(self.batch_size, max(1, (self._queue.qsize() + 1) // self.workers))
+            while len(batch) < size:
+                try:
+                    request = self._queue.get_nowait()
+                except Empty:
+                    break
+                if request is None:
+                    self._queue.put(None)  # Stop after this batch
+                    break
+                batch.append(request)
+            with self._lock:
+                self.batches += 1
+                self.batched += len(batch)
+                self._in_flight[id(batch)] = batch
+            try:
+                self._pool.apply_async(_solve_batch, ([request.task for request in batch],),
+                                       callback=lambda results, batch=batch: self._deliver(batch, results),
+                                       error_callback=lambda e, batch=batch: self._deliver(
+                                           batch, [(None, {}, str(e))] * len(batch)))
+            except ValueError:  # The pool was closed under us
+                self._deliver(batch, [(None, {}, "Solve service shut down")] * len(batch))
+                return
+
+    def _deliver(self, batch, results):
+        """Pool callback: hand every request its result and free the worker."""
+        with self._lock:
+            self._in_flight.pop(id(batch), None)
+        self._idle.release()
+        for request, result in zip(batch, results):
+            request.result = result
+            request.done.set()
+
+    def metrics(self):
+        """Request counters, queue and pool state, and latency percentiles in ms."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            metrics = {
+                'requests': self.requests, 'solved': self.solved, 'cache_hits': self.cache_hits,
+                'errors': self.errors, 'rejected': self.rejected,
+                'queue_depth': self._queue.qsize(), 'max_queue': self.max_queue, 'workers': self.workers,
+                'batches': self.batches, 'mean_batch_size': self.batched / self.batches if self.batches else 0.0,
+                'uptime_seconds': time.monotonic() - self._started,
+            }
+        metrics['latency_ms'] = {
+            f"p{p}": latencies[max(0, -(-p * len(latencies) // 100) - 1)] * 1000 if latencies else 0.0
+            for p in (50, 95, 99)}
+        if self.cache is not None:
+            metrics['cache'] = self.cache.stats()
+        return metrics
+
+    def close(self):
+        """Stop the dispatcher and the worker pool; waiting callers get a RuntimeError."""
+        self._pool.terminate()
+        self._pool.join()
+        dropped = []
+        while True:
+            try:
+                dropped.append(self._queue.get_nowait())
+            except Empty:
+                break
+        self._idle.release()
+        self._queue.put(None)
+        self._dispatcher.join()
+        with self._lock:
+            dropped.extend(request for batch in self._in_flight.values() for request in batch)
+            self._in_flight.clear()
+        for request in dropped:
+            if request is not None:
+                request.result = (None, {}, "Solve service shut down")
+                request.done.set()
+
+
+def _solve_http_server(service, address, unix=False):
+    """HTTP front end of a SolveService: POST /solve and GET /metrics, JSON both ways.
+
+    address is (host, port), or a socket path when unix is set. The HTTP
+    stack is imported here so the solver and CLI start without it.
+    """
+    import json
+    import socket
+    import socketserver
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class SolveHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/metrics':
+                self._reply(200, service.metrics())
+            else:
+                self._reply(404, {'error': "Not found; use POST /solve or GET /metrics"})
+
+        def do_POST(self):
+            if self.path != '/solve':
+                self._reply(404, {'error': "Not found; use POST /solve or GET /metrics"})
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                if 'state' in body:
+                    cube = Cube.from_state_string(body['state'])
+                else:
+                    cube = Cube()
+                    cube.scramble(body.get('scramble', ''))
+                solution, stats = service.solve(cube, body.get('strategy', 'two_phase'),
+                                                float(body.get('timeout', 1.0)))
+            except Full:
+                self._reply(503, {'error': "Solve queue is full, retry later"}, {'Retry-After': '1'})
+            except RuntimeError as e:
+                self._reply(500, {'error': str(e)})
+            except (ValueError, TypeError, AttributeError) as e:
+                self._reply(400, {'error': f"Bad request: {e}"})
+            else:
+                self._reply(200, {'solution': solution, 'length': len(solution) if solution is not None else None,
+                                  'stats': stats})
+
+        def _reply(self, status, payload, headers=None):
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # /metrics has the counters; per-request lines would drown the console
+
+    class SolveHTTPServer(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 128  # Bursts should wait in the solve queue, not the listen backlog
+
+        if unix:
+            address_family = socket.AF_UNIX
+
+            def server_bind(self):
+                socketserver.TCPServer.server_bind(self)  # HTTPServer's version expects a host and port
+                self.server_name, self.server_port = 'localhost', 0
+
+    return SolveHTTPServer(address, SolveHandler)
+
+
+def serve(argv=()):
+    """Run a SolveService over HTTP until interrupted: python main.py --serve [options]."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='main.py --serve', description="Headless JSON solve service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--socket', help="listen on this Unix socket path instead of TCP")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per core)")
+    parser.add_argument('--strategies', nargs='+', default=['two_phase'], choices=Solver.STRATEGIES,
+                        help="strategies whose tables the workers load up front")
+    parser.add_argument('--batch-size', type=int, default=8, help="most solves sent to a worker at once")
+    parser.add_argument('--max-queue', type=int, default=256, help="queued solves before answering 503")
+    parser.add_argument('--no-cache', action='store_true', help="do not use the solution cache")
+    args = parser.parse_args(argv)
+
+    print("🔥 Warming up worker pool...")
+    service = SolveService(args.workers, args.strategies, args.batch_size, args.max_queue,
+                           None if args.no_cache else SolutionCache())
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+        server = _solve_http_server(service, args.socket, unix=True)
+        where = f"unix:{args.socket}"
+    else:
+        server = _solve_http_server(service, (args.host, args.port))
+        where = f"http://{args.host}:{server.server_port}"
+    signal.signal(signal.SIGTERM, _exit_on_signal)  # e.g. a container stop: shut down like Ctrl+C
+    print(f"🚀 Serving on {where} with {service.workers} workers (POST /solve, GET /metrics)")
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        print("\n👋 Shutting down...")
+    finally:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # A second Ctrl+C must not abandon the pool
+        server.server_close()
+        service.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+def build_tables(argv=()):
+    """Build and cache every lookup table the solvers use: python main.py --build-tables [options]."""
+    import argparse
+
+    global TABLE_WORKERS
+    parser = argparse.ArgumentParser(prog='main.py --build-tables',
+                                     description="Build the solver lookup tables into the table cache.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="processes sharing each BFS level of the large tables (default: one per core)")
+    parser.add_argument('--strategies', nargs='+', default=list(Solver.STRATEGIES), choices=Solver.STRATEGIES,
+                        help="only build the tables of these strategies")
+    args = parser.parse_args(argv)
+
+    TABLE_WORKERS = args.workers
+    print(f"🏗️ Building tables in {TABLE_DIR} with {args.workers} workers...")
+    try:
+        for strategy in args.strategies:
+            start = time.monotonic()
+            Solver.load_tables(strategy)
+            print(f"  ✅ {strategy}: {time.monotonic() - start:.1f}s")
+    except KeyboardInterrupt:
+        print("\n⏸️ Interrupted; run the command again to resume from the last checkpoint")
+        return
+    files = [name for name in os.listdir(TABLE_DIR) if name.endswith(('.tbl', '.pdb'))]
+    total = sum(os.path.getsize(os.path.join(TABLE_DIR, name)) for name in files)
+    print(f"💾 {len(files)} table files, {total / 2**20:.1f} MB")
+
+
+def _import_tkinter():
+    """Import tkinter into the module globals the first time a GUI is made."""
+    global tk, ttk, messagebox, scrolledtext
+    if tk is None:
+        import tkinter as tk
+        from tkinter import ttk, messagebox, scrolledtext
+
 
 class CubeVisualizer:
     """GUI for visualizing and interacting with the Rubik's cube."""
     
     def __init__(self):
+        _import_tkinter()
         self.root = tk.Tk()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         self.root.title("🎲 Rubik's Cube Solver - Interactive 3D Cube")
         self.root.geometry("1200x800")
         self.root.configure(bg='#2c3e50')
@@ -366,8 +3496,12 @@ class CubeVisualizer:
         style.theme_use('clam')
         
         self.cube = Cube()
-        self.solver = Solver(self.cube)
+        self.history = MoveHistory(self.cube)
+        self._solve_start = None  # (history position, cube) the last solve started from
         self.move_generator = MoveGenerator()
+        self._solve_process = None
+        self._solve_messages = None
+        self._solve_found = None
         
         # Color mapping for visualization
         self.colors = {
@@ -453,6 +3587,7 @@ class CubeVisualizer:
                                    fg='#27ae60', bg='#34495e')
         self.status_label.pack(side=tk.LEFT)
         
+        self._create_cube_items()
         self.draw_cube()
 
     def setup_controls(self, parent):
@@ -482,6 +3617,23 @@ class CubeVisualizer:
                             command=self.solve_cube, **btn_style)
         solve_btn.pack(pady=5, padx=10)
         
+        self.stop_btn = tk.Button(quick_frame, text="⏹️ STOP SOLVING", 
+                                bg='#7f8c8d', fg='white', state=tk.DISABLED,
+                                command=self.stop_solve, **btn_style)
+        self.stop_btn.pack(pady=5, padx=10)
+        
+        strategy_frame = tk.Frame(quick_frame, bg='#34495e')
+        strategy_frame.pack(pady=(0, 5))
+        
+        tk.Label(strategy_frame, text="Strategy:", 
+                font=('Arial', 10, 'bold'), 
+                fg='#ecf0f1', bg='#34495e').pack(side=tk.LEFT, padx=(0, 5))
+        
+        self.strategy_var = tk.StringVar(value=Solver.STRATEGIES[0])
+        ttk.Combobox(strategy_frame, textvariable=self.strategy_var, 
+                     values=Solver.STRATEGIES, state='readonly',
+                     width=max(map(len, Solver.STRATEGIES)) + 1).pack(side=tk.LEFT)
+        
         reset_btn = tk.Button(quick_frame, text="🔄 RESET TO SOLVED", 
                             bg='#3498db', fg='white', 
                             command=self.reset_cube, **btn_style)
@@ -543,6 +3695,28 @@ class CubeVisualizer:
                      bg=color, fg='white', font=('Arial', 8),
                      command=lambda m=move+"'": self.apply_move_button(m)).pack(pady=1)
         
+        # Undo/redo and a slider to scrub through the move history
+        history_frame = tk.Frame(moves_frame, bg='#34495e')
+        history_frame.pack(pady=(0, 10))
+        
+        tk.Button(history_frame, text="↶ Undo", width=6,
+                 bg='#7f8c8d', fg='white', font=('Arial', 9, 'bold'),
+                 command=self.undo_move).pack(side=tk.LEFT, padx=2)
+        
+        self.history_var = tk.IntVar(value=0)
+        self.history_scale = tk.Scale(history_frame, variable=self.history_var, from_=0, to=0,
+                                      orient=tk.HORIZONTAL, length=120, showvalue=True,
+                                      command=lambda value: self.seek_history(int(value)),
+                                      fg='#ecf0f1', bg='#34495e', highlightthickness=0)
+        self.history_scale.pack(side=tk.LEFT, padx=2)
+        
+        tk.Button(history_frame, text="Redo ↷", width=6,
+                 bg='#7f8c8d', fg='white', font=('Arial', 9, 'bold'),
+                 command=self.redo_move).pack(side=tk.LEFT, padx=2)
+        
+        self.root.bind('<Control-z>', lambda e: self.undo_move())
+        self.root.bind('<Control-y>', lambda e: self.redo_move())
+        
         # Custom Scramble Section
         custom_frame = tk.LabelFrame(parent, text="📝 Custom Scramble", 
                                    font=('Arial', 12, 'bold'),
@@ -581,6 +3755,18 @@ class CubeVisualizer:
                                    command=self.animate_solution, state=tk.DISABLED)
         self.animate_btn.pack(pady=10)
         
+        speed_frame = tk.Frame(solution_frame, bg='#34495e')
+        speed_frame.pack(pady=(0, 10))
+        
+        tk.Label(speed_frame, text="Step delay (ms):", 
+                font=('Arial', 10, 'bold'), 
+                fg='#ecf0f1', bg='#34495e').pack(side=tk.LEFT, padx=(0, 5))
+        
+        self.animation_delay = tk.IntVar(value=1200)
+        tk.Scale(speed_frame, variable=self.animation_delay, from_=20, to=2000, resolution=20,
+                 orient=tk.HORIZONTAL, length=150, showvalue=True,
+                 fg='#ecf0f1', bg='#34495e', highlightthickness=0).pack(side=tk.LEFT)
+        
         self.solution_moves = []
         
         # Initial message
@@ -591,10 +3777,8 @@ class CubeVisualizer:
         self.solution_text.insert(tk.END, "3. Use 'Animate Solution' to watch it solve\n\n")
         self.solution_text.insert(tk.END, "Ready to begin! 🚀\n")
 
-    def draw_cube(self):
-        """Draw the cube faces on the canvas."""
-        self.canvas.delete("all")
-        
+    def _create_cube_items(self):
+        """Create the canvas items for the unfolded cube once; redraws only recolour them."""
         # Face positions and sizes
         face_size = 80
         square_size = 24
@@ -609,10 +3793,9 @@ class CubeVisualizer:
             'D': (face_size * 2.5, face_size * 2 + 60) # Bottom
         }
         
-        # Draw each face
+        # Facelet index -> (square item, shine item), in get_state_string order
+        self._sticker_items = [None] * 54
         for face_name, (start_x, start_y) in positions.items():
-            face = self.cube.faces[face_name]
-            
             # Draw face background
             bg_x1, bg_y1 = start_x - 5, start_y - 25
             bg_x2, bg_y2 = start_x + face_size - 8, start_y + face_size - 8
@@ -633,20 +3816,28 @@ class CubeVisualizer:
                     x2 = x1 + square_size
                     y2 = y1 + square_size
                     
-                    color = self.colors[face[row][col]]
-                    
                     # Draw square with shadow effect
                     # Shadow
                     self.canvas.create_rectangle(x1+2, y1+2, x2+2, y2+2, 
                                                fill='#7f8c8d', outline='')
-                    # Main square
-                    self.canvas.create_rectangle(x1, y1, x2, y2, 
-                                               fill=color, outline='#2c3e50', width=2)
+                    # Main square; the colour is filled in by _render_cube
+                    square = self.canvas.create_rectangle(x1, y1, x2, y2, 
+                                                        outline='#2c3e50', width=2)
                     
-                    # Add shine effect for white squares
-                    if color == '#FFFFFF':
-                        self.canvas.create_rectangle(x1+3, y1+3, x1+8, y1+8, 
-                                                   fill='#f8f9fa', outline='')
+                    # Shine effect, only shown on white squares
+                    shine = self.canvas.create_rectangle(x1+3, y1+3, x1+8, y1+8, 
+                                                       fill='#f8f9fa', outline='', state=tk.HIDDEN)
+                    self._sticker_items[FACE_ORDER.index(face_name)*9 + row*3 + col] = (square, shine)
+        
+        self._drawn_state = None
+        self._redraw_pending = None
+
+    def draw_cube(self):
+        """Update the status now and schedule a redraw of the cube faces on the canvas."""
+        # Moves made before Tk next goes idle (key repeat, fast animation)
+        # share a single canvas update instead of queueing one each
+        if self._redraw_pending is None:
+            self._redraw_pending = self.root.after_idle(self._render_cube)
         
         # Update status
         if self.cube.is_solved():
@@ -655,12 +3846,26 @@ class CubeVisualizer:
         else:
             self.status_var.set("🔄 SCRAMBLED - Ready to Solve")
             self.status_label.config(fg='#e74c3c')
+
+    def _render_cube(self):
+        """Recolour the stickers that changed since the last frame."""
+        self._redraw_pending = None
+        state = self.cube.get_state_string()
+        drawn = self._drawn_state
+        for i, colour in enumerate(state):
+            if drawn is not None and drawn[i] == colour:
+                continue
+            square, shine = self._sticker_items[i]
+            self.canvas.itemconfig(square, fill=self.colors[colour])
+            if drawn is None or (drawn[i] == 'W') != (colour == 'W'):
+                self.canvas.itemconfig(shine, state=tk.NORMAL if colour == 'W' else tk.HIDDEN)
+        self._drawn_state = state
     
     def quick_scramble(self):
         """Quick scramble with one click."""
         scramble = self.move_generator.get_random_scramble()
         self.cube.scramble(scramble)
-        self.draw_cube()
+        self._reset_history()
         self.scramble_entry.delete(0, tk.END)
         self.scramble_entry.insert(0, scramble)
         self.solution_text.insert(tk.END, f"🎲 Quick scramble applied: {scramble}\n\n")
@@ -675,8 +3880,8 @@ class CubeVisualizer:
             return
         
         try:
-            self.cube.apply_move(move)
-            self.draw_cube()
+            self.cube = self.history.apply(move)
+            self._sync_history()
             self.solution_text.insert(tk.END, f"✅ Applied: {move}\n")
             self.solution_text.see(tk.END)
             self.move_entry.delete(0, tk.END)
@@ -687,8 +3892,8 @@ class CubeVisualizer:
     def apply_move_button(self, move):
         """Apply move from button click."""
         try:
-            self.cube.apply_move(move)
-            self.draw_cube()
+            self.cube = self.history.apply(move)
+            self._sync_history()
             self.solution_text.insert(tk.END, f"🎯 Move: {move}\n")
             self.solution_text.see(tk.END)
         except Exception as e:
@@ -707,7 +3912,7 @@ class CubeVisualizer:
         if scramble:
             try:
                 self.cube.scramble(scramble)
-                self.draw_cube()
+                self._reset_history()
                 self.solution_text.insert(tk.END, f"📝 Applied custom scramble: {scramble}\n\n")
                 self.solution_text.see(tk.END)
                 self.animate_btn.config(state=tk.DISABLED)
@@ -733,34 +3938,115 @@ class CubeVisualizer:
         self.solution_text.insert(tk.END, "🔍 Searching for optimal solution...\n\n")
         self.solution_text.see(tk.END)
         
-        def solve_thread():
+        # Searching is pure-Python CPU work, so it runs in its own process to
+        # keep the UI responsive; a new solve supersedes a running one
+        self.stop_solve(quiet=True)
+        messages = multiprocessing.Queue()
+        self._solve_process = multiprocessing.Process(
+            target=_solve_worker, args=(self.cube.get_state_string(), self.strategy_var.get(), messages))
+        self._solve_process.start()
+        self._solve_messages = messages
+        self._solve_found = None
+        self._solve_start = (self.history.position, self.cube.copy())
+        self.stop_btn.config(state=tk.NORMAL)
+        self.root.after(50, self._poll_solve, messages)
+    
+    def _poll_solve(self, messages):
+        """Show what the solve worker reported since the last poll."""
+        if messages is not self._solve_messages:
+            return  # Stopped or superseded
+        while True:
             try:
-                solver = Solver(self.cube)
-                solution = solver.solve()
-                
-                def update_ui():
-                    self.display_solution(solution)
-                
-                self.root.after(0, update_ui)
-                
-            except Exception as e:
-                def handle_error():
-                    self.solution_text.insert(tk.END, f"❌ Solving failed: {str(e)}\n\n")
-                    self.solution_text.see(tk.END)
-                    self.status_var.set("❌ Solve Failed")
-                    self.status_label.config(fg='#e74c3c')
-                
-                self.root.after(0, handle_error)
-        
-        threading.Thread(target=solve_thread, daemon=True).start()
+                kind, payload = messages.get_nowait()
+            except Empty:
+                break
+            if kind == 'progress':
+                self.status_var.set(f"🧠 Depth {payload['depth']} ({payload['search']}): "
+                                    f"{payload['nodes']:,} nodes, {payload['nodes_per_second']:,.0f} nodes/s")
+            elif kind == 'solution':
+                self.display_solution(payload, improvement=self._solve_found is not None)
+                self._solve_found = payload
+            elif kind == 'done':
+                self._show_solve_stats(payload)
+                self._end_solve()
+                return
+            elif kind == 'error':
+                self.solution_text.insert(tk.END, f"❌ Solving failed: {payload}\n\n")
+                self.solution_text.see(tk.END)
+                self.status_var.set("❌ Solve Failed")
+                self.status_label.config(fg='#e74c3c')
+                self._end_solve()
+                return
+        if not self._solve_process.is_alive() and messages.empty():
+            self.solution_text.insert(tk.END, "❌ Solving failed: the solver process exited\n\n")
+            self.solution_text.see(tk.END)
+            self._end_solve()
+            return
+        self.root.after(50, self._poll_solve, messages)
+    
+    def _show_solve_stats(self, stats):
+        """Summarise a finished solve from the solver's stats."""
+        solution = self._solve_found
+        if solution is None:
+            self.display_solution(solution)
+        elif stats.get('optimal'):
+            self.solution_text.insert(tk.END, f"🏆 Proven optimal ({len(solution)} moves)\n")
+        if 'nodes' in stats:
+            self.solution_text.insert(tk.END, f"📈 Searched {stats['nodes']:,} nodes "
+                                      f"({stats['nodes_per_second']:,.0f} nodes/s)\n\n")
+        elif 'states' in stats:
+            note = " - too deep, used two_phase" if stats['fallback'] else ""
+            self.solution_text.insert(tk.END, f"📈 Stored {stats['states']:,} states{note}\n\n")
+        elif stats.get('cached'):
+            self.solution_text.insert(tk.END, "⚡ Served from the solution cache\n\n")
+        if stats.get('stages'):
+            self.solution_text.insert(tk.END, "🧩 Stages:\n")
+            for stage, moves in stats['stages']:
+                self.solution_text.insert(tk.END, f"  {stage}: {' '.join(moves)}\n")
+            self.solution_text.insert(tk.END, "\n")
+        self.solution_text.see(tk.END)
+        if solution is not None:
+            self.status_var.set(f"✅ Solution Ready! ({len(solution)} moves)")
+            self.status_label.config(fg='#27ae60')
+    
+    def close(self):
+        """Close the window, stopping any solve in progress."""
+        # The solve worker is not a daemon (parallel_optimal starts its own
+        # pool from it), so it has to be stopped before the app can exit
+        self.stop_solve(quiet=True)
+        self.root.destroy()
+    
+    def _end_solve(self):
+        self._solve_process = None
+        self._solve_messages = None
+        self.stop_btn.config(state=tk.DISABLED)
+    
+    def stop_solve(self, quiet=False):
+        """Cancel the running solve, keeping the best solution it reported."""
+        if self._solve_process is None:
+            return
+        self._solve_process.terminate()
+        self._solve_process.join(1)
+        self._end_solve()
+        if not quiet:
+            self.solution_text.insert(tk.END, "⏹️ Solve stopped\n\n")
+            self.solution_text.see(tk.END)
+            if self._solve_found:
+                self.status_var.set(f"⏹️ Stopped - best so far {len(self._solve_found)} moves")
+            else:
+                self.status_var.set("⏹️ Solve stopped")
+            self.status_label.config(fg='#f39c12')
     
-    def display_solution(self, solution):
-        """Display the solution in the text area."""
+    def display_solution(self, solution, improvement=False):
+        """Display the solution in the text area; improvement marks a shorter one for the same cube."""
         self.solution_moves = solution
         
         if solution:
             solution_str = ' '.join(solution)
-            self.solution_text.insert(tk.END, f"🎉 SOLUTION FOUND! ({len(solution)} moves)\n")
+            if improvement:
+                self.solution_text.insert(tk.END, f"⬇️ SHORTER SOLUTION! ({len(solution)} moves)\n")
+            else:
+                self.solution_text.insert(tk.END, f"🎉 SOLUTION FOUND! ({len(solution)} moves)\n")
             self.solution_text.insert(tk.END, f"📋 Moves: {solution_str}\n\n")
             
             # Show move breakdown
@@ -790,32 +4076,27 @@ class CubeVisualizer:
         # Disable animation button during animation
         self.animate_btn.config(state=tk.DISABLED, text="🎬 Animating...")
         
-        # Reset cube to scrambled state
-        temp_cube = Cube()
-        scramble = self.scramble_entry.get().strip()
-        if scramble:
-            try:
-                temp_cube.scramble(scramble)
-                self.cube = temp_cube
-                self.draw_cube()
-                
-                self.solution_text.insert(tk.END, "🎬 Starting animation...\n")
-                self.solution_text.insert(tk.END, f"📽️ Will apply {len(self.solution_moves)} moves\n\n")
-                self.solution_text.see(tk.END)
-                
-            except:
-                self.solution_text.insert(tk.END, "❌ Cannot reset to scrambled state.\n")
-                self.solution_text.insert(tk.END, "💡 Try applying a new scramble first.\n\n")
-                self.solution_text.see(tk.END)
-                self.animate_btn.config(state=tk.NORMAL, text="🎬 Animate Solution")
-                return
+        # Replay from the position the solve started at. If the history has
+        # since moved away from it, the solve's cube starts a new history.
+        position, start_cube = self._solve_start
+        if (position > len(self.history) or
+                self.history.seek(position).get_state_string() != start_cube.get_state_string()):
+            self.history.reset(start_cube)
+            position = 0
+        self.history.extend(self.solution_moves)
+        self.cube = self.history.seek(position)
+        self._sync_history()
+        
+        self.solution_text.insert(tk.END, "🎬 Starting animation...\n")
+        self.solution_text.insert(tk.END, f"📽️ Will apply {len(self.solution_moves)} moves\n\n")
+        self.solution_text.see(tk.END)
         
         def animate_step(step):
             if step < len(self.solution_moves):
                 move = self.solution_moves[step]
                 try:
-                    self.cube.apply_move(move)
-                    self.draw_cube()
+                    self.cube = self.history.seek(position + step + 1)
+                    self._sync_history()
                     
                     # Update solution display
                     self.solution_text.insert(tk.END, f"🎯 Step {step + 1}: {move}\n")
@@ -829,7 +4110,7 @@ class CubeVisualizer:
                     self.status_var.set(f"🎬 Animating... {step + 1}/{len(self.solution_moves)}")
                     
                     # Schedule next step
-                    self.root.after(1200, lambda: animate_step(step + 1))
+                    self.root.after(self.animation_delay.get(), animate_step, step + 1)
                 except Exception as e:
                     self.solution_text.insert(tk.END, f"❌ Animation error: {e}\n\n")
                     self.solution_text.see(tk.END)
@@ -847,7 +4128,7 @@ class CubeVisualizer:
     def reset_cube(self):
         """Reset cube to solved state."""
         self.cube = Cube()
-        self.draw_cube()
+        self._reset_history()
         self.solution_text.insert(tk.END, "🔄 Cube reset to solved state.\n")
         self.solution_text.insert(tk.END, "✅ Ready for new scramble!\n\n")
         self.solution_text.see(tk.END)
@@ -856,20 +4137,96 @@ class CubeVisualizer:
         self.animate_btn.config(state=tk.DISABLED)
         self.solution_moves = []
     
+    def _reset_history(self):
+        """Make the current cube the start of a new move history."""
+        self.history.reset(self.cube)
+        self._sync_history()
+
+    def _sync_history(self):
+        """Redraw the cube and move the history slider to the current position."""
+        self.history_scale.config(to=len(self.history))
+        self.history_var.set(self.history.position)
+        self.draw_cube()
+
+    def seek_history(self, step):
+        """Show the cube after the first step moves of the history."""
+        if step != self.history.position:
+            self.cube = self.history.seek(step)
+            self._sync_history()
+
+    def undo_move(self):
+        """Take back the last move."""
+        if self.history.can_undo():
+            self.cube = self.history.undo()
+            self._sync_history()
+
+    def redo_move(self):
+        """Replay the last undone move."""
+        if self.history.can_redo():
+            self.cube = self.history.redo()
+            self._sync_history()
+
     def run(self):
         """Start the GUI application."""
         self.root.mainloop()
 
 
 # CLI Interface
+def print_search_stats(stats, profile=None, detail=True):
+    """Print a Solver's stats dict, and the hottest functions of a cProfile run.
+
+    Without detail only the summary lines are printed: no per-depth
+    counters, phase timings or cache hit rate.
+    """
+    if stats.get('cached'):
+        print("⚡ Served from the solution cache")
+    if 'nodes' in stats:
+        note = " - out of time, used two_phase" if stats.get('fallback') else ""
+        print(f"📈 {stats['nodes']:,} nodes in {stats['seconds']:.3f}s ({stats['nodes_per_second']:,.0f} nodes/s){note}")
+    elif 'states' in stats:
+        note = " - too deep, used two_phase" if stats['fallback'] else ""
+        print(f"📈 {stats['states']:,} states in {stats['seconds']:.3f}s{note}")
+    if detail and stats.get('expanded'):
+        print("  depth   expanded   generated  branching")
+        for depth, (expanded, generated) in enumerate(zip(stats['expanded'], stats['generated'])):
+            branching = f"{generated / expanded:9.2f}" if expanded else "        -"
+            print(f"  {depth:5d} {expanded:10,d} {generated:11,d}  {branching}")
+        generated = sum(stats['generated'])
+        rate = f" ({stats['cutoffs'] / generated:.0%} of generated)" if generated else ""
+        print(f"✂️ {stats['lookups']:,} pruning-table lookups, {stats['cutoffs']:,} cutoffs{rate}")
+        print(f"🔁 {stats['duplicates']:,} duplicate states skipped")
+    for stage, moves in stats.get('stages', ()):
+        print(f"  🧩 {stage}: {' '.join(moves)}")
+    if stats.get('moves_saved'):
+        print(f"🪄 Post-optimizer removed {stats['moves_saved']} moves")
+    if not detail:
+        return
+    if stats.get('phases'):
+        print("⏱️ " + ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in stats['phases'].items()))
+    if 'cache_hit_rate' in stats:
+        print(f"🗄️ Cache hit rate: {stats['cache_hit_rate']:.0%}")
+    if profile is not None:
+        import pstats
+
+        print("🔬 Hottest functions of the search:")
+        pstats.Stats(profile).sort_stats('cumulative').print_stats(15)
+
+
 def cli_interface():
     """Command-line interface for the cube solver."""
     print("=== 🎲 Rubik's Cube Solver CLI ===")
-    print("Commands: scramble, solve, move <move>, state, reset, gui, quit")
+    print("Commands: scramble, solve [strategy] [profile], move <move>, undo, redo, history, seek <step>, "
+          "play, state, reset, cache, stats, gui, quit")
+    print(f"Strategies: {', '.join(Solver.STRATEGIES)}")
     print("Move examples: U, R', F2, L, D'")
     
     cube = Cube()
+    history = MoveHistory(cube)
     move_gen = MoveGenerator()
+    cache = SolutionCache()
+    last_stats = None
+    last_profile = None
+    last_solution = None  # (moves, history position, cube) of the last solve
     
     while True:
         try:
@@ -884,38 +4241,104 @@ def cli_interface():
                 scramble = move_gen.get_random_scramble()
                 print(f"🎲 Scramble: {scramble}")
                 cube.scramble(scramble)
+                history.reset(cube)
                 print("✅ Cube scrambled!")
-            elif command.lower() == 'solve':
-                if cube.is_solved():
+            elif command.lower().split()[0] == 'solve':
+                args = command.lower().split()[1:]
+                profile = 'profile' in args
+                if profile:
+                    args.remove('profile')
+                strategy = args[0] if args else Solver.STRATEGIES[0]
+                if strategy not in Solver.STRATEGIES:
+                    print(f"❌ Unknown strategy '{strategy}'. Choose from: {', '.join(Solver.STRATEGIES)}")
+                elif cube.is_solved():
                     print("ℹ️ Cube is already solved!")
                 else:
-                    print("🧠 Solving cube...")
-                    solver = Solver(cube)
-                    solution = solver.solve()
+                    print(f"🧠 Solving cube ({strategy})...")
+                    last_profile = cProfile.Profile() if profile else None
+                    solver = Solver(cube, strategy=strategy, cache=cache, profiler=last_profile)
+                    solution = None
+                    for improved in solver.iter_solutions():
+                        label = "🎉 Solution" if solution is None else "⬇️ Shorter"
+                        print(f"{label} ({len(improved)} moves): {' '.join(improved)}")
+                        solution = improved
+                    last_stats = solver.stats
                     if solution:
-                        print(f"🎉 Solution ({len(solution)} moves): {' '.join(solution)}")
-                    else:
+                        last_solution = (solution, history.position, cube.copy())
+                    if solution is None:
                         print("😕 No solution found within search limits.")
+                    elif solver.stats.get('optimal'):
+                        print("🏆 Proven optimal")
+                    print_search_stats(solver.stats, detail=False)
             elif command.lower().startswith('move '):
                 move_part = command[5:].strip().upper()
                 if not move_part:
                     print("❌ Please specify a move. Example: move U")
                     continue
                 try:
-                    cube.apply_move(move_part)
+                    cube = history.apply(move_part)
                     print(f"✅ Applied move: {move_part}")
                 except Exception as e:
                     print(f"❌ Invalid move '{move_part}': {str(e)}")
                     print("💡 Valid moves: U, D, L, R, F, B (add ' for inverse, 2 for double)")
+            elif command.lower() in ('undo', 'redo'):
+                if command.lower() == 'undo':
+                    stepped = history.undo()
+                else:
+                    stepped = history.redo()
+                if stepped is None:
+                    print(f"ℹ️ Nothing to {command.lower()}.")
+                else:
+                    cube = stepped
+                    print(f"↔️ At step {history.position}/{len(history)}")
+            elif command.lower() == 'history':
+                if not len(history):
+                    print("ℹ️ No moves since the last scramble or reset.")
+                else:
+                    moves = history.moves
+                    done, undone = moves[:history.position], moves[history.position:]
+                    print(f"📜 {' '.join(done) or '(start)'} | {' '.join(undone) or '(end)'}")
+                    print(f"  At step {history.position}/{len(history)}; 'seek <step>' jumps anywhere")
+            elif command.lower().split()[0] == 'seek':
+                try:
+                    cube = history.seek(int(command.split()[1]))
+                    print(f"↔️ At step {history.position}/{len(history)}")
+                except (IndexError, ValueError):
+                    print(f"❌ Usage: seek <step>, with a step from 0 to {len(history)}")
+            elif command.lower() == 'play':
+                if last_solution is None:
+                    print("ℹ️ No solution yet - run 'solve' first.")
+                else:
+                    # Record the solution from the position it was found for,
+                    # so undo/redo/seek can step through it
+                    solution, position, start_cube = last_solution
+                    if (position > len(history) or
+                            history.seek(position).get_state_string() != start_cube.get_state_string()):
+                        history.reset(start_cube)
+                        position = 0
+                    cube = history.extend(solution)
+                    print(f"▶️ Played {len(solution)} moves (steps {position}-{history.position}); "
+                          f"use undo, redo or seek to step through them")
             elif command.lower() == 'state':
                 print("📊 Current cube state:")
+                faces = cube.faces
                 for face in ['U', 'D', 'L', 'R', 'F', 'B']:
-                    print(f"  {face}: {cube.faces[face]}")
+                    print(f"  {face}: {[list(row) for row in faces[face]]}")
                 status = "✅ SOLVED" if cube.is_solved() else "🔄 SCRAMBLED"
                 print(f"  Status: {status}")
             elif command.lower() == 'reset':
                 cube = Cube()
+                history.reset(cube)
                 print("🔄 Cube reset to solved state.")
+            elif command.lower() == 'cache':
+                stats = cache.stats()
+                print(f"🗄️ Solution cache: {stats['hits']} memory hits, {stats['disk_hits']} disk hits, "
+                      f"{stats['misses']} misses, {stats['evictions']} evictions, {stats['entries']} in memory")
+            elif command.lower() == 'stats':
+                if last_stats is None:
+                    print("ℹ️ No solve yet - run 'solve' first.")
+                else:
+                    print_search_stats(last_stats, last_profile)
             elif command.lower() == 'gui':
                 print("🖥️ Starting GUI...")
                 try:
@@ -928,14 +4351,20 @@ def cli_interface():
                 print("❓ Unknown command.")
                 print("📋 Available commands:")
                 print("  • scramble - Generate random scramble")
-                print("  • solve - Find solution for current state")  
+                print("  • solve [strategy] [profile] - Find solution for current state (e.g., solve bfs)")
                 print("  • move <move> - Apply single move (e.g., move U2)")
+                print("  • undo / redo - Step back or forward through the move history")
+                print("  • history - Show the recorded moves and the current step")
+                print("  • seek <step> - Jump to any step of the history (0 is the start)")
+                print("  • play - Apply the last solution to the history")
                 print("  • state - Show current cube state")
                 print("  • reset - Reset to solved state")
+                print("  • cache - Show solution cache counters")
+                print("  • stats - Show search statistics (and profile) of the last solve")
                 print("  • gui - Launch graphical interface")
                 print("  • quit - Exit program")
         
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):  # EOF: input piped in has run out
             print("\n👋 Goodbye!")
             break
         except Exception as e:
@@ -950,6 +4379,10 @@ if __name__ == "__main__":
     
     if len(sys.argv) > 1 and sys.argv[1] == '--cli':
         cli_interface()
+    elif len(sys.argv) > 1 and sys.argv[1] == '--serve':
+        serve(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == '--build-tables':
+        build_tables(sys.argv[2:])
     else:
         # Start GUI by default
         try:
@@ -0,0 +1,6 @@
+"""Tests build and map their tables in tests/.tables (or RUBIKS_TEST_TABLE_DIR), not the user's cache."""
+
+import os
+
+os.environ['RUBIKS_TABLE_DIR'] = os.environ.get('RUBIKS_TEST_TABLE_DIR') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '.tables')
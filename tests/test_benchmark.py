@@ -0,0 +1,42 @@
+import unittest
+
+from benchmark import compare, flatten, percentile
+
+
+def run(p50_ms, rate):
+    return {'meta': {'seed': 1, 'python': '3.11'},
+            'solve': {'two_phase': {'depth_10': {'p50_ms': p50_ms, 'nodes_per_second': rate}}}}
+
+
+class CompareTest(unittest.TestCase):
+
+    def test_no_change(self):
+        self.assertEqual(compare(run(10.0, 1000.0), run(10.0, 1000.0), 0.25), [])
+
+    def test_within_tolerance(self):
+        self.assertEqual(compare(run(12.0, 800.0), run(10.0, 1000.0), 0.25), [])
+
+    def test_slower_latency_is_a_regression(self):
+        regressions = compare(run(20.0, 1000.0), run(10.0, 1000.0), 0.25)
+        self.assertEqual([metric for metric, *_ in regressions], ['solve.two_phase.depth_10.p50_ms'])
+        self.assertAlmostEqual(regressions[0][3], 1.0)
+
+    def test_lower_throughput_is_a_regression(self):
+        regressions = compare(run(10.0, 500.0), run(10.0, 1000.0), 0.25)
+        self.assertEqual([metric for metric, *_ in regressions], ['solve.two_phase.depth_10.nodes_per_second'])
+
+    def test_improvements_and_skipped_metrics(self):
+        self.assertEqual(compare(run(5.0, 2000.0), run(10.0, 1000.0), 0.25), [])
+        self.assertEqual(compare(run(float('nan'), 1000.0), run(10.0, 1000.0), 0.25), [])
+        current = run(10.0, 1000.0)
+        current['meta']['seed'] = 99
+        self.assertEqual(compare(current, run(10.0, 1000.0), 0.25), [])
+
+    def test_flatten_and_percentile(self):
+        self.assertEqual(flatten({'a': {'b': 1, 'c': 'x', 'd': True}}), {'a.b': 1})
+        self.assertEqual(percentile([5, 1, 4, 2, 3], 50), 3)
+        self.assertEqual(percentile([1, 2, 3, 4], 100), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+from main import BidirectionalSolver, OptimalSolver, Solver
+
+from tests.test_cube import scrambled
+
+
+class BidirectionalTest(unittest.TestCase):
+
+    def test_agrees_with_optimal(self):
+        for seed in range(6):
+            cube, _ = scrambled(8, seed)
+            optimal = OptimalSolver().solve(cube)
+            bidirectional = BidirectionalSolver().solve(cube)
+            self.assertTrue(cube.is_solved_by(bidirectional), f"seed {seed}")
+            self.assertEqual(len(bidirectional), len(optimal), f"seed {seed}")
+
+    def test_falls_back_at_the_memory_limit(self):
+        cube, _ = scrambled(25, 1)
+        solver = Solver(cube, 'bidirectional', memory_limit_mb=1)
+        solution = solver.solve()
+        self.assertTrue(cube.is_solved_by(solution))
+        self.assertTrue(solver.stats['fallback'])
+
+
+if __name__ == '__main__':
+    unittest.main()
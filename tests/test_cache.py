@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+from main import SYMMETRIES, SolutionCache, Solver
+
+from tests.test_cube import scrambled
+from tests.test_symmetry import symmetric_copy
+
+
+class SolutionCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = SolutionCache(path=None)
+
+    def test_hit_and_miss(self):
+        cube, _ = scrambled(12, 1)
+        self.assertIsNone(self.cache.get(cube, 'two_phase'))
+        solution = Solver(cube, 'cfop').solve()
+        self.cache.put(cube, 'two_phase', solution)
+        self.assertEqual(self.cache.get(cube, 'two_phase'), solution)
+        self.assertIsNone(self.cache.get(cube, 'optimal'))
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_symmetric_positions_share_an_entry(self):
+        cube, moves = scrambled(12, 2)
+        self.cache.put(cube, 'cfop', Solver(cube, 'cfop').solve())
+        for symmetry in range(len(SYMMETRIES)):
+            copy = symmetric_copy(moves, symmetry)
+            solution = self.cache.get(copy, 'cfop')
+            self.assertIsNotNone(solution, f"symmetry {symmetry}")
+            self.assertTrue(copy.is_solved_by(solution), f"symmetry {symmetry}")
+        self.assertEqual(self.cache.stats()['entries'], 1)
+
+    def test_solver_uses_the_cache(self):
+        cube, _ = scrambled(12, 3)
+        first = Solver(cube, 'cfop', cache=self.cache)
+        solution = first.solve()
+        second = Solver(cube, 'cfop', cache=self.cache)
+        self.assertEqual(second.solve(), solution)
+        self.assertTrue(second.stats['cached'])
+
+    def test_eviction(self):
+        cache = SolutionCache(path=None, max_entries=2)
+        for seed in range(3):
+            cube, _ = scrambled(10, seed)
+            cache.put(cube, 'cfop', Solver(cube, 'cfop').solve())
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(cache.stats()['entries'], 2)
+
+    def test_kept_across_runs(self):
+        cube, _ = scrambled(12, 5)
+        solution = Solver(cube, 'cfop').solve()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'solutions.sqlite')
+            SolutionCache(path).put(cube, 'cfop', solution)
+            reopened = SolutionCache(path)
+            self.assertEqual(reopened.get(cube, 'cfop'), solution)
+            self.assertEqual(reopened.stats()['disk_hits'], 1)
+
+    def test_unoptimized_solutions_are_kept_apart(self):
+        cube, _ = scrambled(25, 4)
+        raw = Solver(cube, 'cfop', post_optimize=False, cache=self.cache).solve()
+        self.assertEqual(self.cache.get(cube, 'cfop', post_optimize=False), raw)
+        self.assertIsNone(self.cache.get(cube, 'cfop'))
+        solver = Solver(cube, 'cfop', cache=self.cache)
+        solver.solve()
+        self.assertFalse(solver.stats.get('cached'))
+
+    def test_incomplete_searches_are_not_cached(self):
+        self.assertFalse(Solver.cacheable('bidirectional', ['R'], {'fallback': True}))
+        self.assertTrue(Solver.cacheable('bidirectional', ['R'], {'fallback': False}))
+        self.assertFalse(Solver.cacheable('two_phase', ['R'] * 23, {}))
+        self.assertTrue(Solver.cacheable('cfop', ['R'] * 60, {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
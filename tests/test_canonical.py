@@ -0,0 +1,38 @@
+import unittest
+
+from main import CANONICAL_SUCCESSORS, MOVE_NAMES
+
+
+def canonical(sequence):
+    """Whether a sequence of move indices only uses canonical successors."""
+    last = -1
+    for m in sequence:
+        if m not in CANONICAL_SUCCESSORS[last]:
+            return False
+        last = m
+    return True
+
+
+class CanonicalSuccessorsTest(unittest.TestCase):
+
+    def test_no_face_twice_in_a_row(self):
+        for last, successors in enumerate(CANONICAL_SUCCESSORS[:18]):
+            self.assertFalse(any(m // 3 == last // 3 for m in successors), MOVE_NAMES[last])
+
+    def test_opposite_faces_in_one_order(self):
+        u, d = MOVE_NAMES.index('U'), MOVE_NAMES.index('D')
+        self.assertTrue(canonical([u, d]))
+        self.assertFalse(canonical([d, u]))
+
+    def test_sequence_counts(self):
+        # Canonical sequences of length 1, 2 and 3 in the half-turn metric
+        counts = [0, 0, 0]
+        sequences = [()]
+        for length in range(3):
+            sequences = [seq + (m,) for seq in sequences for m in CANONICAL_SUCCESSORS[seq[-1] if seq else -1]]
+            counts[length] = len(sequences)
+        self.assertEqual(counts, [18, 243, 3240])
+
+
+if __name__ == '__main__':
+    unittest.main()
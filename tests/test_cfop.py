@@ -0,0 +1,41 @@
+import unittest
+
+from main import Cube, CubieCube, Solver
+
+from tests.test_cube import scrambled
+
+
+def recoloured(cube):
+    """The same position with the six colours renamed."""
+    return Cube.from_state_string(cube.get_state_string().translate(str.maketrans('WYORGB', 'ABCDEF')))
+
+
+class CFOPTest(unittest.TestCase):
+
+    def test_full_scrambles(self):
+        for seed in range(10):
+            cube, _ = scrambled(25, seed)
+            solution = Solver(cube, 'cfop').solve()
+            self.assertTrue(cube.is_solved_by(solution), f"seed {seed}")
+
+    def test_stages_add_up_to_the_solution(self):
+        cube, _ = scrambled(25, 7)
+        solver = Solver(cube, 'cfop', post_optimize=False)
+        solution = solver.solve()
+        self.assertEqual([move for _, moves in solver.stats['stages'] for move in moves], solution)
+        self.assertEqual(solver.stats['stages'][0][0], 'cross')
+
+    def test_bfs_falls_back_to_cfop(self):
+        cube, _ = scrambled(25, 8)
+        self.assertTrue(cube.is_solved_by(Solver(cube, 'bfs').solve()))
+
+    def test_recoloured_cube(self):
+        cube = recoloured(scrambled(25, 4)[0])
+        for strategy in ('two_phase', 'thistlethwaite', 'cfop', 'bfs'):
+            solved = cube.copy()
+            solved.apply_sequence(Solver(cube, strategy).solve())
+            self.assertEqual(CubieCube.from_cube(solved), CubieCube(), strategy)
+
+
+if __name__ == '__main__':
+    unittest.main()
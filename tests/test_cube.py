@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from main import MOVE_NAMES, Cube, MoveGenerator
+
+
+def cube_after(moves):
+    """A solved cube with moves applied."""
+    cube = Cube()
+    cube.apply_sequence(moves)
+    return cube
+
+
+def scrambled(length, seed):
+    """A cube scrambled with a seeded random sequence, and the sequence as a string."""
+    moves = MoveGenerator().get_random_scramble(length, random.Random(seed))
+    cube = Cube()
+    cube.scramble(moves)
+    return cube, moves
+
+
+def inverse(move):
+    """The move that undoes move."""
+    if move.endswith('2'):
+        return move
+    return move[0] if move.endswith("'") else move + "'"
+
+
+class CubeTest(unittest.TestCase):
+
+    def test_new_cube_is_solved(self):
+        self.assertTrue(Cube().is_solved())
+
+    def test_move_orders(self):
+        for move in MOVE_NAMES:
+            order = 2 if move.endswith('2') else 4
+            cube = Cube()
+            for turns in range(1, 5):
+                cube.apply_move(move)
+                self.assertEqual(cube.is_solved(), turns % order == 0, f"{move} x{turns}")
+
+    def test_scramble_is_undone_by_its_inverse(self):
+        cube, moves = scrambled(30, 1)
+        self.assertFalse(cube.is_solved())
+        for move in reversed(moves.split()):
+            cube.apply_move(inverse(move))
+        self.assertTrue(cube.is_solved())
+
+    def test_state_string_round_trip(self):
+        cube, _ = scrambled(25, 2)
+        self.assertEqual(Cube.from_state_string(cube.get_state_string()).get_state_string(),
+                         cube.get_state_string())
+
+    def test_copy_is_independent(self):
+        cube = Cube()
+        copy = cube.copy()
+        copy.apply_move('R')
+        self.assertTrue(cube.is_solved())
+        self.assertFalse(copy.is_solved())
+
+    def test_invalid_move_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Cube().apply_move('X')
+
+
+if __name__ == '__main__':
+    unittest.main()
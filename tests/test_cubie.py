@@ -0,0 +1,50 @@
+import random
+import unittest
+
+from main import COORDINATES, Cube, CubieCube
+
+from tests.test_cube import cube_after, scrambled
+
+
+class CubieCubeTest(unittest.TestCase):
+
+    def test_facelet_round_trip(self):
+        for seed in range(20):
+            cube, _ = scrambled(25, seed)
+            cubie = CubieCube.from_cube(cube)
+            self.assertEqual(cubie.to_cube().get_state_string(), cube.get_state_string())
+
+    def test_coords_round_trip(self):
+        for seed in range(20):
+            cubie = CubieCube.from_cube(scrambled(25, seed)[0])
+            self.assertEqual(CubieCube.from_coords(cubie.get_coords()), cubie)
+
+    def test_coordinate_setters(self):
+        rng = random.Random(2)
+        for name, (size, getter, setter) in COORDINATES.items():
+            for coord in [0, size - 1] + rng.sample(range(size), 20):
+                cubie = CubieCube()
+                setter(cubie, coord)
+                self.assertEqual(getter(cubie), coord, name)
+
+    def test_moves_agree_with_facelets(self):
+        cube, moves = scrambled(25, 3)
+        cubie = CubieCube()
+        for move in moves.split():
+            cubie.multiply(CubieCube.from_cube(cube_after([move])))
+        self.assertEqual(cubie, CubieCube.from_cube(cube))
+
+    def test_recoloured_cube(self):
+        cube, _ = scrambled(25, 4)
+        recoloured = cube.get_state_string().translate(str.maketrans('WYORGB', 'ABCDEF'))
+        self.assertEqual(CubieCube.from_state_string(recoloured), CubieCube.from_cube(cube))
+
+    def test_unsolvable_cube_is_rejected(self):
+        state = list(Cube().get_state_string())
+        state[1], state[46] = state[46], state[1]  # flip one edge: UB shows B on U
+        with self.assertRaises(ValueError):
+            CubieCube.from_state_string(''.join(state))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from array import array
+from unittest import mock
+
+import main
+
+
+def bfs_distances(table, size):
+    """Distances from coordinate 0 of one coordinate, by a plain BFS."""
+    distances = [None] * size
+    distances[0] = 0
+    frontier = [0]
+    while frontier:
+        next_frontier = []
+        for coord in frontier:
+            for m in range(18):
+                child = table[coord * 18 + m]
+                if distances[child] is None:
+                    distances[child] = distances[coord] + 1
+                    next_frontier.append(child)
+        frontier = next_frontier
+    return distances
+
+
+class DistanceTableTest(unittest.TestCase):
+
+    def test_pruning_table_is_exact(self):
+        twist = main.coord_move_table('twist')
+        table = main._build_pruning_table(twist, 1, bytes(18), range(18), 0)
+        self.assertEqual(list(table), bfs_distances(twist, main.N_TWIST))
+
+    def test_parallel_build_matches(self):
+        twist = main.coord_move_table('twist')
+        args = (twist, main.N_SLICE, main.slice_move_table(), range(18), main.SOLVED_SLICE)
+        serial = main._build_pruning_table(*args, workers=1)
+        with mock.patch.object(main, 'PARALLEL_TABLE_MIN', 0), mock.patch.object(main, 'BFS_CHUNK', 1 << 16):
+            parallel = main._build_pruning_table(*args, workers=2)
+        self.assertEqual(parallel, serial)
+
+    def test_checkpoint_resumes(self):
+        twist = main.coord_move_table('twist')
+        full = main._build_pruning_table(twist, main.N_SLICE, main.slice_move_table(), range(18),
+                                         main.SOLVED_SLICE)
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(main, 'TABLE_DIR', tmp):
+            # A build interrupted after level 3
+            partial = bytes(d if d <= 3 else 255 for d in full)
+            path = os.path.join(tmp, 'twist_slice.ckpt')
+            main._write_table(path, 'B', len(full), partial, (main.N_TWIST, main.N_SLICE, 8, 18))
+            resumed = main._build_pruning_table(twist, main.N_SLICE, main.slice_move_table(), range(18),
+                                                main.SOLVED_SLICE, checkpoint='twist_slice')
+            self.assertFalse(os.path.exists(path))
+        self.assertEqual(resumed, full)
+
+    def test_nibble_packing(self):
+        values = bytearray([3, 15, 0, 7, 9])
+        packed = main._pack_nibbles(values)
+        self.assertEqual([(packed[i >> 1] >> ((i & 1) << 2)) & 15 for i in range(len(values))], list(values))
+
+
+class TableSchemeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'test.tbl')
+        self.builds = 0
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def load(self, scheme=None):
+        def build():
+            self.builds += 1
+            return array('H', range(1000))
+        self.assertEqual(list(main._cached_table(self.path, 'H', 1000, build, scheme)), list(range(1000)))
+
+    def test_other_scheme_is_rebuilt(self):
+        self.load((1000, 1, 16, 18))
+        self.load((1000, 1, 16, 18))
+        self.assertEqual(self.builds, 1)
+        self.load((500, 2, 16, 18))
+        self.assertEqual(self.builds, 2)
+
+    def test_file_without_scheme_is_rebuilt(self):
+        self.load()
+        self.load((1000, 1, 16, 18))
+        self.assertEqual(self.builds, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
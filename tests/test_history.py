@@ -0,0 +1,50 @@
+import unittest
+
+from main import MoveHistory
+
+from tests.test_cube import cube_after
+
+
+class MoveHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.history = MoveHistory()
+        for move in "R U F'".split():
+            self.history.apply(move)
+
+    def test_undo_redo(self):
+        history = self.history
+        self.assertEqual(history.undo().get_state_string(), cube_after("R U").get_state_string())
+        self.assertEqual(history.redo().get_state_string(), cube_after("R U F'").get_state_string())
+        self.assertIsNone(history.redo())
+        for _ in range(3):
+            history.undo()
+        self.assertTrue(history.cube.is_solved())
+        self.assertIsNone(history.undo())
+
+    def test_seek(self):
+        self.assertEqual(self.history.seek(1).get_state_string(), cube_after("R").get_state_string())
+        with self.assertRaises(IndexError):
+            self.history.seek(4)
+
+    def test_new_move_drops_the_redo_history(self):
+        self.history.undo()
+        self.history.apply('D')
+        self.assertEqual(self.history.moves, ['R', 'U', 'D'])
+        self.assertFalse(self.history.can_redo())
+
+    def test_extend_steps_over_matching_redo_moves(self):
+        self.history.seek(0)
+        cube = self.history.extend(['R', 'U'])
+        self.assertEqual(cube.get_state_string(), cube_after("R U").get_state_string())
+        self.assertEqual(self.history.moves, ['R', 'U', "F'"])
+        self.assertTrue(self.history.can_redo())
+
+    def test_invalid_move_is_not_recorded(self):
+        with self.assertRaises(ValueError):
+            self.history.apply('X')
+        self.assertEqual(len(self.history), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import time
+import unittest
+
+from main import Solver
+
+from tests.test_cube import cube_after, scrambled
+
+
+class IterSolutionsTest(unittest.TestCase):
+
+    def test_solutions_get_shorter(self):
+        cube, _ = scrambled(25, 11)
+        solver = Solver(cube, 'two_phase', timeout=0.5)
+        lengths = []
+        for solution in solver.iter_solutions():
+            self.assertTrue(cube.is_solved_by(solution))
+            lengths.append(len(solution))
+        self.assertEqual(lengths, sorted(set(lengths), reverse=True))
+
+    def test_first_solution_is_quick_and_simplified(self):
+        Solver.load_tables('two_phase')
+        start = time.monotonic()
+        first = next(Solver(cube_after("R"), 'two_phase').iter_solutions())
+        self.assertLess(time.monotonic() - start, 0.05)
+        self.assertEqual(first, ["R'"])
+
+    def test_deadline(self):
+        cube, _ = scrambled(25, 12)
+        solver = Solver(cube, 'two_phase')
+        start = time.monotonic()
+        solutions = list(solver.iter_solutions(deadline=start + 0.2))
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertTrue(cube.is_solved_by(solutions[-1]))
+
+    def test_short_scramble_is_proven_optimal(self):
+        cube, _ = scrambled(6, 13)
+        solver = Solver(cube, 'optimal')
+        solutions = list(solver.iter_solutions())
+        self.assertTrue(solver.stats['optimal'])
+        self.assertLessEqual(len(solutions[-1]), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
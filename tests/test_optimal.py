@@ -0,0 +1,36 @@
+"""OptimalSolver checks. The pattern databases are built on first use, which
+takes a few minutes; later runs map the cached files."""
+
+import unittest
+
+from main import OptimalSolver, Solver
+
+from tests.test_cube import cube_after, scrambled
+
+
+class OptimalSolverTest(unittest.TestCase):
+
+    def test_single_move(self):
+        self.assertEqual(OptimalSolver().solve(cube_after("R")), ["R'"])
+
+    def test_short_scrambles(self):
+        for seed in range(6):
+            cube, moves = scrambled(7, seed)
+            solution = Solver(cube, 'optimal').solve()
+            self.assertTrue(cube.is_solved_by(solution), f"seed {seed}")
+            self.assertLessEqual(len(solution), len(moves.split()), f"seed {seed}")
+
+    def test_max_length(self):
+        cube, _ = scrambled(8, 1)
+        shortest = len(OptimalSolver().solve(cube))
+        self.assertIsNone(OptimalSolver(max_length=shortest - 1).solve(cube))
+
+    def test_timeout(self):
+        cube, _ = scrambled(25, 2)
+        solver = OptimalSolver(timeout=0.05)
+        self.assertIsNone(solver.solve(cube))
+        self.assertTrue(solver.timed_out)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from main import Solver, SolutionOptimizer
+
+from tests.test_cube import scrambled
+
+
+class SolutionOptimizerTest(unittest.TestCase):
+
+    def test_simplify(self):
+        self.assertEqual(SolutionOptimizer.simplify("R L R'".split()), ['L'])
+        self.assertEqual(SolutionOptimizer.simplify("R R R".split()), ["R'"])
+        self.assertEqual(SolutionOptimizer.simplify("R U U' R'".split()), [])
+
+    def test_window_search(self):
+        self.assertEqual(SolutionOptimizer.optimize("R U R' U'".split() * 6), [])
+
+    def test_solutions_stay_valid(self):
+        for seed in range(10):
+            cube, _ = scrambled(25, seed)
+            solution = Solver(cube, 'cfop', post_optimize=False).solve()
+            optimized = SolutionOptimizer.optimize(solution)
+            self.assertTrue(cube.is_solved_by(optimized), f"seed {seed}")
+            self.assertLessEqual(len(optimized), len(solution))
+
+    def test_solver_reports_moves_saved(self):
+        cube, _ = scrambled(25, 3)
+        raw = Solver(cube, 'cfop', post_optimize=False).solve()
+        solver = Solver(cube, 'cfop')
+        solution = solver.solve()
+        self.assertEqual(solver.stats['moves_saved'], len(raw) - len(solution))
+        self.assertIn('optimize', solver.stats['phases'])
+
+
+if __name__ == '__main__':
+    unittest.main()
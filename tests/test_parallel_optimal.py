@@ -0,0 +1,35 @@
+import unittest
+
+from main import OptimalSolver, ParallelOptimalSolver
+
+from tests.test_cube import scrambled
+
+
+class ParallelOptimalTest(unittest.TestCase):
+
+    def test_agrees_with_optimal(self):
+        for seed in range(3):
+            cube, _ = scrambled(9, seed)
+            expected = len(OptimalSolver().solve(cube))
+            solver = ParallelOptimalSolver(workers=2)
+            solution = solver.solve(cube)
+            self.assertTrue(cube.is_solved_by(solution), f"seed {seed}")
+            self.assertEqual(len(solution), expected, f"seed {seed}")
+            if expected > solver.split_depth + 2:
+                self.assertIn('parallel', solver.search_stats.phases)
+
+    def test_short_solution_in_process(self):
+        cube, _ = scrambled(3, 4)
+        solver = ParallelOptimalSolver(workers=2)
+        self.assertTrue(cube.is_solved_by(solver.solve(cube)))
+        self.assertNotIn('parallel', solver.search_stats.phases)
+
+    def test_timeout(self):
+        cube, _ = scrambled(25, 5)
+        solver = ParallelOptimalSolver(workers=2, timeout=0.2)
+        self.assertIsNone(solver.solve(cube))
+        self.assertTrue(solver.timed_out)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from main import MOVE_NAMES, compile_moves
+
+from tests.test_cube import cube_after, scrambled
+
+
+class MoveSequenceTest(unittest.TestCase):
+
+    def test_single_move_orders(self):
+        for move in MOVE_NAMES:
+            self.assertEqual(compile_moves([move]).order(), 2 if move.endswith('2') else 4, move)
+
+    def test_known_orders(self):
+        self.assertEqual(compile_moves("R U").order(), 105)
+        self.assertEqual(compile_moves("R U R' U'").order(), 6)
+        self.assertEqual(compile_moves("R2 U2").order(), 6)
+
+    def test_sequence_matches_moves(self):
+        cube, moves = scrambled(30, 1)
+        self.assertEqual(cube_after(moves).get_state_string(), cube.get_state_string())
+        self.assertTrue(cube.is_solved_by(compile_moves(moves).inverse().moves))
+
+    def test_algebra(self):
+        a, b = compile_moves("R U"), compile_moves("F' D2")
+        self.assertEqual(a * b, compile_moves("R U F' D2"))
+        self.assertTrue((a * ~a).is_identity())
+        self.assertEqual(a ** 3, a * a * a)
+        self.assertTrue((a ** a.order()).is_identity())
+        self.assertEqual(a.conjugate(b), b * a * ~b)
+        self.assertEqual(a.commutator(b), a * b * ~a * ~b)
+
+    def test_is_solved_by_leaves_the_cube(self):
+        cube = cube_after("R U")
+        self.assertTrue(cube.is_solved_by("U' R'"))
+        self.assertFalse(cube.is_solved_by("R' U'"))
+        self.assertEqual(cube.get_state_string(), cube_after("R U").get_state_string())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import json
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+
+from main import Cube, SolveService, _solve_http_server
+
+from tests.test_cube import scrambled
+
+
+class SolveServiceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.service = SolveService(workers=2, strategies=('two_phase', 'optimal'))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.service.close()
+
+    def test_solve(self):
+        cube, _ = scrambled(25, 1)
+        solution, stats = self.service.solve(cube)
+        self.assertTrue(cube.is_solved_by(solution))
+        self.assertGreater(stats['nodes'], 0)
+        self.assertGreaterEqual(self.service.metrics()['solved'], 1)
+
+    def test_bad_requests(self):
+        cube, _ = scrambled(25, 2)
+        for strategy, timeout in (('nope', 1.0), ('two_phase', 0), ('optimal', -1.0)):
+            with self.assertRaises(ValueError, msg=f"{strategy} {timeout}"):
+                self.service.solve(cube, strategy, timeout)
+        state = list(Cube().get_state_string())
+        state[1], state[46] = state[46], state[1]
+        with self.assertRaises(ValueError):
+            self.service.solve(Cube.from_state_string(''.join(state)))
+
+    def test_optimal_is_bounded_by_timeout(self):
+        cube, _ = scrambled(25, 3)
+        start = time.monotonic()
+        solution, stats = self.service.solve(cube, 'optimal', 0.3)
+        self.assertLess(time.monotonic() - start, 5.0)
+        self.assertTrue(cube.is_solved_by(solution))
+        self.assertTrue(stats['fallback'])
+
+    def test_concurrent_callers(self):
+        cubes = [scrambled(25, seed)[0] for seed in range(10, 16)]
+        results = [None] * len(cubes)
+
+        def solve(i):
+            results[i] = self.service.solve(cubes[i])[0]
+
+        threads = [threading.Thread(target=solve, args=(i,)) for i in range(len(cubes))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for cube, solution in zip(cubes, results):
+            self.assertTrue(cube.is_solved_by(solution))
+
+
+class SolveHTTPTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.service = SolveService(workers=1)
+        cls.server = _solve_http_server(cls.service, ('127.0.0.1', 0))
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.close()
+
+    def request(self, path, body=None):
+        """(status, JSON reply) of a GET, or a POST when body is given."""
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        try:
+            with urllib.request.urlopen(self.url + path, data, timeout=10) as reply:
+                return reply.status, json.load(reply)
+        except urllib.error.HTTPError as e:
+            return e.code, json.load(e)
+
+    def test_solve_scramble(self):
+        scramble = "R U F2 L D B'"
+        status, reply = self.request('/solve', {'scramble': scramble, 'timeout': 1.0})
+        self.assertEqual(status, 200)
+        cube = Cube()
+        cube.scramble(scramble)
+        self.assertTrue(cube.is_solved_by(reply['solution']))
+        self.assertEqual(reply['length'], len(reply['solution']))
+
+    def test_solve_state(self):
+        cube, _ = scrambled(25, 4)
+        status, reply = self.request('/solve', {'state': cube.get_state_string()})
+        self.assertEqual(status, 200)
+        self.assertTrue(cube.is_solved_by(reply['solution']))
+
+    def test_bad_requests(self):
+        for body in ({'scramble': 'R', 'strategy': 'nope'}, {'scramble': 'R', 'timeout': 0},
+                     {'state': 'too short'}, {'scramble': 'X'}):
+            status, reply = self.request('/solve', body)
+            self.assertEqual(status, 400, body)
+            self.assertIn('error', reply)
+        self.assertEqual(self.request('/nowhere')[0], 404)
+
+    def test_metrics(self):
+        self.request('/solve', {'scramble': 'R U'})
+        status, metrics = self.request('/metrics')
+        self.assertEqual(status, 200)
+        self.assertGreaterEqual(metrics['requests'], 1)
+        self.assertIn('p95', metrics['latency_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from main import solve_many
+
+from tests.test_cube import scrambled
+
+
+class SolveManyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cubes = [scrambled(25, seed)[0] for seed in range(6)]
+
+    def check(self, results):
+        results = list(results)
+        self.assertEqual(sorted(index for index, _ in results), list(range(len(self.cubes))))
+        for index, solution in results:
+            self.assertTrue(self.cubes[index].is_solved_by(solution), f"cube {index}")
+        return results
+
+    def test_ordered(self):
+        results = self.check(solve_many(self.cubes, workers=2, strategy='thistlethwaite'))
+        self.assertEqual([index for index, _ in results], list(range(len(self.cubes))))
+
+    def test_unordered_state_strings(self):
+        states = [cube.get_state_string() for cube in self.cubes]
+        self.check(solve_many(states, workers=2, strategy='cfop', ordered=False))
+
+    def test_in_process(self):
+        self.check(solve_many(self.cubes, workers=1))
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            next(solve_many(self.cubes, strategy='nope'))
+
+
+if __name__ == '__main__':
+    unittest.main()
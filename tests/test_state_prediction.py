@@ -0,0 +1,50 @@
+import unittest
+
+from main import MOVE_NAMES, Cube, StatePrediction
+
+from tests.test_cube import cube_after, scrambled
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "StatePrediction batch methods need NumPy")
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cubes = [scrambled(20, seed)[0] for seed in range(5)]
+        self.states = StatePrediction.batch_from_cubes(self.cubes)
+
+    def test_round_trip(self):
+        self.assertEqual([cube.get_state_string() for cube in StatePrediction.batch_to_cubes(self.states)],
+                         [cube.get_state_string() for cube in self.cubes])
+
+    def test_apply_matches_cube(self):
+        moves = "R U R' U' F2 D'"
+        moved = StatePrediction.batch_to_cubes(StatePrediction.batch_apply(self.states, moves))
+        for cube, result in zip(self.cubes, moved):
+            cube = cube.copy()
+            cube.apply_sequence(moves)
+            self.assertEqual(result.get_state_string(), cube.get_state_string())
+
+    def test_expand_matches_cube(self):
+        expanded = StatePrediction.batch_to_cubes(StatePrediction.batch_expand(self.states))
+        self.assertEqual(len(expanded), len(self.cubes) * 18)
+        for i, cube in enumerate(self.cubes):
+            for m, move in enumerate(MOVE_NAMES):
+                child = cube.copy()
+                child.apply_move(move)
+                self.assertEqual(expanded[i * 18 + m].get_state_string(), child.get_state_string())
+
+    def test_is_solved_matches_cube(self):
+        solved = Cube()
+        recoloured = Cube.from_state_string(solved.get_state_string().translate(str.maketrans('WYORGB', 'ABCDEF')))
+        cubes = [solved, recoloured, cube_after("R")] + self.cubes
+        result = StatePrediction.batch_is_solved(StatePrediction.batch_from_cubes(cubes))
+        self.assertEqual(list(result), [cube.is_solved() for cube in cubes])
+
+
+if __name__ == '__main__':
+    unittest.main()
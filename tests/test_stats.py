@@ -0,0 +1,59 @@
+import contextlib
+import io
+import unittest
+
+from main import Solver, print_search_stats
+
+from tests.test_cube import scrambled
+
+
+class CountingProfiler:
+    """A profiler stand-in that counts how often it is entered."""
+
+    def __init__(self):
+        self.entered = 0
+
+    def __enter__(self):
+        self.entered += 1
+
+    def __exit__(self, *exc):
+        return False
+
+
+class SearchStatsTest(unittest.TestCase):
+
+    def test_two_phase_counters(self):
+        cube, _ = scrambled(25, 1)
+        solver = Solver(cube, 'two_phase')
+        solver.solve()
+        stats = solver.stats
+        self.assertGreater(stats['nodes'], 0)
+        self.assertEqual(len(stats['expanded']), len(stats['generated']))
+        self.assertGreater(stats['lookups'], 0)
+        self.assertLessEqual(stats['cutoffs'], sum(stats['generated']))
+        self.assertIn('phase1', stats['phases'])
+        self.assertIn('optimize', stats['phases'])
+
+    def test_profiler_wraps_the_search(self):
+        cube, _ = scrambled(25, 2)
+        profiler = CountingProfiler()
+        Solver(cube, 'two_phase', profiler=profiler).solve()
+        self.assertEqual(profiler.entered, 1)
+
+    def test_print_search_stats(self):
+        cube, _ = scrambled(8, 3)
+        solver = Solver(cube, 'optimal')
+        solver.solve()
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            print_search_stats(solver.stats)
+        self.assertIn("nodes in", out.getvalue())
+        self.assertIn("cutoffs", out.getvalue())
+        summary = io.StringIO()
+        with contextlib.redirect_stdout(summary):
+            print_search_stats(solver.stats, detail=False)
+        self.assertNotIn("cutoffs", summary.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
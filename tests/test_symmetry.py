@@ -0,0 +1,42 @@
+import unittest
+
+from main import SYMMETRIES, SYMMETRY_INVERSES, Cube, canonical_key, conjugate_moves
+
+from tests.test_cube import inverse, scrambled
+
+
+def symmetric_copy(moves, symmetry):
+    """The cube scrambled by the conjugate of moves under a symmetry."""
+    cube = Cube()
+    cube.apply_sequence(conjugate_moves(moves.split(), symmetry))
+    return cube
+
+
+class SymmetryTest(unittest.TestCase):
+
+    def test_symmetric_copies_share_a_key(self):
+        cube, moves = scrambled(15, 1)
+        key = canonical_key(cube)[0]
+        for symmetry in range(len(SYMMETRIES)):
+            self.assertEqual(canonical_key(symmetric_copy(moves, symmetry))[0], key, f"symmetry {symmetry}")
+
+    def test_different_positions_differ(self):
+        keys = {canonical_key(scrambled(15, seed)[0])[0] for seed in range(20)}
+        self.assertEqual(len(keys), 20)
+
+    def test_conjugated_solution_solves_the_copy(self):
+        cube, moves = scrambled(10, 2)
+        solution = [inverse(move) for move in reversed(moves.split())]
+        self.assertTrue(cube.is_solved_by(solution))
+        for symmetry in range(len(SYMMETRIES)):
+            copy = symmetric_copy(moves, symmetry)
+            self.assertTrue(copy.is_solved_by(conjugate_moves(solution, symmetry)), f"symmetry {symmetry}")
+
+    def test_inverse_symmetries(self):
+        moves = "R U F' D2 L B'".split()
+        for symmetry, inverse in enumerate(SYMMETRY_INVERSES):
+            self.assertEqual(conjugate_moves(conjugate_moves(moves, symmetry), inverse), moves)
+
+
+if __name__ == '__main__':
+    unittest.main()
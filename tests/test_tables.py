@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from array import array
+
+import main
+
+
+class CachedTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'test.tbl')
+        self.builds = 0
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def build(self):
+        self.builds += 1
+        return array('H', range(1000))
+
+    def load(self, scheme=None):
+        table = main._cached_table(self.path, 'H', 1000, self.build, scheme)
+        self.assertEqual(list(table), list(range(1000)))
+        return table
+
+    def patch_file(self, offset, data):
+        with open(self.path, 'r+b') as f:
+            f.seek(offset)
+            f.write(data)
+
+    def test_built_once(self):
+        self.load()
+        self.load()
+        self.assertEqual(self.builds, 1)
+
+    def test_corrupt_file_is_rebuilt(self):
+        self.load()
+        self.patch_file(main.TABLE_HEADER.size + 10, b'\xff\xff')
+        self.load()
+        self.assertEqual(self.builds, 2)
+
+    def test_stale_version_is_rebuilt(self):
+        self.load()
+        self.patch_file(4, (main.TABLE_VERSION - 1).to_bytes(2, 'little'))
+        self.load()
+        self.assertEqual(self.builds, 2)
+
+    def test_truncated_file_is_rebuilt(self):
+        self.load()
+        with open(self.path, 'r+b') as f:
+            f.truncate(main.TABLE_HEADER.size + 100)
+        self.load()
+        self.assertEqual(self.builds, 2)
+
+    def test_headerless_file_is_rebuilt(self):
+        with open(self.path, 'wb') as f:
+            f.write(array('H', range(1000)).tobytes())
+        self.load()
+        self.assertEqual(self.builds, 1)
+
+    def test_unwritable_directory_keeps_the_table_in_memory(self):
+        self.path = os.path.join(self.dir.name, 'file', 'test.tbl')
+        open(os.path.join(self.dir.name, 'file'), 'w').close()
+        self.load()
+        self.assertEqual(self.builds, 1)
+
+
+class ColdStartTest(unittest.TestCase):
+
+    def test_gui_is_imported_lazily(self):
+        code = "import sys, main; print('tkinter' in sys.modules)"
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(result.stdout.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from main import Solver, ThistlethwaiteSolver
+
+from tests.test_cube import scrambled
+
+
+class ThistlethwaiteTest(unittest.TestCase):
+
+    def test_full_scrambles(self):
+        for seed in range(10):
+            cube, _ = scrambled(25, seed)
+            solution = Solver(cube, 'thistlethwaite').solve()
+            self.assertTrue(cube.is_solved_by(solution), f"seed {seed}")
+            self.assertLessEqual(len(solution), 52, f"seed {seed}")
+
+    def test_phases(self):
+        cube, _ = scrambled(25, 7)
+        solver = ThistlethwaiteSolver()
+        solution = solver.solve(cube)
+        self.assertEqual(list(solver.phase_seconds), ['phase1', 'phase2', 'phase3', 'phase4'])
+        self.assertEqual([name for name, _ in solver.stages], list(ThistlethwaiteSolver.PHASES))
+        self.assertEqual([move for _, moves in solver.stages for move in moves], solution)
+
+    def test_solver_stats(self):
+        cube, _ = scrambled(25, 8)
+        solver = Solver(cube, 'thistlethwaite', post_optimize=False)
+        solution = solver.solve()
+        self.assertEqual([move for _, moves in solver.stats['stages'] for move in moves], solution)
+
+
+if __name__ == '__main__':
+    unittest.main()
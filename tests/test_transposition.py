@@ -0,0 +1,48 @@
+import unittest
+
+from main import OptimalSolver, TranspositionTable
+
+from tests.test_cube import scrambled
+
+
+class TranspositionTableTest(unittest.TestCase):
+
+    def test_store_and_probe(self):
+        tt = TranspositionTable(1)
+        key = TranspositionTable.key((1, 2, 3, 4, 5, 6))
+        self.assertIsNone(tt.probe(key))
+        tt.store(key, 7)
+        self.assertEqual(tt.probe(key), 7)
+        tt.store(key, 5)  # A shallower bound for the same state adds nothing
+        self.assertEqual(tt.probe(key), 7)
+        self.assertEqual(len(tt), 1)
+
+    def test_size_follows_the_memory_limit(self):
+        tt = TranspositionTable(1)
+        self.assertEqual(tt.size, 2**20 // TranspositionTable.SLOT_BYTES)
+
+    def test_replacement_policies(self):
+        for policy, kept in (('depth_preferred', 9), ('always_replace', None)):
+            tt = TranspositionTable(1, policy)
+            deep, shallow = 5, 5 + tt.size  # Different keys, same slot
+            tt.store(deep, 9)
+            tt.store(shallow, 2)
+            self.assertEqual(tt.probe(deep), kept, policy)
+        with self.assertRaises(ValueError):
+            TranspositionTable(1, 'random')
+
+    def test_keys_depend_on_last_face(self):
+        keys = {TranspositionTable.key((1, 2, 3, 4, 5, 6), face) for face in range(7)}
+        self.assertEqual(len(keys), 7)
+
+    def test_optimal_lengths_are_kept(self):
+        for seed in range(8):
+            cube, _ = scrambled(8, seed)
+            plain = OptimalSolver().solve(cube)
+            with_tt = OptimalSolver(transposition_table=TranspositionTable(1)).solve(cube)
+            self.assertTrue(cube.is_solved_by(with_tt))
+            self.assertEqual(len(with_tt), len(plain), f"seed {seed}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from main import Cube, Solver, TwoPhaseSolver
+
+from tests.test_cube import scrambled
+
+
+class TwoPhaseTest(unittest.TestCase):
+
+    def test_full_scrambles(self):
+        for seed in range(10):
+            cube, _ = scrambled(25, seed)
+            solution = Solver(cube).solve()
+            self.assertTrue(cube.is_solved_by(solution), f"seed {seed}")
+            self.assertLessEqual(len(solution), 24, f"seed {seed}")
+
+    def test_first_solution_within_a_loose_target(self):
+        cube, _ = scrambled(25, 10)
+        solver = TwoPhaseSolver(target_length=30)
+        solution = solver.solve(cube)
+        self.assertTrue(cube.is_solved_by(solution))
+        self.assertLessEqual(len(solution), 30)
+        self.assertEqual(set(solver.search_stats.phases), {'phase1', 'phase2'})
+
+    def test_solved_cube(self):
+        self.assertEqual(Solver(Cube()).solve(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()